@@ -0,0 +1,70 @@
+"""Micro-benchmark for the per-hit overhead of the cache decorator
+
+Usage:
+    python benchmarks/bench_cache.py
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+from cachetools import TTLCache
+
+from akshare_one.modules.cache import CACHE_CONFIG, cache
+
+NUMBER = 200_000
+REPEAT = 5
+
+FRAME = pd.DataFrame({"close": [1.0, 2.0, 3.0]})
+# 约一年的1分钟K线
+LARGE_FRAME = pd.DataFrame(
+    np.random.default_rng(0).random((60_000, 6)),
+    columns=["open", "high", "low", "close", "volume", "amount"],
+)
+CACHE_CONFIG["bench_cache"] = TTLCache(maxsize=100, ttl=3600)
+
+
+class Provider:
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+
+    def get_data_uncached(self) -> pd.DataFrame:
+        return FRAME
+
+    @cache("bench_cache", key=lambda self: f"bench_{self.symbol}")
+    def get_data(self) -> pd.DataFrame:
+        return FRAME
+
+    @cache("bench_cache", key=lambda self: f"bench_large_{self.symbol}")
+    def get_large_data(self) -> pd.DataFrame:
+        return LARGE_FRAME
+
+
+def best_per_call_us(stmt: str, provider: Provider, number: int = NUMBER) -> float:
+    timings = timeit.repeat(
+        stmt, globals={"provider": provider}, number=number, repeat=REPEAT
+    )
+    return min(timings) / number * 1e6
+
+
+def main() -> None:
+    provider = Provider("600000")
+    provider.get_data()  # warm the cache
+
+    baseline = best_per_call_us("provider.get_data_uncached()", provider)
+    hit = best_per_call_us("provider.get_data()", provider)
+
+    print(f"plain call:  {baseline:.3f} us")
+    print(f"cache hit:   {hit:.3f} us")
+    print(f"overhead:    {hit - baseline:.3f} us per hit")
+
+    # Cached frames are read-only views, so callers no longer need to copy them
+    provider.get_large_data()
+    shared = best_per_call_us("provider.get_large_data()", provider, 2_000)
+    copied = best_per_call_us("provider.get_large_data().copy()", provider, 2_000)
+    print(f"large hit:              {shared:.3f} us")
+    print(f"large hit + .copy():    {copied:.3f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Throughput of the EastMoney direct clients against a local mock upstream
+
+Runs offline: requests go to ``MockUpstream``, which adds a fixed latency per
+request, so results are comparable across machines and before/after changes.
+
+Usage:
+    python benchmarks/bench_client.py
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from akshare_one.eastmoney.client import EastMoneyClient
+from akshare_one.eastmoney.mock_server import MockUpstream
+from akshare_one.eastmoney.utils import parse_kline_data
+
+SYMBOLS = [f"{600000 + i}" for i in range(200)]
+LATENCY = 0.02
+WORKERS = [1, 8, 32]
+
+
+def fetch(symbol: str) -> int:
+    raw = EastMoneyClient().fetch_historical_klines(
+        symbol, "101", "0", "20200101", "20241231"
+    )
+    return len(parse_kline_data(raw))
+
+
+def bench_threads(workers: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        rows = sum(pool.map(fetch, SYMBOLS))
+    assert rows > 0
+    return len(SYMBOLS) / (time.perf_counter() - started)
+
+
+async def bench_async() -> float:
+    from akshare_one.eastmoney.async_client import (
+        AsyncEastMoneyClient,
+        close_async_session,
+    )
+
+    client = AsyncEastMoneyClient()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(
+            *(
+                client.fetch_historical_klines(
+                    symbol, "101", "0", "20200101", "20241231"
+                )
+                for symbol in SYMBOLS
+            )
+        )
+    finally:
+        await close_async_session()
+    return len(SYMBOLS) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    with MockUpstream(latency=LATENCY):
+        # 预先生成模拟数据并建立连接
+        bench_threads(8)
+        for workers in WORKERS:
+            print(f"threads={workers:<3} {bench_threads(workers):8.1f} req/s")
+        try:
+            print(f"asyncio     {asyncio.run(bench_async()):8.1f} req/s")
+        except ImportError:
+            print("asyncio     skipped (pip install akshare-one[async])")
+
+
+if __name__ == "__main__":
+    main()
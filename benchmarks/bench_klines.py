@@ -0,0 +1,165 @@
+"""Decoding and parsing cost of a large kline response
+
+Builds a multi-year 1-minute kline payload in memory and compares decoding it
+in one go with the streaming decoder, in time and peak memory. Then compares
+``parse_kline_data`` with the per-row loop it replaced on 100k minute bars.
+
+Usage:
+    python benchmarks/bench_klines.py
+"""
+
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from akshare_one.eastmoney import decoding, utils
+from akshare_one.eastmoney.decoding import loads, open_kline_stream
+from akshare_one.eastmoney.utils import KLINE_COLUMNS, parse_kline_data
+
+# 约四年的1分钟K线
+ROWS = 240 * 250 * 4
+KLINE = "2024-01-02 09:31,10.01,10.02,10.05,9.98,12345,12345678.0,0.7,0.1,0.01,0.05"
+PAYLOAD = json.dumps(
+    {"rc": 0, "data": {"code": "600000", "klines": [KLINE] * ROWS}},
+    separators=(",", ":"),
+).encode("utf-8")
+
+
+PARSE_ROWS = 100_000
+PARSE_REPEAT = 3
+
+
+def minute_klines(rows: int) -> list[str]:
+    rng = np.random.default_rng(0)
+    stamps = pd.date_range("2020-01-02 09:31", periods=rows, freq="min")
+    close = 10 * np.exp(np.cumsum(rng.standard_normal(rows) * 0.001))
+    values = np.column_stack(
+        [
+            close * (1 + rng.standard_normal(rows) * 0.0005),
+            close,
+            close * 1.001,
+            close * 0.999,
+            rng.integers(100, 100_000, rows),
+            close * 1e5,
+            rng.random(rows),
+            rng.standard_normal(rows),
+            rng.standard_normal(rows) * 0.01,
+            rng.random(rows) * 0.1,
+        ]
+    ).round(2)
+    dates = stamps.strftime("%Y-%m-%d %H:%M").tolist()
+    return [
+        f"{date},{o},{c},{h},{lo},{int(v)},{a},{amp},{pct},{chg},{t}"
+        for date, (o, c, h, lo, v, a, amp, pct, chg, t) in zip(
+            dates, values.tolist(), strict=True
+        )
+    ]
+
+
+def loop_parse(data: dict[str, Any]) -> pd.DataFrame:
+    """The per-row parser ``parse_kline_data`` replaced, for reference"""
+    records = []
+    for kline in data["data"]["klines"]:
+        parts = kline.split(",")
+        records.append(
+            {
+                "timestamp": parts[0],
+                "open": float(parts[1]),
+                "close": float(parts[2]),
+                "high": float(parts[3]),
+                "low": float(parts[4]),
+                "volume": int(parts[5]),
+            }
+        )
+    df = pd.DataFrame(records)
+    df["timestamp"] = pd.to_datetime(df["timestamp"]).dt.tz_localize("Asia/Shanghai")
+    return df[["timestamp", "open", "high", "low", "close", "volume"]]
+
+
+def loop_parse_all(data: dict[str, Any]) -> pd.DataFrame:
+    """The same loop extended to the 11 fields ``parse_kline_data`` returns"""
+    records = []
+    for kline in data["data"]["klines"]:
+        parts = kline.split(",")
+        records.append(
+            {
+                "timestamp": parts[0],
+                "open": float(parts[1]),
+                "close": float(parts[2]),
+                "high": float(parts[3]),
+                "low": float(parts[4]),
+                "volume": int(parts[5]),
+                "amount": float(parts[6]),
+                "amplitude": float(parts[7]),
+                "pct_change": float(parts[8]),
+                "change": float(parts[9]),
+                "turnover": float(parts[10]),
+            }
+        )
+    df = pd.DataFrame(records)
+    df["timestamp"] = pd.to_datetime(df["timestamp"]).dt.tz_localize("Asia/Shanghai")
+    return df[KLINE_COLUMNS]
+
+
+def best_of(func: Callable[[], Any]) -> float:
+    times = []
+    for _ in range(PARSE_REPEAT):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def decode_all() -> int:
+    return len(loads(PAYLOAD)["data"]["klines"])
+
+
+def decode_stream() -> int:
+    chunks = (
+        PAYLOAD[start : start + decoding.STREAM_READ_BYTES]
+        for start in range(0, len(PAYLOAD), decoding.STREAM_READ_BYTES)
+    )
+    stream = open_kline_stream(chunks)
+    assert not isinstance(stream, dict)
+    return sum(len(chunk) for chunk in stream)
+
+
+def measure(func: Callable[[], Any]) -> tuple[float, float]:
+    started = time.perf_counter()
+    assert func() == ROWS
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    backend = "orjson" if decoding.ORJSON_AVAILABLE else "json"
+    print(f"{ROWS} klines, {len(PAYLOAD) / 2**20:.1f} MB, decoder={backend}")
+    for name, func in [("full", decode_all), ("stream", decode_stream)]:
+        elapsed, peak = measure(func)
+        print(f"{name:<7} {elapsed * 1000:8.1f} ms  peak {peak:7.1f} MB")
+
+    data = {"data": {"klines": minute_klines(PARSE_ROWS)}}
+    loop = best_of(lambda: loop_parse(data))
+    loop_all = best_of(lambda: loop_parse_all(data))
+    vectorized = best_of(lambda: parse_kline_data(data))
+    engine = "pyarrow" if utils.PYARROW_AVAILABLE else "pandas"
+    print(f"parse {PARSE_ROWS} klines, engine={engine}")
+    print(f"loop        {loop * 1000:8.1f} ms  (6 fields)")
+    print(f"loop        {loop_all * 1000:8.1f} ms  (11 fields)")
+    print(
+        f"vectorized  {vectorized * 1000:8.1f} ms  (11 fields, "
+        f"{loop / vectorized:.1f}x / {loop_all / vectorized:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -12,18 +12,34 @@ Example:
     >>> print(df.head())
     >>> # 获取股票实时数据
     >>> df = get_realtime_data(symbol="600000")
+    >>> # 在 asyncio 中获取
+    >>> df = await aget_hist_data("600000", interval="day")
 """
 
+import asyncio
 from typing import Literal
 
 import pandas as pd
 
+from .modules.cache import NoDataError as NoDataError
+from .modules.cache import cache_keys as cache_keys
+from .modules.cache import cache_stats as cache_stats
+from .modules.cache import export_cache as export_cache
+from .modules.cache import import_cache as import_cache
+from .modules.cache import inspect_cache as inspect_cache
+from .modules.cache import invalidate_cache as invalidate_cache
+from .modules.circuit import CircuitOpenError as CircuitOpenError
+from .modules.circuit import circuit_stats as circuit_stats
 from .modules.financial.factory import FinancialDataFactory
 from .modules.historical.factory import HistoricalDataFactory
+from .modules.historical.hedged import HedgedHistorical
+from .modules.historical.hedged import hedge_stats as hedge_stats
 from .modules.info.factory import InfoDataFactory
 from .modules.insider.factory import InsiderDataFactory
 from .modules.news.factory import NewsDataFactory
 from .modules.realtime.factory import RealtimeDataFactory
+from .modules.warmup import WarmupScheduler as WarmupScheduler
+from .modules.warmup import warm_cache as warm_cache
 
 
 def get_basic_info(
@@ -51,6 +67,13 @@ def get_basic_info(
     return provider.get_basic_info()
 
 
+async def aget_basic_info(
+    symbol: str, source: Literal["eastmoney"] = "eastmoney"
+) -> pd.DataFrame:
+    """异步获取股票基础信息，参数和返回值同 get_basic_info"""
+    return await asyncio.to_thread(get_basic_info, symbol, source)
+
+
 def get_hist_data(
     symbol: str,
     interval: Literal["minute", "hour", "day", "week", "month", "year"] = "day",
@@ -59,6 +82,7 @@ def get_hist_data(
     end_date: str = "2030-12-31",
     adjust: Literal["none", "qfq", "hfq"] = "none",
     source: Literal["eastmoney", "eastmoney_direct", "sina"] = "eastmoney_direct",
+    hedge: Literal["eastmoney", "eastmoney_direct", "sina"] | None = None,
 ) -> pd.DataFrame:
     """Get historical market data
 
@@ -70,6 +94,8 @@ def get_hist_data(
         end_date: 结束日期 (YYYY-MM-DD)
         adjust: 复权类型 ('none','qfq','hfq')
         source: 数据源 ('eastmoney', 'eastmoney_direct', 'sina')
+        hedge: 备用数据源，source 超过其 p90 延迟仍未返回时同时请求，
+            采用先返回的有效结果，见 HedgedHistorical
 
     Returns:
         pd.DataFrame:
@@ -88,10 +114,46 @@ def get_hist_data(
         "end_date": end_date,
         "adjust": adjust,
     }
-    provider = HistoricalDataFactory.get_provider(source, **kwargs)
+    provider = (
+        HistoricalDataFactory.get_provider(source, **kwargs)
+        if hedge is None
+        else HedgedHistorical(source=source, hedge=hedge, **kwargs)
+    )
     return provider.get_hist_data()
 
 
+async def aget_hist_data(
+    symbol: str,
+    interval: Literal["minute", "hour", "day", "week", "month", "year"] = "day",
+    interval_multiplier: int = 1,
+    start_date: str = "1970-01-01",
+    end_date: str = "2030-12-31",
+    adjust: Literal["none", "qfq", "hfq"] = "none",
+    source: Literal["eastmoney", "eastmoney_direct", "sina"] = "eastmoney_direct",
+    hedge: Literal["eastmoney", "eastmoney_direct", "sina"] | None = None,
+) -> pd.DataFrame:
+    """Get historical market data without blocking the event loop
+
+    Same arguments and result as ``get_hist_data``. ``eastmoney_direct`` uses
+    asyncio HTTP (requires ``akshare-one[async]``); other sources run in a
+    worker thread.
+    """
+    kwargs = {
+        "symbol": symbol,
+        "interval": interval,
+        "interval_multiplier": interval_multiplier,
+        "start_date": start_date,
+        "end_date": end_date,
+        "adjust": adjust,
+    }
+    provider = (
+        HistoricalDataFactory.get_provider(source, **kwargs)
+        if hedge is None
+        else HedgedHistorical(source=source, hedge=hedge, **kwargs)
+    )
+    return await provider.aget_hist_data()
+
+
 def get_realtime_data(
     symbol: str | None = None,
     source: Literal["eastmoney", "eastmoney_direct", "xueqiu"] = "eastmoney_direct",
@@ -120,6 +182,20 @@ def get_realtime_data(
     return provider.get_current_data()
 
 
+async def aget_realtime_data(
+    symbol: str | None = None,
+    source: Literal["eastmoney", "eastmoney_direct", "xueqiu"] = "eastmoney_direct",
+) -> pd.DataFrame:
+    """Get real-time market quotes without blocking the event loop
+
+    Same arguments and result as ``get_realtime_data``. ``eastmoney_direct``
+    uses asyncio HTTP (requires ``akshare-one[async]``); other sources run in
+    a worker thread.
+    """
+    provider = RealtimeDataFactory.get_provider(source, symbol=symbol)
+    return await provider.aget_current_data()
+
+
 def get_news_data(
     symbol: str, source: Literal["eastmoney"] = "eastmoney"
 ) -> pd.DataFrame:
@@ -142,6 +218,13 @@ def get_news_data(
     return provider.get_news_data()
 
 
+async def aget_news_data(
+    symbol: str, source: Literal["eastmoney"] = "eastmoney"
+) -> pd.DataFrame:
+    """异步获取个股新闻数据，参数和返回值同 get_news_data"""
+    return await asyncio.to_thread(get_news_data, symbol, source)
+
+
 def get_balance_sheet(symbol: str, source: Literal["sina"] = "sina") -> pd.DataFrame:
     """获取资产负债表数据
 
@@ -156,6 +239,13 @@ def get_balance_sheet(symbol: str, source: Literal["sina"] = "sina") -> pd.DataF
     return provider.get_balance_sheet()
 
 
+async def aget_balance_sheet(
+    symbol: str, source: Literal["sina"] = "sina"
+) -> pd.DataFrame:
+    """异步获取资产负债表数据，参数和返回值同 get_balance_sheet"""
+    return await asyncio.to_thread(get_balance_sheet, symbol, source)
+
+
 def get_income_statement(symbol: str, source: Literal["sina"] = "sina") -> pd.DataFrame:
     """获取利润表数据
 
@@ -170,6 +260,13 @@ def get_income_statement(symbol: str, source: Literal["sina"] = "sina") -> pd.Da
     return provider.get_income_statement()
 
 
+async def aget_income_statement(
+    symbol: str, source: Literal["sina"] = "sina"
+) -> pd.DataFrame:
+    """异步获取利润表数据，参数和返回值同 get_income_statement"""
+    return await asyncio.to_thread(get_income_statement, symbol, source)
+
+
 def get_cash_flow(symbol: str, source: Literal["sina"] = "sina") -> pd.DataFrame:
     """获取现金流量表数据
 
@@ -184,6 +281,11 @@ def get_cash_flow(symbol: str, source: Literal["sina"] = "sina") -> pd.DataFrame
     return provider.get_cash_flow()
 
 
+async def aget_cash_flow(symbol: str, source: Literal["sina"] = "sina") -> pd.DataFrame:
+    """异步获取现金流量表数据，参数和返回值同 get_cash_flow"""
+    return await asyncio.to_thread(get_cash_flow, symbol, source)
+
+
 def get_financial_metrics(
     symbol: str, source: Literal["eastmoney_direct"] = "eastmoney_direct"
 ) -> pd.DataFrame:
@@ -200,6 +302,17 @@ def get_financial_metrics(
     return provider.get_financial_metrics()
 
 
+async def aget_financial_metrics(
+    symbol: str, source: Literal["eastmoney_direct"] = "eastmoney_direct"
+) -> pd.DataFrame:
+    """异步获取三大财务报表关键指标，三张报表并发请求
+
+    参数和返回值同 get_financial_metrics，需要安装 akshare-one[async]
+    """
+    provider = FinancialDataFactory.get_provider(source, symbol=symbol)
+    return await provider.aget_financial_metrics()
+
+
 def get_inner_trade_data(
     symbol: str, source: Literal["xueqiu"] = "xueqiu"
 ) -> pd.DataFrame:
@@ -214,3 +327,10 @@ def get_inner_trade_data(
     """
     provider = InsiderDataFactory.get_provider(source, symbol=symbol)
     return provider.get_inner_trade_data()
+
+
+async def aget_inner_trade_data(
+    symbol: str, source: Literal["xueqiu"] = "xueqiu"
+) -> pd.DataFrame:
+    """异步获取雪球内部交易数据，参数和返回值同 get_inner_trade_data"""
+    return await asyncio.to_thread(get_inner_trade_data, symbol, source)
@@ -0,0 +1,148 @@
+import asyncio
+import weakref
+from typing import Any
+from urllib.parse import urlsplit
+
+from ..modules.circuit import _network_errors, _upstream_failed, circuit_breaker
+from ..modules.ratelimit import aacquire
+from . import client
+from .client import (
+    EastMoneyRequests,
+    _count,
+    _rc_failed,
+    _retry_after,
+    retry_delay,
+)
+from .decoding import loads
+
+# 每个事件循环一个会话，aiohttp 会话不能跨事件循环使用
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _build_session() -> Any:
+    import aiohttp  # type: ignore
+
+    connect, read = client.HTTP_TIMEOUT
+    connector = aiohttp.TCPConnector(
+        limit=sum(client.HTTP_POOL_SIZES.values()) + client.DEFAULT_POOL_SIZE,
+        limit_per_host=max(client.HTTP_POOL_SIZES.values(), default=10),
+        keepalive_timeout=60,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read),
+    )
+
+
+def get_async_session() -> Any:
+    """Returns the pooled ``aiohttp.ClientSession`` of the running event loop
+
+    Pool sizes and timeouts follow ``configure_http_pool``. Requires
+    ``akshare-one[async]``.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = _sessions[loop] = _build_session()
+    return session
+
+
+async def close_async_session() -> None:
+    """Closes the pooled session of the running event loop"""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+
+class AsyncEastMoneyClient(EastMoneyRequests):
+    """
+    An asyncio client for EastMoney's data APIs with the same methods as
+    ``EastMoneyClient``. Connections come from the event loop's pooled
+    ``aiohttp`` session unless a session is given. Rate limits, retries and
+    circuit breakers are shared with ``EastMoneyClient``, and responses are
+    decoded with orjson when it is installed.
+    """
+
+    def __init__(self, session: Any = None) -> None:
+        self._session = session
+
+    @property
+    def session(self) -> Any:
+        return self._session if self._session is not None else get_async_session()
+
+    async def _get(self, url: str, params: dict[str, Any]) -> dict[str, Any]:
+        breaker = circuit_breaker(urlsplit(url).netloc)
+        breaker.allow()
+        ok = None
+        try:
+            payload = await self._send(url, params)
+            ok = not _rc_failed(payload)
+            return payload
+        except Exception as e:
+            ok = not _upstream_failed(e)
+            raise
+        finally:
+            breaker.record(ok)
+
+    async def _send(self, url: str, params: dict[str, Any]) -> dict[str, Any]:
+        _count(url, "requests")
+        network_errors = _network_errors()
+        host = urlsplit(url).netloc
+        attempt = 1
+        while True:
+            retry_after = None
+            await aacquire(host)
+            try:
+                async with self.session.get(url, params=params) as response:
+                    if response.status in client.RETRY_STATUS:
+                        reason = "status"
+                        retry_after = _retry_after(response.headers.get("Retry-After"))
+                        if attempt >= client.RETRY_ATTEMPTS:
+                            _count(url, "exhausted")
+                            response.raise_for_status()
+                    else:
+                        response.raise_for_status()
+                        # 东方财富部分接口返回 text/plain，不检查 Content-Type
+                        payload = loads(await response.read())
+                        if not _rc_failed(payload):
+                            return payload  # type: ignore
+                        reason = "rc"
+                        if attempt >= client.RETRY_ATTEMPTS:
+                            _count(url, "exhausted")
+                            return payload  # type: ignore
+            except network_errors:
+                if attempt >= client.RETRY_ATTEMPTS:
+                    _count(url, "exhausted")
+                    raise
+                reason = "network"
+            _count(url, "retries", reason)
+            await asyncio.sleep(retry_delay(attempt, retry_after))
+            attempt += 1
+
+    async def fetch_historical_klines(
+        self, symbol: str, klt: str, fqt: str, start_date: str, end_date: str
+    ) -> dict[str, Any]:
+        """
+        Fetches historical K-line (candlestick) data.
+        """
+        return await self._get(
+            *self._historical_klines_request(symbol, klt, fqt, start_date, end_date)
+        )
+
+    async def fetch_realtime_quote(self, symbol: str) -> dict[str, Any]:
+        """
+        Fetches real-time quote data for a single stock.
+        """
+        return await self._get(*self._realtime_quote_request(symbol))
+
+    async def fetch_financial_report(
+        self, report_name: str, symbol: str, columns: list[str]
+    ) -> dict[str, Any]:
+        """
+        Fetches a financial statement report from the datacenter API.
+        """
+        return await self._get(
+            *self._financial_report_request(report_name, symbol, columns)
+        )
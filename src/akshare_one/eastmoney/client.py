@@ -1,16 +1,204 @@
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator, Mapping
 from typing import Any
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from ..modules.circuit import _upstream_failed, circuit_breaker
+from ..modules.ratelimit import acquire
+from .decoding import (
+    KLINE_CHUNK_ROWS,
+    STREAM_READ_BYTES,
+    KlineStream,
+    loads,
+    open_kline_stream,
+)
 
-class EastMoneyClient:
+# 每个主机的最大连接数，K线接口在批量获取时并发最高
+HTTP_POOL_SIZES = {
+    "push2his.eastmoney.com": 32,
+    "push2.eastmoney.com": 16,
+    "datacenter-web.eastmoney.com": 16,
+}
+DEFAULT_POOL_SIZE = 10
+# (连接超时, 读取超时)，单位秒
+HTTP_TIMEOUT: tuple[float, float] = (3.05, 15.0)
+
+# 主机 -> 实际请求的地址，可指向本地模拟服务器，见 mock_server.MockUpstream
+ENDPOINTS: dict[str, str] = {}
+
+# 最多尝试次数，以及指数退避的初始等待和上限（秒）
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+RETRY_MAX_BACKOFF = 8.0
+# 可重试的 HTTP 状态码，其他 4xx 是请求本身的错误
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+# 主机 -> 计数，见 retry_stats
+_retry_stats: dict[str, Counter[str]] = {}
+_retry_stats_lock = threading.Lock()
+
+
+def _build_session(
+    pool_sizes: Mapping[str, int], default_pool_size: int
+) -> requests.Session:
+    session = requests.Session()
+    session.headers["Connection"] = "keep-alive"
+    default = HTTPAdapter(
+        pool_connections=len(pool_sizes) + 1, pool_maxsize=default_pool_size
+    )
+    session.mount("https://", default)
+    session.mount("http://", default)
+    for host, size in pool_sizes.items():
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+        session.mount(f"https://{host}/", adapter)
+        session.mount(f"http://{host}/", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Returns the process-wide pooled session used by all direct providers
+
+    Connections are kept alive and reused across calls and threads, so
+    repeated requests skip the TCP and TLS handshakes.
     """
-    A client for interacting directly with EastMoney's data APIs.
-    This class handles session management, request signing, and API calls.
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session(HTTP_POOL_SIZES, DEFAULT_POOL_SIZE)
+    return _session
+
+
+def configure_http_pool(
+    pool_sizes: Mapping[str, int] | None = None,
+    default_pool_size: int | None = None,
+    timeout: float | tuple[float, float] | None = None,
+) -> None:
+    """Rebuilds the shared session with new pool sizes and timeouts
+
+    Args:
+        pool_sizes: 各主机的最大连接数，与默认值合并
+        default_pool_size: 其他主机的最大连接数
+        timeout: 请求超时（秒），或 (连接超时, 读取超时)
     """
+    global _session, DEFAULT_POOL_SIZE, HTTP_TIMEOUT
+    with _session_lock:
+        if pool_sizes is not None:
+            HTTP_POOL_SIZES.update(pool_sizes)
+        if default_pool_size is not None:
+            DEFAULT_POOL_SIZE = default_pool_size
+        if timeout is not None:
+            HTTP_TIMEOUT = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        old, _session = _session, _build_session(HTTP_POOL_SIZES, DEFAULT_POOL_SIZE)
+    if old is not None:
+        old.close()
+
 
-    def __init__(self) -> None:
-        self.session = requests.Session()
+def configure_endpoints(endpoints: Mapping[str, str | None]) -> None:
+    """Sends requests for EastMoney hosts to other base URLs
+
+    Args:
+        endpoints: 主机 -> 地址，例如 {"push2his.eastmoney.com":
+            "http://127.0.0.1:8000"}，None 恢复为原地址
+    """
+    for host, base_url in endpoints.items():
+        if base_url is None:
+            ENDPOINTS.pop(host, None)
+        else:
+            ENDPOINTS[host] = base_url.rstrip("/")
+
+
+def _url(host: str, path: str) -> str:
+    return ENDPOINTS.get(host, f"https://{host}") + path
+
+
+def configure_retries(
+    attempts: int | None = None,
+    backoff: float | None = None,
+    max_backoff: float | None = None,
+) -> None:
+    """Changes how transient failures are retried
+
+    Args:
+        attempts: 每个请求最多尝试次数，1 表示不重试
+        backoff: 第一次重试前的最长等待（秒），之后每次翻倍
+        max_backoff: 单次等待上限（秒）
+    """
+    global RETRY_ATTEMPTS, RETRY_BACKOFF, RETRY_MAX_BACKOFF
+    if attempts is not None:
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1")
+        RETRY_ATTEMPTS = attempts
+    if backoff is not None:
+        RETRY_BACKOFF = backoff
+    if max_backoff is not None:
+        RETRY_MAX_BACKOFF = max_backoff
+
+
+def retry_delay(retry: int, retry_after: float | None = None) -> float:
+    """Returns how long to wait before the ``retry``-th retry
+
+    Uses capped exponential backoff with full jitter, so clients that failed
+    together do not retry together. A server's ``Retry-After`` is honoured up
+    to the cap.
+    """
+    delay = random.uniform(0, min(RETRY_MAX_BACKOFF, RETRY_BACKOFF * 2 ** (retry - 1)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, RETRY_MAX_BACKOFF))
+    return delay
+
+
+def _retry_after(value: str | None) -> float | None:
+    try:
+        return None if value is None else max(float(value), 0.0)
+    except ValueError:
+        # HTTP 日期格式不解析，按指数退避等待
+        return None
+
+
+def _rc_failed(payload: Any) -> bool:
+    # push2 系列接口出错时 HTTP 状态仍为 200，错误码放在 rc 中
+    return isinstance(payload, dict) and payload.get("rc", 0) not in (0, None)
+
+
+def _count(url: str, *events: str) -> None:
+    host = urlsplit(url).netloc
+    with _retry_stats_lock:
+        _retry_stats.setdefault(host, Counter()).update(events)
+
+
+def retry_stats() -> dict[str, dict[str, int]]:
+    """Returns request and retry counts per host
+
+    Returns:
+        dict: 主机 -> 计数:
+        - requests: 请求数（不含重试）
+        - retries: 重试次数
+        - network / status / rc: 因网络错误、HTTP 5xx/429、rc 非零而重试的次数
+        - exhausted: 重试用尽后仍失败的请求数
+    """
+    events = ("requests", "retries", "network", "status", "rc", "exhausted")
+    with _retry_stats_lock:
+        return {
+            host: {event: counts[event] for event in events}
+            for host, counts in _retry_stats.items()
+        }
+
+
+class EastMoneyRequests:
+    """
+    Builds the URLs and query parameters of EastMoney's data APIs.
+    Shared by the blocking and the asyncio clients.
+    """
 
     def _get_security_id(self, symbol: str) -> str:
         """
@@ -45,13 +233,10 @@ class EastMoneyClient:
             code = symbol
         return f"{market}.{code}"
 
-    def fetch_historical_klines(
+    def _historical_klines_request(
         self, symbol: str, klt: str, fqt: str, start_date: str, end_date: str
-    ) -> dict[str, Any]:
-        """
-        Fetches historical K-line (candlestick) data.
-        """
-        url = "https://push2his.eastmoney.com/api/qt/stock/kline/get"
+    ) -> tuple[str, dict[str, Any]]:
+        url = _url("push2his.eastmoney.com", "/api/qt/stock/kline/get")
         secid = self._get_security_id(symbol)
         params = {
             "fields1": "f1,f2,f3,f4,f5,f6",
@@ -62,15 +247,10 @@ class EastMoneyClient:
             "beg": start_date,
             "end": end_date,
         }
-        response = self.session.get(url, params=params)
-        response.raise_for_status()
-        return response.json()  # type: ignore
+        return url, params
 
-    def fetch_realtime_quote(self, symbol: str) -> dict[str, Any]:
-        """
-        Fetches real-time quote data for a single stock.
-        """
-        url = "https://push2.eastmoney.com/api/qt/stock/get"
+    def _realtime_quote_request(self, symbol: str) -> tuple[str, dict[str, Any]]:
+        url = _url("push2.eastmoney.com", "/api/qt/stock/get")
         secid = self._get_security_id(symbol)
         params = {
             "invt": "2",
@@ -80,6 +260,160 @@ class EastMoneyClient:
             ),
             "secid": secid,
         }
-        response = self.session.get(url, params=params)
-        response.raise_for_status()
-        return response.json()  # type: ignore
+        return url, params
+
+    def _financial_report_request(
+        self, report_name: str, symbol: str, columns: list[str]
+    ) -> tuple[str, dict[str, Any]]:
+        url = _url("datacenter-web.eastmoney.com", "/api/data/v1/get")
+        params = {
+            "reportName": report_name,
+            "filter": f'(SECURITY_CODE="{symbol}")',
+            "pageNumber": "1",
+            "pageSize": "1000",
+            "sortColumns": "REPORT_DATE",
+            "sortTypes": "-1",
+            "columns": ",".join(columns),
+        }
+        return url, params
+
+
+class EastMoneyClient(EastMoneyRequests):
+    """
+    A client for interacting directly with EastMoney's data APIs.
+    This class handles request signing and API calls; connections come from the
+    shared pooled session unless a session is given.
+
+    Requests fail fast with ``CircuitOpenError`` while the host's circuit
+    breaker is open, and every attempt waits for the host's rate limit.
+    All calls are idempotent GETs, so network errors, HTTP 5xx/429 responses
+    and payloads with a non-zero ``rc`` are retried, see ``configure_retries``.
+    Responses are decoded with orjson when it is installed.
+    """
+
+    def __init__(self, session: requests.Session | None = None) -> None:
+        self.session = session if session is not None else get_session()
+
+    def _get(
+        self, url: str, params: dict[str, Any], chunk_rows: int | None = None
+    ) -> Any:
+        breaker = circuit_breaker(urlsplit(url).netloc)
+        breaker.allow()
+        ok = None
+        try:
+            payload = self._send(url, params, chunk_rows)
+            ok = not _rc_failed(payload)
+            return payload
+        except Exception as e:
+            ok = not _upstream_failed(e)
+            raise
+        finally:
+            breaker.record(ok)
+
+    def _send(
+        self, url: str, params: dict[str, Any], chunk_rows: int | None = None
+    ) -> Any:
+        """Sends a GET with retries and decodes the JSON response
+
+        Args:
+            chunk_rows: 指定时流式读取K线响应，返回每批 chunk_rows 条的
+                KlineStream，没有K线时返回解码后的响应
+        """
+        _count(url, "requests")
+        host = urlsplit(url).netloc
+        attempt = 1
+        while True:
+            retry_after = None
+            acquire(host)
+            try:
+                response = self.session.get(
+                    url,
+                    params=params,
+                    timeout=HTTP_TIMEOUT,
+                    stream=chunk_rows is not None,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                reason = "network"
+                if attempt >= RETRY_ATTEMPTS:
+                    _count(url, "exhausted")
+                    raise
+            else:
+                if response.status_code in RETRY_STATUS:
+                    reason = "status"
+                    retry_after = _retry_after(response.headers.get("Retry-After"))
+                else:
+                    response.raise_for_status()
+                    if chunk_rows is not None:
+                        payload = open_kline_stream(
+                            response.iter_content(STREAM_READ_BYTES), chunk_rows
+                        )
+                    else:
+                        payload = loads(response.content)
+                    if not _rc_failed(payload):
+                        return payload
+                    reason = "rc"
+                if attempt >= RETRY_ATTEMPTS:
+                    _count(url, "exhausted")
+                    # 返回最后一次的错误，由调用方处理
+                    response.raise_for_status()
+                    return payload
+                response.close()
+            _count(url, "retries", reason)
+            time.sleep(retry_delay(attempt, retry_after))
+            attempt += 1
+
+    def fetch_historical_klines(
+        self, symbol: str, klt: str, fqt: str, start_date: str, end_date: str
+    ) -> dict[str, Any]:
+        """
+        Fetches historical K-line (candlestick) data.
+        """
+        return self._get(  # type: ignore
+            *self._historical_klines_request(symbol, klt, fqt, start_date, end_date)
+        )
+
+    def stream_historical_klines(
+        self,
+        symbol: str,
+        klt: str,
+        fqt: str,
+        start_date: str,
+        end_date: str,
+        chunk_rows: int = KLINE_CHUNK_ROWS,
+    ) -> Iterator[list[str]]:
+        """
+        Fetches historical K-line data, yielding the kline strings in chunks.
+
+        The response is read and decoded incrementally, so memory stays bounded
+        by ``chunk_rows`` however long the history is. Each chunk can be parsed
+        with ``parse_kline_data({"data": {"klines": chunk}})``. Retries only
+        happen before the first chunk; a connection lost later raises.
+        """
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1")
+        payload = self._get(
+            *self._historical_klines_request(symbol, klt, fqt, start_date, end_date),
+            chunk_rows=chunk_rows,
+        )
+        if isinstance(payload, KlineStream):
+            yield from payload
+            return
+        klines = (payload.get("data") or {}).get("klines") or []
+        for start in range(0, len(klines), chunk_rows):
+            yield klines[start : start + chunk_rows]
+
+    def fetch_realtime_quote(self, symbol: str) -> dict[str, Any]:
+        """
+        Fetches real-time quote data for a single stock.
+        """
+        return self._get(*self._realtime_quote_request(symbol))  # type: ignore
+
+    def fetch_financial_report(
+        self, report_name: str, symbol: str, columns: list[str]
+    ) -> dict[str, Any]:
+        """
+        Fetches a financial statement report from the datacenter API.
+        """
+        return self._get(  # type: ignore
+            *self._financial_report_request(report_name, symbol, columns)
+        )
@@ -0,0 +1,150 @@
+"""JSON decoding of EastMoney responses, with orjson when it is installed"""
+
+import itertools
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+ORJSON_AVAILABLE = False
+try:
+    import orjson  # type: ignore
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    # orjson is optional
+    pass
+
+# 流式解码时每批返回的K线条数
+KLINE_CHUNK_ROWS = 50_000
+# 流式读取响应时每次读取的字节数
+STREAM_READ_BYTES = 256 * 1024
+
+_KLINES_MARKER = b'"klines":['
+
+
+def loads(data: bytes | str) -> Any:
+    """Decodes a JSON document, with orjson when it is installed
+
+    Args:
+        data: JSON 文本，bytes 无需先解码为 str
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class KlineDecoder:
+    """
+    Incrementally decodes a kline response fed as raw byte chunks.
+
+    The ``klines`` array is decoded as its items arrive, so only the unread
+    tail of the array is buffered, never the whole document. The rest of the
+    response is kept and decoded by ``envelope()`` with an empty ``klines``.
+
+    Kline items are plain comma separated values without quotes, brackets or
+    escapes, so the array ends at the first ``]`` after it starts. If the
+    array is not found, the whole document is buffered and decoded at the end.
+    """
+
+    def __init__(self) -> None:
+        self._head = bytearray()
+        self._buffer = b""
+        self._tail = bytearray()
+        self.started = False
+        self.finished = False
+
+    def feed(self, data: bytes) -> list[str]:
+        """Adds the next bytes of the response and returns the completed klines"""
+        if not self.started:
+            self._head += data
+            start = self._head.find(_KLINES_MARKER)
+            if start < 0:
+                return []
+            start += len(_KLINES_MARKER)
+            data = bytes(self._head[start:])
+            del self._head[start:]
+            self.started = True
+        if self.finished:
+            self._tail += data
+            return []
+
+        buffer = self._buffer + data
+        end = buffer.find(b"]")
+        if end >= 0:
+            self.finished = True
+            self._tail += buffer[end:]
+            self._buffer = b""
+            complete = buffer[:end]
+        else:
+            # 最后一个完整元素以 ", 结尾，其后的部分等下一块数据
+            cut = buffer.rfind(b'",')
+            if cut < 0:
+                self._buffer = buffer
+                return []
+            complete, self._buffer = buffer[: cut + 1], buffer[cut + 2 :]
+        if not complete.strip():
+            return []
+        return loads(b"[" + complete + b"]")  # type: ignore
+
+    def envelope(self) -> dict[str, Any]:
+        """Decodes everything but the klines, once the response is fed in full"""
+        if not self.started:
+            return loads(bytes(self._head))  # type: ignore
+        if not self.finished:
+            raise ValueError("Kline response ended inside the klines array")
+        return loads(bytes(self._head + self._tail))  # type: ignore
+
+
+class KlineStream:
+    """
+    A kline response whose ``klines`` array is still being read.
+
+    Iterating yields lists of at most ``chunk_rows`` kline strings. The
+    other fields (code, name, ...) are in ``envelope`` once iteration ends.
+    """
+
+    def __init__(
+        self,
+        decoder: KlineDecoder,
+        chunks: Iterable[bytes],
+        pending: list[str],
+        chunk_rows: int = KLINE_CHUNK_ROWS,
+    ) -> None:
+        self.decoder = decoder
+        self.chunks = chunks
+        self.pending = pending
+        self.chunk_rows = chunk_rows
+        self.envelope: dict[str, Any] = {}
+
+    def __iter__(self) -> Iterator[list[str]]:
+        rows: list[str] = []
+        batches = itertools.chain([self.pending], map(self.decoder.feed, self.chunks))
+        for batch in batches:
+            rows.extend(batch)
+            while len(rows) >= self.chunk_rows:
+                yield rows[: self.chunk_rows]
+                del rows[: self.chunk_rows]
+        self.envelope = self.decoder.envelope()
+        if rows:
+            yield rows
+
+
+def open_kline_stream(
+    chunks: Iterable[bytes], chunk_rows: int = KLINE_CHUNK_ROWS
+) -> KlineStream | dict[str, Any]:
+    """Reads a kline response until its ``klines`` array starts
+
+    Returns a ``KlineStream`` over the rest of the response, or the decoded
+    document when it has no klines, e.g. an error with ``rc`` set.
+
+    Args:
+        chunks: 响应内容的字节块
+        chunk_rows: 每批返回的K线条数
+    """
+    chunks = iter(chunks)
+    decoder = KlineDecoder()
+    for data in chunks:
+        rows = decoder.feed(data)
+        if decoder.started:
+            return KlineStream(decoder, chunks, rows, chunk_rows)
+    return decoder.envelope()
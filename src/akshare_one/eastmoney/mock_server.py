@@ -0,0 +1,345 @@
+"""A local stand-in for EastMoney's APIs, for offline tests and benchmarks"""
+
+import datetime as dt
+import functools
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from . import client
+from .recording import Cassette
+
+# 路径 -> 所属主机
+ROUTES = {
+    "/api/qt/stock/kline/get": "push2his.eastmoney.com",
+    "/api/qt/stock/get": "push2.eastmoney.com",
+    "/api/data/v1/get": "datacenter-web.eastmoney.com",
+}
+ERROR_KINDS = ("status", "rc", "reset")
+
+# 模拟数据的起点，同一代码每次生成的价格序列相同
+_ORIGIN = pd.Timestamp("2000-01-04")
+_INTRADAY_KLT = {"1", "5", "15", "30", "60"}
+_PERIODS = {"102": "W-FRI", "103": "BME"}
+
+
+def _walk(secid: str, periods: int, salt: str) -> pd.DataFrame:
+    """Deterministic OHLCV bars for a security
+
+    All draws come from one row-major matrix, so the first bars are the same
+    whatever the number of periods.
+    """
+    rng = np.random.default_rng(zlib.crc32(f"{secid}:{salt}".encode()))
+    noise = rng.standard_normal((periods, 5))
+    close = 10 * np.exp(np.cumsum(noise[:, 0] * 0.02))
+    prev = np.concatenate([[close[0]], close[:-1]])
+    open_ = prev * (1 + noise[:, 1] * 0.005)
+    high = np.maximum(open_, close) * (1 + np.abs(noise[:, 2]) * 0.01)
+    low = np.minimum(open_, close) * (1 - np.abs(noise[:, 3]) * 0.01)
+    volume = (10_000 + np.abs(noise[:, 4]) * 300_000).astype(np.int64)
+    return pd.DataFrame(
+        {
+            "open": open_.round(2),
+            "close": close.round(2),
+            "high": high.round(2),
+            "low": low.round(2),
+            "volume": volume,
+            "amount": (volume * close * 100).round(2),
+            "amplitude": ((high - low) / prev * 100).round(2),
+            "pct_change": ((close / prev - 1) * 100).round(2),
+            "change": (close - prev).round(2),
+            "turnover": (volume / 200_000).round(2),
+        }
+    )
+
+
+def _parse_date(value: str, default: pd.Timestamp) -> pd.Timestamp:
+    try:
+        return pd.Timestamp(dt.datetime.strptime(value, "%Y%m%d"))
+    except ValueError:
+        return default
+
+
+@functools.lru_cache(maxsize=64)
+def _calendar(klt: str, end: pd.Timestamp) -> pd.DatetimeIndex:
+    if klt in _PERIODS:
+        return pd.date_range(_ORIGIN, end, freq=_PERIODS[klt])
+    # freq="B" 逐日生成较慢，用 numpy 计算工作日
+    days = np.arange(
+        np.datetime64(_ORIGIN.date(), "D"),
+        np.datetime64(end.date(), "D") + np.timedelta64(1, "D"),
+        dtype="M8[D]",
+    )
+    return pd.DatetimeIndex(days[np.is_busday(days)])
+
+
+def _intraday_index(
+    start: pd.Timestamp, end: pd.Timestamp, step: int
+) -> pd.DatetimeIndex:
+    # 最近5个交易日，每日 09:31-11:30 和 13:01-15:00
+    calendar = _calendar("101", end)
+    days = calendar[calendar >= start][-5:].to_numpy().astype("M8[m]")
+    minutes = np.concatenate([np.arange(571, 691), np.arange(781, 901)])[
+        step - 1 :: step
+    ]
+    stamps = days[:, None] + minutes.astype("m8[m]")[None, :]
+    return pd.DatetimeIndex(stamps.ravel())
+
+
+def mock_klines(params: dict[str, str]) -> dict[str, Any]:
+    """Builds a kline response for the requested security, period and dates"""
+    secid = params.get("secid", "1.600000")
+    klt = params.get("klt", "101")
+    today = pd.Timestamp.today().normalize()
+    start = max(_parse_date(params.get("beg", ""), _ORIGIN), _ORIGIN)
+    end = min(_parse_date(params.get("end", ""), today), today)
+
+    if klt in _INTRADAY_KLT:
+        index = _intraday_index(start, end, int(klt))
+        bars = _walk(secid, len(index), f"{klt}:{end.date()}")
+        dates = index.strftime("%Y-%m-%d %H:%M")
+    else:
+        # 从固定起点生成，不同区间的请求返回一致的数据
+        index = _calendar(klt, max(end, _ORIGIN))
+        bars = _walk(secid, len(index), klt)
+        keep = index >= start
+        bars = bars[keep]
+        dates = pd.DatetimeIndex(index[keep]).strftime("%Y-%m-%d")
+
+    columns = [dates.tolist(), *(bars[name].tolist() for name in bars.columns)]
+    klines = [",".join(map(str, row)) for row in zip(*columns, strict=True)]
+    market, _, code = secid.partition(".")
+    return {
+        "rc": 0,
+        "rt": 17,
+        "data": {
+            "code": code,
+            "market": int(market) if market.isdigit() else 0,
+            "name": f"MOCK{code}",
+            "decimal": 2,
+            "dktotal": len(klines),
+            "klines": klines,
+        },
+    }
+
+
+def mock_quote(params: dict[str, str]) -> dict[str, Any]:
+    """Builds a real-time quote response for the requested security"""
+    secid = params.get("secid", "1.600000")
+    bar = _walk(secid, 2, "quote").iloc[-1]
+    code = secid.partition(".")[2]
+    return {
+        "rc": 0,
+        "rt": 4,
+        "data": {
+            "f43": float(bar["close"]),
+            "f44": float(bar["high"]),
+            "f45": float(bar["low"]),
+            "f46": float(bar["open"]),
+            "f47": int(bar["volume"]),
+            "f48": float(bar["amount"]),
+            "f57": code,
+            "f58": f"MOCK{code}",
+            "f60": round(float(bar["close"] - bar["change"]), 2),
+            "f169": float(bar["change"]),
+            "f170": float(bar["pct_change"]),
+        },
+    }
+
+
+def mock_report(params: dict[str, str]) -> dict[str, Any]:
+    """Builds a datacenter report response with the requested columns"""
+    code = params.get("filter", "").partition('"')[2].partition('"')[0]
+    columns = [c for c in params.get("columns", "REPORT_DATE").split(",") if c]
+    report = params.get("reportName", "")
+    rng = np.random.default_rng(zlib.crc32(f"{code}:{report}".encode()))
+    dates = pd.date_range(end="2024-12-31", periods=20, freq="QE")[::-1]
+    rows = []
+    for date in dates:
+        row: dict[str, Any] = {}
+        for column in columns:
+            if column == "REPORT_DATE":
+                row[column] = date.strftime("%Y-%m-%d 00:00:00")
+            elif column == "SECURITY_CODE":
+                row[column] = code
+            else:
+                row[column] = round(float(rng.uniform(1e6, 1e10)), 2)
+        rows.append(row)
+    return {
+        "version": "mock",
+        "result": {"pages": 1, "data": rows, "count": len(rows)},
+        "success": True,
+        "message": "ok",
+        "code": 0,
+    }
+
+
+_BUILDERS = {
+    "/api/qt/stock/kline/get": mock_klines,
+    "/api/qt/stock/get": mock_quote,
+    "/api/data/v1/get": mock_report,
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _generated(path: str, query: str) -> bytes:
+    # 生成的数据是确定的，缓存编码后的响应，使服务器开销不影响基准测试
+    params = dict(parse_qsl(query, keep_blank_values=True))
+    payload = _BUILDERS[path](params)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+class MockUpstream:
+    """
+    A local HTTP server answering EastMoney's kline, quote and report APIs.
+
+    While running, ``EastMoneyClient`` and ``AsyncEastMoneyClient`` requests
+    for those hosts are sent to it (see ``configure_endpoints``). Responses
+    come from a recorded cassette when it has the request, and are generated
+    otherwise: prices follow a deterministic random walk per security, so
+    repeated and overlapping requests agree. Each request can be delayed by
+    ``latency`` plus up to ``jitter`` seconds and fails with probability
+    ``error_rate``.
+
+    Example:
+        >>> with MockUpstream(latency=0.05, error_rate=0.01):
+        ...     df = get_hist_data("600000", source="eastmoney_direct")
+    """
+
+    def __init__(
+        self,
+        cassette: str | Path | Cassette | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error: str = "status",
+        seed: int | None = None,
+        port: int = 0,
+    ) -> None:
+        """
+        Args:
+            cassette: 录制的响应，优先于生成的数据
+            latency: 每个请求的固定延迟（秒）
+            jitter: 额外的随机延迟上限（秒）
+            error_rate: 注入错误的概率
+            error: 错误类型，"status" 返回 HTTP 503，"rc" 返回 rc 非零，
+                "reset" 直接断开连接
+            seed: 延迟和错误注入的随机种子
+            port: 监听端口，默认随机
+        """
+        if error not in ERROR_KINDS:
+            raise ValueError(f"error must be one of {ERROR_KINDS}, got {error!r}")
+        if isinstance(cassette, (str, Path)):
+            cassette = Cassette(cassette)
+        self.cassette = cassette
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error = error
+        self.port = port
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+        self._previous: dict[str, str | None] = {}
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("MockUpstream is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def _draw(self) -> tuple[float, bool]:
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            return delay, failed
+
+    def respond(self, path: str, query: str) -> tuple[int, bytes] | None:
+        """Returns the status and body for a request, None to drop the connection"""
+        delay, failed = self._draw()
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            if self.error == "reset":
+                return None
+            if self.error == "rc":
+                return 200, b'{"rc":102,"rt":0,"data":null}'
+            return 503, b"Service Unavailable"
+
+        if path not in ROUTES:
+            return 404, b"Not Found"
+        if self.cassette is not None:
+            interaction = self.cassette.get("GET", f"{path}?{query}")
+            if interaction is not None:
+                return interaction["status"], interaction["body"].encode("utf-8")
+        return 200, _generated(path, query)
+
+    def start(self) -> "MockUpstream":
+        """Starts serving and points the EastMoney clients at the server"""
+        if self._server is not None:
+            raise RuntimeError("MockUpstream already started")
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                result = upstream.respond(parts.path, parts.query)
+                if result is None:
+                    self.close_connection = True
+                    return
+                status, body = result
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="akshare-one-mock-upstream",
+            daemon=True,
+        )
+        self._thread.start()
+        self._previous = {host: client.ENDPOINTS.get(host) for host in ROUTES.values()}
+        client.configure_endpoints(dict.fromkeys(ROUTES.values(), self.url))
+        return self
+
+    def stop(self) -> None:
+        """Stops the server and restores the EastMoney endpoints"""
+        if self._server is None:
+            return
+        client.configure_endpoints(self._previous)
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "MockUpstream":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
@@ -0,0 +1,226 @@
+"""Records EastMoney API responses to a file and replays them offline"""
+
+import json
+import threading
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from . import client
+
+CASSETTE_MODES = ("replay", "record", "auto")
+# 回放时需要保留的响应头
+_KEPT_HEADERS = ("Content-Type", "Retry-After")
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode for a request that was never recorded"""
+
+
+def request_key(method: str, url: str, ignore_params: Iterable[str] = ()) -> str:
+    """Returns the key a request is recorded under
+
+    Query parameters are sorted, so the same request matches whatever order
+    its parameters were sent in. The host is left out as each EastMoney API
+    has its own path, so responses recorded from EastMoney can be served by
+    ``MockUpstream`` and the other way round.
+
+    Args:
+        method: HTTP 方法
+        url: 完整请求地址
+        ignore_params: 不参与匹配的参数，例如时间戳
+    """
+    parts = urlsplit(url)
+    ignored = set(ignore_params)
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name not in ignored
+    )
+    return f"{method.upper()} {parts.path}?{urlencode(query)}"
+
+
+class Cassette:
+    """
+    Recorded responses keyed by ``request_key``, saved as a JSON file.
+
+    Each interaction keeps the status, the headers needed to replay it and the
+    body text, so files can be reviewed and edited by hand.
+    """
+
+    def __init__(self, path: str | Path, ignore_params: Iterable[str] = ()) -> None:
+        """
+        Args:
+            path: JSON 文件路径，存在时加载其中的记录
+            ignore_params: 不参与匹配的参数
+        """
+        self.path = Path(path)
+        self.ignore_params = frozenset(ignore_params)
+        self.interactions: dict[str, dict[str, Any]] = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            for interaction in data["interactions"]:
+                self.interactions[interaction["request"]] = interaction
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    def key(self, method: str, url: str) -> str:
+        return request_key(method, url, self.ignore_params)
+
+    def get(self, method: str, url: str) -> dict[str, Any] | None:
+        """Returns the recorded interaction of a request, if any"""
+        return self.interactions.get(self.key(method, url))
+
+    def put(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: Mapping[str, str],
+        body: str,
+    ) -> None:
+        """Records a response, replacing an earlier one for the same request"""
+        key = self.key(method, url)
+        with self._lock:
+            self.interactions[key] = {
+                "request": key,
+                "status": status,
+                "headers": {
+                    name: headers[name] for name in _KEPT_HEADERS if name in headers
+                },
+                "body": body,
+            }
+            self.dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                "version": 1,
+                "interactions": sorted(
+                    self.interactions.values(), key=lambda item: item["request"]
+                ),
+            }
+            self.path.write_text(
+                json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8"
+            )
+            self.dirty = False
+
+
+class CassetteAdapter(HTTPAdapter):
+    """
+    A ``requests`` transport that answers from a ``Cassette``.
+
+    In ``"replay"`` mode every request must have been recorded, otherwise
+    ``CassetteMissError`` is raised and nothing is sent. ``"record"`` sends
+    every request and records the response, and ``"auto"`` replays recorded
+    requests and records the others. Responses with a retryable status
+    (HTTP 429/5xx) are passed through without being recorded.
+    """
+
+    def __init__(self, cassette: Cassette, mode: str = "replay", **kwargs: Any) -> None:
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"mode must be one of {CASSETTE_MODES}, got {mode!r}")
+        super().__init__(**kwargs)
+        self.cassette = cassette
+        self.mode = mode
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: None | float | tuple[float, float] | tuple[float, None] = None,
+        verify: bool | str = True,
+        cert: None | bytes | str | tuple[bytes | str, bytes | str] = None,
+        proxies: Mapping[str, str] | None = None,
+    ) -> requests.Response:
+        method = request.method or "GET"
+        url = request.url or ""
+        if self.mode != "record":
+            interaction = self.cassette.get(method, url)
+            if interaction is not None:
+                return self._replay(request, interaction)
+            if self.mode == "replay":
+                raise CassetteMissError(
+                    f"No recorded response for {self.cassette.key(method, url)}"
+                )
+
+        response = super().send(request, False, timeout, verify, cert, proxies)
+        if response.status_code in client.RETRY_STATUS:
+            # 临时错误不记录，否则回放时会一直失败
+            return response
+        self.cassette.put(
+            method,
+            url,
+            response.status_code,
+            response.headers,
+            response.content.decode(response.encoding or "utf-8"),
+        )
+        return response
+
+    def _replay(
+        self, request: requests.PreparedRequest, interaction: Mapping[str, Any]
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        response._content = interaction["body"].encode("utf-8")
+        # 流式读取时直接返回已有内容
+        response._content_consumed = True  # type: ignore[attr-defined]
+        response.encoding = "utf-8"
+        response.url = request.url or ""
+        response.request = request
+        response.connection = self
+        return response
+
+
+@contextmanager
+def use_cassette(
+    path: str | Path, mode: str = "auto", ignore_params: Iterable[str] = ()
+) -> Iterator[Cassette]:
+    """Records or replays the EastMoney requests made inside the block
+
+    Replaces the shared session of ``EastMoneyClient`` for the duration of the
+    block, so every direct provider created inside it, including the
+    datacenter financial reports, goes through the cassette. The asyncio
+    client is not covered; use ``MockUpstream`` to serve it recorded data.
+    The file is written when the block exits if anything was recorded.
+
+    Args:
+        path: 记录文件路径 (JSON)
+        mode: "replay" 只回放，未记录的请求抛出 CassetteMissError；
+            "record" 总是请求并记录；"auto" 回放已记录的请求，记录其他请求
+        ignore_params: 不参与匹配的参数
+
+    Example:
+        >>> with use_cassette("tests/cassettes/600000.json"):
+        ...     df = get_hist_data("600000", source="eastmoney_direct")
+    """
+    cassette = Cassette(path, ignore_params)
+    adapter = CassetteAdapter(
+        cassette,
+        mode,
+        pool_maxsize=max([client.DEFAULT_POOL_SIZE, *client.HTTP_POOL_SIZES.values()]),
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    with client._session_lock:
+        previous, client._session = client._session, session
+    try:
+        yield cassette
+    finally:
+        with client._session_lock:
+            client._session = previous
+        session.close()
+        if cassette.dirty:
+            cassette.save()
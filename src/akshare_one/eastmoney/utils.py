@@ -1,38 +1,136 @@
+import io
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
+PYARROW_AVAILABLE = False
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.csv as pa_csv  # type: ignore
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    # pyarrow is optional
+    pass
+
+# fields2=f51..f61 返回的字段，按接口顺序
+KLINE_FIELDS = [
+    "timestamp",
+    "open",
+    "close",
+    "high",
+    "low",
+    "volume",
+    "amount",
+    "amplitude",
+    "pct_change",
+    "change",
+    "turnover",
+]
+# 输出列顺序，前六列与其他数据源一致
+KLINE_COLUMNS = [
+    "timestamp",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "amount",
+    "amplitude",
+    "pct_change",
+    "change",
+    "turnover",
+]
+# 停牌等情况下部分字段为 "-"
+_KLINE_NA = ["-"]
+# 至少包含时间和 OHLCV 的K线才解析，缺少的字段为 NaN
+_KLINE_MIN_FIELDS = 6
+
+
+def _pad_klines(klines: list[str]) -> list[str]:
+    """Pads short klines with "-" to all fields, dropping ones without OHLCV"""
+    width = len(KLINE_FIELDS)
+    padded = []
+    for kline in klines:
+        parts = kline.split(",")
+        if len(parts) >= _KLINE_MIN_FIELDS:
+            padded.append(",".join((parts + _KLINE_NA * width)[:width]))
+    return padded
+
+
+def _empty_klines() -> pd.DataFrame:
+    return pd.DataFrame(columns=KLINE_COLUMNS)
+
+
+def _read_klines(klines: list[str]) -> pd.DataFrame:
+    if PYARROW_AVAILABLE:
+        invalid = []
+
+        def skip(row: Any) -> str:
+            invalid.append(row)
+            return "skip"
+
+        # pyarrow 直接解析时间并按输出顺序取列，多核时按块并行；
+        # 成交量有缺失值时转为 float64
+        types = {name: pa.float64() for name in KLINE_FIELDS}
+        types.update(timestamp=pa.timestamp("us"), volume=pa.int64())
+        table = pa_csv.read_csv(
+            pa.py_buffer("\n".join(klines).encode("utf-8")),
+            read_options=pa_csv.ReadOptions(column_names=KLINE_FIELDS),
+            parse_options=pa_csv.ParseOptions(
+                quote_char=False, invalid_row_handler=skip
+            ),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=types,
+                include_columns=KLINE_COLUMNS,
+                null_values=_KLINE_NA,
+            ),
+        )
+        if invalid:
+            # 字段数不是 11 的K线补齐后重新解析，只在出现这类K线时多花一遍
+            padded = _pad_klines(klines)
+            return _read_klines(padded) if padded else _empty_klines()
+        return table.to_pandas()  # type: ignore
+
+    if any(kline.count(",") != len(KLINE_FIELDS) - 1 for kline in klines):
+        klines = _pad_klines(klines)
+        if not klines:
+            return _empty_klines()
+    df = pd.read_csv(
+        io.StringIO("\n".join(klines)),
+        header=None,
+        names=KLINE_FIELDS,
+        dtype={"timestamp": str, **dict.fromkeys(KLINE_FIELDS[1:], np.float64)},
+        na_values=_KLINE_NA,
+        keep_default_na=False,
+    )
+    df["timestamp"] = pd.to_datetime(df["timestamp"], format="ISO8601")
+    if df["volume"].notna().all():
+        df["volume"] = df["volume"].astype(np.int64)
+    return df[KLINE_COLUMNS]
+
 
 def parse_kline_data(data: dict[str, Any]) -> pd.DataFrame:
     """
     Parses K-line data from the API response into a pandas DataFrame.
+
+    All klines are joined and parsed as one CSV document, with pyarrow when
+    it is installed, instead of splitting each row in Python. Returns every
+    field requested by ``fetch_historical_klines``: the OHLCV columns first,
+    then amount, amplitude, pct_change, change and turnover (percentages as
+    in the API). Missing values ("-") become NaN, as do fields absent from
+    klines with fewer than eleven; klines without the six OHLCV fields are
+    skipped.
     """
-    klines = data.get("data", {}).get("klines", [])
+    klines = (data.get("data") or {}).get("klines") or []
     if not klines:
-        return pd.DataFrame(
-            columns=["timestamp", "open", "high", "low", "close", "volume"]
-        )
+        return _empty_klines()
 
-    records = []
-    for kline in klines:
-        parts = kline.split(",")
-        if len(parts) >= 6:
-            records.append(
-                {
-                    "timestamp": parts[0],
-                    "open": float(parts[1]),
-                    "close": float(parts[2]),
-                    "high": float(parts[3]),
-                    "low": float(parts[4]),
-                    "volume": int(parts[5]),
-                }
-            )
-
-    df = pd.DataFrame(records)
-    if not df.empty:
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df["timestamp"] = df["timestamp"].dt.tz_localize("Asia/Shanghai")
-        df = df[["timestamp", "open", "high", "low", "close", "volume"]]
+    df = _read_klines(klines)
+    if df.empty:
+        return df
+    df["timestamp"] = df["timestamp"].dt.tz_localize("Asia/Shanghai")
     return df
 
 
@@ -69,6 +167,9 @@ def resample_historical_data(
 ) -> pd.DataFrame:
     """
     Resamples historical data to a specified frequency.
+
+    OHLC, volume, amount and turnover are aggregated per period; per-bar
+    fields such as change, pct_change and amplitude are dropped.
     """
     if df.empty or multiplier <= 1:
         return df
@@ -86,18 +187,19 @@ def resample_historical_data(
     if not freq:
         return df.reset_index()
 
+    # 涨跌额、涨跌幅和振幅无法由各K线的值合并得到，重采样后不再返回
+    aggregations = {
+        "open": "first",
+        "high": "max",
+        "low": "min",
+        "close": "last",
+        "volume": "sum",
+        "amount": "sum",
+        "turnover": "sum",
+    }
     resampled = (
         df.resample(freq)
-        .agg(
-            {
-                "open": "first",
-                "high": "max",
-                "low": "min",
-                "close": "last",
-                "volume": "sum",
-            }
-        )
-        .dropna()
+        .agg({name: how for name, how in aggregations.items() if name in df.columns})
+        .dropna(subset=["open", "high", "low", "close"])
     )
-
     return resampled.reset_index()
@@ -1,45 +1,1759 @@
+import asyncio
+import contextlib
+import copy
+import datetime as dt
+import functools
+import inspect
+import logging
+import math
 import os
-from collections.abc import Callable
-from typing import Any, TypeVar
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Generator,
+    Hashable,
+    Iterable,
+    Iterator,
+)
+from typing import Any, Literal, Protocol, TypeVar
+from zoneinfo import ZoneInfo
 
-from cachetools import TTLCache, cached
+import numpy as np
+import pandas as pd
+from cachetools import TLRUCache, TTLCache, keys
 
 F = TypeVar("F", bound=Callable[..., Any])
 
+logger = logging.getLogger(__name__)
+
+
+def frame_size(value: Any) -> int:
+    """Returns the memory held by a cached value in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    return sys.getsizeof(value)
+
+
+class TTLPolicy:
+    """Decides when a cache entry expires
+
+    Policies are set per namespace with ``configure_cache(ttl_policy=...)``.
+    An instance is also a valid ``ttu`` for ``cachetools.TLRUCache`` created
+    with ``timer=time.time``.
+    """
+
+    def expires_at(self, now: float) -> float:
+        """Returns the expiry time of an entry stored at ``now`` (Unix time)"""
+        raise NotImplementedError
+
+    def __call__(self, key: Any, value: Any, now: float) -> float:
+        return self.expires_at(now)
+
+
+class FixedTTL(TTLPolicy):
+    """Expires entries a fixed number of seconds after they are stored"""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+
+    def expires_at(self, now: float) -> float:
+        return now + self.ttl
+
+
+_SHANGHAI = ZoneInfo("Asia/Shanghai")
+# 沪深交易时段，含开盘集合竞价
+_SESSIONS = (
+    (dt.time(9, 15), dt.time(11, 30)),
+    (dt.time(13, 0), dt.time(15, 0)),
+)
+
+
+class TradingSessionTTL(TTLPolicy):
+    """Expires entries according to the Shanghai/Shenzhen trading sessions
+
+    While the market is open entries live for ``open_ttl`` seconds. Outside the
+    sessions (lunch break, after the close, weekends and ``holidays``) the data
+    cannot change, so entries live until the next session opens, capped at
+    ``closed_ttl`` seconds if given.
+
+    Args:
+        open_ttl: 交易时段内的过期时间（秒）
+        closed_ttl: 非交易时段的最长过期时间（秒），默认到下次开盘
+        holidays: 休市日期（周末以外）
+    """
+
+    def __init__(
+        self,
+        open_ttl: float,
+        closed_ttl: float | None = None,
+        holidays: Iterable[dt.date] = (),
+    ) -> None:
+        self.open_ttl = open_ttl
+        self.closed_ttl = closed_ttl
+        self.holidays = frozenset(holidays)
+
+    def is_trading_day(self, day: dt.date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays
+
+    def in_session(self, now: float) -> bool:
+        local = dt.datetime.fromtimestamp(now, _SHANGHAI)
+        if not self.is_trading_day(local.date()):
+            return False
+        return any(start <= local.time() < end for start, end in _SESSIONS)
+
+    def next_open(self, now: float) -> float:
+        """Returns the start of the next trading session after ``now``"""
+        local = dt.datetime.fromtimestamp(now, _SHANGHAI)
+        day = local.date()
+        for _ in range(366):
+            if self.is_trading_day(day):
+                for start, _end in _SESSIONS:
+                    opens = dt.datetime.combine(day, start, _SHANGHAI)
+                    if opens > local:
+                        return opens.timestamp()
+            day += dt.timedelta(days=1)
+        raise ValueError("no trading day within a year")
+
+    def expires_at(self, now: float) -> float:
+        if self.in_session(now):
+            return now + self.open_ttl
+        expires = self.next_open(now)
+        if self.closed_ttl is not None:
+            expires = min(expires, now + self.closed_ttl)
+        return expires
+
+
+class _CountingTTLCache(TTLCache[Any, Any]):
+    """TTLCache that counts evictions and expirations for ``cache_stats()``"""
+
+    evictions = 0
+    expirations = 0
+
+    def expire(self, time: float | None = None) -> list[tuple[Any, Any]]:
+        expired = super().expire(time)
+        self.expirations += len(expired)
+        return expired
+
+    def popitem(self) -> tuple[Any, Any]:
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class _CountingTLRUCache(TLRUCache[Any, Any]):
+    """TLRUCache that counts evictions and expirations for ``cache_stats()``"""
+
+    evictions = 0
+    expirations = 0
+
+    def expire(self, time: float | None = None) -> list[tuple[Any, Any]]:
+        expired = super().expire(time)
+        self.expirations += len(expired)
+        return expired
+
+    def popitem(self) -> tuple[Any, Any]:
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class ValueTooLargeError(ValueError):
+    """Raised by a cache backend for a value that does not fit in ``maxsize``"""
+
+
+class SerializationError(ValueError):
+    """Raised by a cache backend that cannot serialize a value, e.g. with Arrow"""
+
+
+class CacheBackend(Protocol):
+    """
+    Storage behind one cache namespace.
+
+    A backend is a mapping from cache keys to values that drops entries once they
+    expire: reads of expired or missing keys raise ``KeyError``, storing a
+    value larger than ``maxsize`` raises ``ValueTooLargeError`` (a plain
+    ``ValueError`` from cachetools) and storing one the backend cannot
+    serialize raises ``SerializationError``. ``maxsize`` and ``currsize`` are
+    measured with ``getsizeof``. The cachetools caches used by
+    default, ``DiskCache``, ``SharedMemoryCache`` and ``RedisCache`` all
+    implement it.
+
+    Backends may also provide ``ttl`` or ``ttu`` (how long new entries live),
+    ``expires_at(key)``, ``expire()``, ``nbytes`` and ``evictions`` /
+    ``expirations`` counters; they are used by the statistics and snapshot
+    functions when present. Backends that synchronize their own state, such as
+    ``DiskCache`` and ``RedisCache``, set ``thread_safe = True`` and are then
+    read and written outside the namespace lock.
+    """
+
+    @property
+    def maxsize(self) -> float: ...
+
+    @property
+    def currsize(self) -> float: ...
+
+    def getsizeof(self, value: Any) -> float: ...
+
+    def __getitem__(self, key: Any) -> Any: ...
+
+    def __setitem__(self, key: Any, value: Any) -> None: ...
+
+    def __delitem__(self, key: Any) -> None: ...
+
+    def __contains__(self, key: object) -> bool: ...
+
+    def __iter__(self) -> Iterator[Any]: ...
+
+    def __len__(self) -> int: ...
+
+
+# 实时数据交易时段缓存1分钟，收盘后缓存到下次开盘
+_REALTIME_TTL = TradingSessionTTL(open_ttl=60)
+
 # 缓存配置
-CACHE_CONFIG: dict[str, TTLCache[Any, Any]] = {
-    "hist_data_cache": TTLCache(maxsize=1000, ttl=3600),  # 历史数据缓存1小时
-    "realtime_cache": TTLCache(maxsize=500, ttl=60),  # 实时数据缓存1分钟
-    "news_cache": TTLCache(maxsize=500, ttl=3600),  # 新闻数据缓存1小时
-    "financial_cache": TTLCache(maxsize=500, ttl=86400),  # 财务数据缓存24小时
-    "info_cache": TTLCache(maxsize=500, ttl=86400),  # 信息数据缓存24小时
+CACHE_CONFIG: dict[str, CacheBackend] = {
+    "hist_data_cache": _CountingTTLCache(
+        maxsize=512 * 1024 * 1024, ttl=86400, getsizeof=frame_size
+    ),  # 历史数据缓存24小时，最多占用512MB内存
+    "realtime_cache": _CountingTLRUCache(
+        maxsize=500, ttu=_REALTIME_TTL, timer=time.time
+    ),
+    "news_cache": _CountingTTLCache(maxsize=500, ttl=3600),  # 新闻数据缓存1小时
+    "financial_cache": _CountingTTLCache(maxsize=500, ttl=86400),  # 财务数据缓存24小时
+    "info_cache": _CountingTTLCache(maxsize=500, ttl=86400),  # 信息数据缓存24小时
+}
+
+# 按交易时段等规则计算过期时间的命名空间
+_ttl_policies: dict[str, TTLPolicy] = {
+    "realtime_cache": _REALTIME_TTL,
 }
 
+# 默认持久化到磁盘的缓存
+DISK_CACHE_NAMESPACES = ("hist_data_cache", "financial_cache", "info_cache")
+
+
+def enable_disk_cache(
+    directory: str | os.PathLike[str],
+    namespaces: Iterable[str] = DISK_CACHE_NAMESPACES,
+) -> None:
+    """Replaces in-memory caches with Parquet-backed disk caches
+
+    Each namespace is stored in its own subdirectory of ``directory`` and keeps
+    the maxsize and ttl of the cache it replaces, so cached data survives process
+    restarts without any change to the providers.
+
+    Args:
+        directory: 缓存根目录
+        namespaces: 需要持久化的缓存名称
+    """
+    from .cache_backends.disk import DiskCache
+
+    for namespace in namespaces:
+        if namespace not in CACHE_CONFIG:
+            raise KeyError(
+                f"Cache configuration '{namespace}' not found. "
+                f"Available keys: {list(CACHE_CONFIG.keys())}"
+            )
+        current: Any = CACHE_CONFIG[namespace]
+        CACHE_CONFIG[namespace] = DiskCache(
+            os.path.join(os.path.expanduser(directory), namespace),
+            maxsize=int(current.maxsize),
+            ttl=getattr(current, "ttl", 0.0),
+            getsizeof=current.getsizeof,
+            ttu=getattr(current, "ttu", None),
+        )
+
+
+# 默认在同一主机的进程间共享的缓存
+SHARED_CACHE_NAMESPACES = ("hist_data_cache",)
+
+
+def enable_shared_memory_cache(
+    namespaces: Iterable[str] = SHARED_CACHE_NAMESPACES,
+    prefix: str = "akshare_one",
+) -> None:
+    """Replaces in-memory caches with caches shared by all processes on the host
+
+    Frames are stored once in ``multiprocessing.shared_memory`` as Arrow buffers,
+    so workers of a multi-process server (e.g. gunicorn) map the same entries
+    instead of each fetching and holding its own copy. Each namespace keeps the
+    maxsize and ttl of the cache it replaces. Requires ``akshare-one[arrow]``
+    and a POSIX system.
+
+    Args:
+        namespaces: 需要共享的缓存名称
+        prefix: 共享内存名称前缀，不同前缀的进程互不共享
+    """
+    from .cache_backends.shm import SharedMemoryCache
+
+    for namespace in namespaces:
+        if namespace not in CACHE_CONFIG:
+            raise KeyError(
+                f"Cache configuration '{namespace}' not found. "
+                f"Available keys: {list(CACHE_CONFIG.keys())}"
+            )
+        current: Any = CACHE_CONFIG[namespace]
+        CACHE_CONFIG[namespace] = SharedMemoryCache(
+            f"{prefix}_{namespace}",
+            maxsize=int(current.maxsize),
+            ttl=getattr(current, "ttl", 0.0),
+            getsizeof=current.getsizeof,
+            ttu=getattr(current, "ttu", None),
+        )
+
+
+# 默认压缩闲置条目的缓存
+COMPRESSED_CACHE_NAMESPACES = ("hist_data_cache", "financial_cache")
+
+
+def enable_compressed_cache(
+    namespaces: Iterable[str] = COMPRESSED_CACHE_NAMESPACES,
+    idle: float = 300,
+    compression: str = "zstd",
+) -> None:
+    """Compresses DataFrames that have not been read for ``idle`` seconds
+
+    Replaces each namespace with a two-tier in-memory cache: recently used
+    entries stay as DataFrames, idle ones are kept as compressed Arrow IPC
+    buffers and decompressed on their next access. Byte-bounded namespaces
+    count cold entries at their compressed size, so the same budget holds
+    several times more data. Each namespace keeps the maxsize and ttl of the
+    cache it replaces. Requires ``akshare-one[arrow]``.
+
+    Args:
+        namespaces: 需要压缩的缓存名称
+        idle: 多久未访问后压缩（秒）
+        compression: IPC 压缩算法 ('zstd', 'lz4')
+    """
+    from .cache_backends.compressed import CompressedCache
+
+    for namespace in namespaces:
+        if namespace not in CACHE_CONFIG:
+            raise KeyError(
+                f"Cache configuration '{namespace}' not found. "
+                f"Available keys: {list(CACHE_CONFIG.keys())}"
+            )
+        current: Any = CACHE_CONFIG[namespace]
+        CACHE_CONFIG[namespace] = CompressedCache(
+            maxsize=int(current.maxsize),
+            ttl=getattr(current, "ttl", 0.0),
+            idle=idle,
+            getsizeof=current.getsizeof,
+            ttu=getattr(current, "ttu", None),
+            compression=compression,
+        )
+
+
+# 默认在集群内通过 Redis 共享的缓存
+REDIS_CACHE_NAMESPACES = ("hist_data_cache", "financial_cache", "info_cache")
+
+
+def enable_redis_cache(
+    url: str = "redis://localhost:6379/0",
+    namespaces: Iterable[str] = REDIS_CACHE_NAMESPACES,
+    prefix: str = "akshare_one",
+    client: Any = None,
+    compression: str | None = None,
+) -> None:
+    """Replaces in-memory caches with caches stored in Redis
+
+    All processes and hosts using the same Redis server share fetched data.
+    Frames are stored as Arrow IPC streams that expire through Redis key expiry,
+    and each namespace keeps the maxsize and ttl of the cache it replaces.
+    Requires ``akshare-one[redis]``.
+
+    Args:
+        url: Redis 连接地址，传入 client 时忽略
+        namespaces: 需要存入 Redis 的缓存名称
+        prefix: 键名前缀，不同前缀的进程互不共享
+        client: 已创建的 redis.Redis 客户端
+        compression: IPC 压缩算法 ('zstd', 'lz4')，默认不压缩
+    """
+    from .cache_backends.redis import RedisCache
+
+    if client is None:
+        import redis  # type: ignore
+
+        client = redis.Redis.from_url(url)
+
+    for namespace in namespaces:
+        if namespace not in CACHE_CONFIG:
+            raise KeyError(
+                f"Cache configuration '{namespace}' not found. "
+                f"Available keys: {list(CACHE_CONFIG.keys())}"
+            )
+        current: Any = CACHE_CONFIG[namespace]
+        CACHE_CONFIG[namespace] = RedisCache(
+            client,
+            f"{prefix}:{namespace}:",
+            maxsize=int(current.maxsize),
+            ttl=getattr(current, "ttl", 0.0),
+            getsizeof=current.getsizeof,
+            ttu=getattr(current, "ttu", None),
+            compression=compression,
+        )
+
+
+# 启用 stale-while-revalidate 的命名空间及其宽限期（秒）
+_stale_grace: dict[str, float] = {}
+# 各条目的过期时间（Unix 时间），用于宽限期判断、导入快照的剩余有效期和导出
+_expires_at: dict[str, dict[Hashable, float]] = {}
+
+
+def configure_cache(
+    namespace: str,
+    *,
+    maxsize: int | None = None,
+    ttl: float | None = None,
+    max_bytes: int | None = None,
+    stale_grace: float | None = None,
+    ttl_policy: TTLPolicy | None = None,
+    no_data_ttl: float | None = None,
+    error_ttl: float | None = None,
+) -> None:
+    """Replaces a namespace with a new in-memory cache
+
+    With ``max_bytes`` the cache is bounded by the memory its DataFrames hold
+    (``DataFrame.memory_usage(deep=True)``) instead of by entry count, and the
+    least recently used entries are evicted once the budget is exceeded.
+
+    With ``ttl_policy`` each entry's expiry is computed by the policy when it is
+    stored, e.g. ``TradingSessionTTL`` keeps data cached until the next open once
+    the market has closed. It takes precedence over ``ttl``.
+
+    With ``stale_grace`` the namespace serves stale-while-revalidate: for up to
+    ``stale_grace`` seconds after an entry expires it is still returned
+    immediately, while a background thread fetches a fresh value and swaps it in.
+
+    ``no_data_ttl`` and ``error_ttl`` set how long empty results and upstream
+    failures are remembered, see ``NEGATIVE_TTL``.
+
+    Values not given are taken from the current cache, except ``stale_grace``
+    which is disabled unless given. Existing entries are dropped.
+
+    Args:
+        namespace: 缓存名称，不存在时新建
+        maxsize: 最大条目数
+        ttl: 过期时间（秒）
+        max_bytes: 最大内存占用（字节），优先于 maxsize
+        stale_grace: 过期后仍返回旧数据并后台刷新的时间（秒）
+        ttl_policy: 过期策略，优先于 ttl
+        no_data_ttl: 空结果的缓存时间（秒），0 表示不缓存
+        error_ttl: 上游错误的缓存时间（秒），0 表示不缓存
+    """
+    current: Any = CACHE_CONFIG.get(namespace)
+    if ttl is None and ttl_policy is None:
+        ttl_policy = _ttl_policies.get(namespace)
+        if ttl_policy is None:
+            if current is None:
+                raise ValueError(f"ttl is required for new cache '{namespace}'")
+            ttl = current.ttl - _stale_grace.get(namespace, 0.0)
+
+    getsizeof: Callable[[Any], int] | None = None
+    if max_bytes is None and maxsize is None:
+        if current is None:
+            raise ValueError(f"maxsize or max_bytes is required for '{namespace}'")
+        if current.getsizeof is frame_size:
+            max_bytes = int(current.maxsize)
+        else:
+            maxsize = int(current.maxsize)
+    if max_bytes is not None:
+        maxsize, getsizeof = max_bytes, frame_size
+    assert maxsize is not None
+
+    # 过期条目在宽限期内仍需保留在缓存中
+    grace = stale_grace or 0.0
+    store: CacheBackend
+    if ttl_policy is not None:
+        policy = ttl_policy
+        store = _CountingTLRUCache(
+            maxsize=maxsize,
+            ttu=lambda key, value, now: policy.expires_at(now) + grace,
+            timer=time.time,
+            getsizeof=getsizeof,
+        )
+    else:
+        assert ttl is not None
+        store = _CountingTTLCache(maxsize=maxsize, ttl=ttl + grace, getsizeof=getsizeof)
+
+    with _get_lock(namespace):
+        CACHE_CONFIG[namespace] = store
+        _expires_at.pop(namespace, None)
+        if stale_grace:
+            _stale_grace[namespace] = stale_grace
+        else:
+            _stale_grace.pop(namespace, None)
+        if ttl_policy is not None:
+            _ttl_policies[namespace] = ttl_policy
+        else:
+            _ttl_policies.pop(namespace, None)
+        negative_ttl = _negative_ttls.get(namespace, NEGATIVE_TTL)
+        _negative_ttls[namespace] = {
+            "no_data": negative_ttl["no_data"] if no_data_ttl is None else no_data_ttl,
+            "error": negative_ttl["error"] if error_ttl is None else error_ttl,
+        }
+        _negative.pop(namespace, None)
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes", "on")
+
+
+_enabled = _env_flag("AKSHARE_ONE_CACHE_ENABLED", "true")
+
+
+def set_cache_enabled(enabled: bool) -> None:
+    """Enables or disables caching at runtime
+
+    The initial value is read once from ``AKSHARE_ONE_CACHE_ENABLED`` at import.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def is_cache_enabled() -> bool:
+    return _enabled
+
+
+def _get_store(cache_key: str) -> CacheBackend:
+    if cache_key not in CACHE_CONFIG:
+        raise KeyError(
+            f"Cache configuration '{cache_key}' not found. "
+            f"Available keys: {list(CACHE_CONFIG.keys())}"
+        )
+    return CACHE_CONFIG[cache_key]
+
+
+# cachetools 缓存不是线程安全的，每个命名空间使用一把锁
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _get_lock(cache_key: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(cache_key, threading.Lock())
+
+
+def _store_guard(
+    store: CacheBackend, lock: threading.Lock
+) -> contextlib.AbstractContextManager[Any]:
+    """Returns the lock to hold while reading or writing ``store``
+
+    Thread-safe backends do disk or network I/O, which must not block the
+    namespace; they are accessed without the namespace lock.
+    """
+    return contextlib.nullcontext() if getattr(store, "thread_safe", False) else lock
+
+
+def _bookkeeping_guard(
+    store: CacheBackend, lock: threading.Lock
+) -> contextlib.AbstractContextManager[Any]:
+    """Returns the lock to take for expiries and statistics inside ``_store_guard``"""
+    return lock if getattr(store, "thread_safe", False) else contextlib.nullcontext()
+
+
+async def _off_loop(store: CacheBackend, func: Callable[..., Any], *args: Any) -> Any:
+    """Calls func in a worker thread when it does I/O on a thread-safe backend
+
+    ``DiskCache`` and ``RedisCache`` read files and sockets; doing that on the
+    event loop would block every other coroutine. In-memory stores are called
+    directly.
+    """
+    if getattr(store, "thread_safe", False):
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
+
+_MISSING = object()
+
+# 每个命名空间每写入这么多次，清理一次已不在缓存中的过期时间记录
+PRUNE_INTERVAL = 1024
+_writes: Counter[str] = Counter()
+
+
+def _freeze(value: Any) -> None:
+    """Marks the arrays of a DataFrame about to be cached as read-only
+
+    Hits hand out the cached arrays, so writing into a returned frame would
+    change the cached entry; with the arrays flagged non-writeable it raises
+    instead.
+    """
+    if not isinstance(value, pd.DataFrame):
+        return
+    frame: Any = value
+    for array in frame._mgr.arrays:
+        if isinstance(array, np.ndarray):
+            array.flags.writeable = False
+
+
+def _share(value: Any) -> Any:
+    """Returns a shallow copy of a cached DataFrame
+
+    The copy shares the cached arrays, so no data is copied, but it has its own
+    column index: callers may add or drop columns without touching the cache.
+    With Copy-on-Write, writing into existing values copies the affected
+    columns first; without it the read-only arrays make such writes raise.
+    """
+    if not isinstance(value, pd.DataFrame):
+        return value
+    return value.copy(deep=False)
+
+
+def _lookup(store: CacheBackend, lock: threading.Lock, key: Any) -> Any:
+    with _store_guard(store, lock):
+        try:
+            return store[key]
+        except KeyError:
+            return _MISSING
+
+
+def _deadline(store: CacheBackend, key: Any, value: Any, now: float) -> float:
+    """Returns when a value stored now would expire"""
+    ttu = getattr(store, "ttu", None)
+    if ttu is not None:
+        return float(ttu(key, value, now))
+    return now + getattr(store, "ttl", math.inf)
+
+
+def _store(
+    cache_key: str,
+    store: CacheBackend,
+    lock: threading.Lock,
+    key: Any,
+    value: Any,
+    expires: float | None = None,
+) -> None:
+    """Stores a value and records when it expires
+
+    Args:
+        expires: 更早的过期时间（Unix 时间），例如从快照导入的剩余有效期
+    """
+    _freeze(value)
+    deadline = _deadline(store, key, value, time.time())
+    if expires is not None:
+        deadline = min(deadline, expires)
+
+    with _store_guard(store, lock):
+        try:
+            store[key] = value
+        except ValueTooLargeError:
+            return
+        except SerializationError as e:
+            logger.warning("Cannot cache %s in %s: %s", key, cache_key, e)
+            return
+        except ValueError:
+            # cachetools 对过大的值抛出普通 ValueError
+            if store.getsizeof(value) <= store.maxsize:
+                raise
+            return
+        with _bookkeeping_guard(store, lock):
+            expiries = _expires_at.setdefault(cache_key, {})
+            expiries[key] = deadline
+            _writes[cache_key] += 1
+            prune = _writes[cache_key] % PRUNE_INTERVAL == 0
+        if prune:
+            _prune_expiries(cache_key, store, lock)
+
+
+def _prune_expiries(cache_key: str, store: CacheBackend, lock: threading.Lock) -> None:
+    """Forgets the expiry of entries that left the cache
+
+    Entries past their deadline are gone from the store; evicted ones are only
+    looked up when the dict has grown well beyond the store. Callers must be
+    inside ``_store_guard``.
+    """
+    now = time.time()
+    with _bookkeeping_guard(store, lock):
+        expiries = _expires_at.setdefault(cache_key, {})
+        for k in [k for k, expires in expiries.items() if expires <= now]:
+            del expiries[k]
+        candidates = list(expiries)
+    if len(candidates) <= 2 * len(store) + 64:
+        return
+    evicted = [k for k in candidates if k not in store]
+    with _bookkeeping_guard(store, lock):
+        for k in evicted:
+            expiries.pop(k, None)
+
+
+def _entry_expiry(cache_key: str, store: CacheBackend, key: Any) -> float:
+    """Returns when an entry expires, or inf if unknown"""
+    expires = _expires_at.get(cache_key, {}).get(key)
+    if expires is None and hasattr(store, "expires_at"):
+        expires = store.expires_at(key)
+    return math.inf if expires is None else expires
+
+
+def _past_deadline(cache_key: str, key: Any) -> bool:
+    """Whether an entry is no longer fresh and needs refreshing
+
+    Entries normally leave the cache when they expire; this also covers entries
+    imported with a shorter remaining lifetime and the grace window of
+    stale-while-revalidate namespaces. Entries without a recorded expiry (e.g.
+    loaded from disk by a new process) count as fresh.
+    """
+    expires = _expires_at.get(cache_key, {}).get(key)
+    if expires is None:
+        return False
+    return expires - _stale_grace.get(cache_key, 0.0) <= time.time()
+
+
+class NoDataError(ValueError):
+    """Raised when the upstream has no data for a request, e.g. an invalid symbol"""
+
+
+# 负缓存：空结果（no_data）和上游错误（error）只缓存较短时间，与正常结果分开保存。
+# no_data 不会超过命名空间本身的有效期，0 表示不缓存
+NEGATIVE_TTL = {"no_data": 3600.0, "error": 15.0}
+_negative_ttls: dict[str, dict[str, float]] = {}
+_negative: dict[str, TLRUCache[Any, tuple[str, Any, float]]] = {}
+
+
+def _failure_kind(error: BaseException) -> str:
+    """Classifies a failure as "no_data" or a transient "error"
+
+    Providers raise ``NoDataError``, possibly wrapped in another exception, when
+    the upstream answered but has nothing for the request; everything else is
+    treated as a failure worth retrying soon.
+    """
+    cause: BaseException | None = error
+    while cause is not None:
+        if isinstance(cause, NoDataError):
+            return "no_data"
+        cause = cause.__cause__
+    return "error"
+
+
+def _is_empty(value: Any) -> bool:
+    return isinstance(value, pd.DataFrame) and value.empty
+
+
+_PARTIAL = "akshare_one_partial"
+
+
+def mark_partial(frame: pd.DataFrame) -> pd.DataFrame:
+    """Marks a result assembled despite some failed upstream requests
+
+    Cached functions return such a frame as usual, but it is remembered only
+    for the namespace's ``error_ttl``, like a failure, instead of being cached
+    as a complete result.
+    """
+    frame.attrs[_PARTIAL] = True
+    return frame
+
+
+def _is_partial(value: Any) -> bool:
+    return isinstance(value, pd.DataFrame) and bool(value.attrs.get(_PARTIAL))
+
+
+def _remember_failure(
+    cache_key: str, store: CacheBackend, key: Any, kind: str, result: Any
+) -> None:
+    """Stores an empty result or an exception in the negative cache
+
+    Callers must hold the namespace lock.
+    """
+    ttl = _negative_ttls.get(cache_key, NEGATIVE_TTL)[kind]
+    if ttl <= 0:
+        return
+    now = time.time()
+    expires = now + ttl
+    if kind == "no_data":
+        expires = min(expires, _deadline(store, key, result, now))
+    negative = _negative.get(cache_key)
+    if negative is None:
+        negative = _negative[cache_key] = _CountingTLRUCache(
+            maxsize=10_000, ttu=lambda k, entry, now: entry[2], timer=time.time
+        )
+    negative[key] = (kind, result, expires)
+
+
+def _negative_lookup(cache_key: str, key: Any) -> tuple[str, Any, float] | None:
+    """Returns a remembered failure; callers must hold the namespace lock"""
+    negative = _negative.get(cache_key)
+    return None if negative is None else negative.get(key)
+
+
+def _replay(failure: tuple[str, Any, float]) -> Any:
+    """Returns the remembered empty result or raises the remembered error"""
+    _, result, _ = failure
+    if isinstance(result, BaseException):
+        # 抛出副本，避免多个线程同时修改同一个异常的 traceback；
+        # copy 不会复制异常链，需要保留 __cause__ 以区分无数据和临时故障
+        error = copy.copy(result)
+        error.__cause__ = result.__cause__
+        error.__context__ = result.__context__
+        error.__suppress_context__ = result.__suppress_context__
+        raise error
+    return _share(result)
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class _SingleFlight:
+    """Collapses concurrent calls for the same key into a single call
+
+    The first caller runs the function; callers arriving while it is in flight
+    wait for it and share its result or exception.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.collapsed: Counter[str] = Counter()
+
+    def do(self, namespace: str, key: Hashable, func: Callable[[], Any]) -> Any:
+        flight_key = (namespace, key)
+        with self._lock:
+            call = self._calls.get(flight_key)
+            if call is None:
+                call = self._calls[flight_key] = _Call()
+                leader = True
+            else:
+                self.collapsed[namespace] += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[flight_key]
+            call.done.set()
+
+
+_single_flight = _SingleFlight()
+
+
+class _AsyncSingleFlight:
+    """Collapses concurrent awaits for the same key into a single task
+
+    The first caller starts a task on its event loop; callers on the same loop
+    arriving while it runs await the same task. Cancelling a caller does not
+    cancel the shared task.
+    """
+
+    def __init__(self, collapsed: Counter[str]) -> None:
+        self._calls: dict[Hashable, asyncio.Task[Any]] = {}
+        self.collapsed = collapsed
+
+    async def do(
+        self,
+        namespace: str,
+        key: Hashable,
+        func: Callable[[], Coroutine[Any, Any, Any]],
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), namespace, key)
+        task = self._calls.get(flight_key)
+        if task is None or task.get_loop() is not loop:
+            task = self._calls[flight_key] = loop.create_task(func())
+            task.add_done_callback(
+                lambda done: (
+                    self._calls.pop(flight_key, None)
+                    if self._calls.get(flight_key) is done
+                    else None
+                )
+            )
+        else:
+            self.collapsed[namespace] += 1
+        return await asyncio.shield(task)
+
+
+_async_single_flight = _AsyncSingleFlight(_single_flight.collapsed)
+
+
+# 协程等待被占用的序列锁时，两次重试之间的最长间隔（秒）
+LOCK_POLL_INTERVAL = 0.05
+
+
+class _KeyedLocks:
+    """Serializes callers per key, dropping each lock once nobody uses it
+
+    Threads and coroutines share one ``threading.Lock`` per key, so a blocking
+    and an async caller of the same key never run at once. Coroutines take it
+    without blocking the event loop, retrying with a growing delay.
+    """
+
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        # key -> [锁, 持有和等待的调用数]
+        self._locks: dict[Hashable, list[Any]] = {}
+
+    def _acquire(self, key: Hashable, factory: Callable[[], Any]) -> list[Any]:
+        with self._guard:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [factory(), 0]
+            entry[1] += 1
+        return entry
+
+    def _release(self, key: Hashable, entry: list[Any]) -> None:
+        with self._guard:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[key]
+
+    @contextlib.contextmanager
+    def hold(self, key: Hashable) -> Iterator[None]:
+        entry = self._acquire(key, threading.Lock)
+        try:
+            with entry[0]:
+                yield
+        finally:
+            self._release(key, entry)
+
+    @contextlib.asynccontextmanager
+    async def ahold(self, key: Hashable) -> AsyncIterator[None]:
+        entry = self._acquire(key, threading.Lock)
+        try:
+            delay = 0.001
+            while not entry[0].acquire(blocking=False):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, LOCK_POLL_INTERVAL)
+            try:
+                yield
+            finally:
+                entry[0].release()
+        finally:
+            self._release(key, entry)
+
+
+# 同一历史数据序列的加载依次进行，后来者基于合并后的缓存只获取仍缺少的部分
+_series_locks = _KeyedLocks()
+
+_revalidating: set[Hashable] = set()
+_revalidating_guard = threading.Lock()
+
+
+def _revalidate(cache_key: str, key: Hashable, func: Callable[[], Any]) -> None:
+    """Runs func in a background thread unless a refresh of key is running
+
+    The refresh goes through single-flight, so callers missing the same key in
+    the meantime wait for it instead of fetching again.
+    """
+    flight_key = (cache_key, key)
+    with _revalidating_guard:
+        if flight_key in _revalidating:
+            return
+        _revalidating.add(flight_key)
+
+    def run() -> None:
+        try:
+            _single_flight.do(cache_key, key, func)
+        except Exception as e:
+            logger.warning("Background refresh of %s failed: %s", flight_key, e)
+        finally:
+            with _revalidating_guard:
+                _revalidating.discard(flight_key)
+
+    threading.Thread(target=run, name="akshare-one-revalidate", daemon=True).start()
+
+
+# 后台刷新任务，保留引用以免被回收
+_background_tasks: set[asyncio.Task[Any]] = set()
+
+
+def _arevalidate(
+    cache_key: str, key: Hashable, func: Callable[[], Coroutine[Any, Any, Any]]
+) -> None:
+    """Like ``_revalidate``, but refreshes in a task on the running event loop"""
+    flight_key = (cache_key, key)
+    with _revalidating_guard:
+        if flight_key in _revalidating:
+            return
+        _revalidating.add(flight_key)
+
+    async def run() -> None:
+        try:
+            await _async_single_flight.do(cache_key, key, func)
+        except Exception as e:
+            logger.warning("Background refresh of %s failed: %s", flight_key, e)
+        finally:
+            with _revalidating_guard:
+                _revalidating.discard(flight_key)
+
+    task = asyncio.get_running_loop().create_task(run())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _store_bytes(store: CacheBackend, lock: threading.Lock) -> int:
+    """Returns the bytes held by a cache namespace"""
+    sized: Any = store
+    with _store_guard(store, lock):
+        if getattr(sized, "getsizeof", None) is frame_size:
+            return int(sized.currsize)
+        if hasattr(sized, "nbytes"):
+            return int(sized.nbytes)
+        total = 0
+        for k in list(store):
+            with contextlib.suppress(KeyError):
+                total += frame_size(store[k])
+        return total
+
+
+class _NamespaceStats:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.loads = 0
+        self.load_time = 0.0
+
+    def timed(self, func: Callable[[], Any]) -> Any:
+        """Calls func and records how long the upstream took"""
+        started = time.perf_counter()
+        result = func()
+        self.load_time += time.perf_counter() - started
+        self.loads += 1
+        return result
+
+    async def atimed(self, awaitable: Awaitable[Any]) -> Any:
+        """Awaits the upstream call and records how long it took"""
+        started = time.perf_counter()
+        result = await awaitable
+        self.load_time += time.perf_counter() - started
+        self.loads += 1
+        return result
+
+
+_stats: dict[str, _NamespaceStats] = {}
+
+
+def _get_stats(cache_key: str) -> _NamespaceStats:
+    with _locks_guard:
+        return _stats.setdefault(cache_key, _NamespaceStats())
+
+
+def cache_stats() -> dict[str, dict[str, float]]:
+    """Returns per-namespace cache statistics
+
+    - hits: 命中次数（包括过期后返回旧数据）
+    - misses: 未命中次数
+    - evictions: 因容量不足淘汰的条目数
+    - expirations: 过期清除的条目数
+    - collapsed: 因请求合并而未访问上游的调用次数
+    - negative_hits: 命中负缓存（空结果或上游错误）的次数
+    - entries: 当前缓存条目数
+    - negative_entries: 当前负缓存条目数
+    - bytes: 当前占用字节数，磁盘缓存为文件大小
+    - avg_latency_saved: 每次命中平均节省的上游请求耗时（秒）
+    """
+    stats = {}
+    for namespace, store in list(CACHE_CONFIG.items()):
+        lock = _get_lock(namespace)
+        counters = _get_stats(namespace)
+        with _store_guard(store, lock):
+            entries = len(store)
+        with lock:
+            negative = _negative.get(namespace)
+            negative_entries = 0 if negative is None else len(negative)
+        stats[namespace] = {
+            "hits": counters.hits,
+            "misses": counters.misses,
+            "evictions": getattr(store, "evictions", 0),
+            "expirations": getattr(store, "expirations", 0),
+            "collapsed": _single_flight.collapsed[namespace],
+            "negative_hits": counters.negative_hits,
+            "entries": entries,
+            "negative_entries": negative_entries,
+            "bytes": _store_bytes(store, lock),
+            "avg_latency_saved": (
+                counters.load_time / counters.loads if counters.loads else 0.0
+            ),
+        }
+    return stats
+
+
+def _key_str(key: Any) -> str:
+    return key if isinstance(key, str) else repr(key)
+
+
+def _namespaces(namespace: str | None) -> list[str]:
+    if namespace is None:
+        return list(CACHE_CONFIG)
+    _get_store(namespace)
+    return [namespace]
+
+
+def cache_keys(prefix: str = "", namespace: str | None = None) -> dict[str, list[Any]]:
+    """Lists the unexpired cache keys starting with ``prefix``
+
+    Args:
+        prefix: 缓存键前缀，例如 "eastmoney_direct_hist_600000_"
+        namespace: 缓存名称，默认所有缓存
+
+    Returns:
+        dict: 缓存名称到缓存键列表的映射
+    """
+    result = {}
+    for name in _namespaces(namespace):
+        store = CACHE_CONFIG[name]
+        with _store_guard(store, _get_lock(name)):
+            result[name] = [k for k in list(store) if _key_str(k).startswith(prefix)]
+    return result
+
+
+def inspect_cache(key: Any, namespace: str | None = None) -> list[dict[str, Any]]:
+    """Describes the cached entries stored under ``key``
+
+    Returns:
+        list: 每个包含该键的缓存一项，包括 namespace, key, type, rows, bytes,
+        以及历史数据序列的 start/end 覆盖区间
+    """
+    entries = []
+    for name in _namespaces(namespace):
+        value = _lookup(CACHE_CONFIG[name], _get_lock(name), key)
+        if value is _MISSING:
+            continue
+        info: dict[str, Any] = {
+            "namespace": name,
+            "key": key,
+            "type": type(value).__name__,
+            "rows": len(value) if isinstance(value, pd.DataFrame) else None,
+            "bytes": frame_size(value),
+        }
+        with contextlib.suppress(KeyError):
+            start, end = _cached_span(value)
+            info["start"], info["end"] = start.date(), end.date()
+        entries.append(info)
+    return entries
+
+
+def invalidate_cache(prefix: str = "", namespace: str | None = None) -> int:
+    """Removes the cache entries whose keys start with ``prefix``
+
+    Remembered empty results and upstream errors are removed as well. An empty
+    prefix clears the whole namespace.
+
+    Args:
+        prefix: 缓存键前缀
+        namespace: 缓存名称，默认所有缓存
+
+    Returns:
+        int: 删除的条目数
+    """
+    removed = 0
+    for name, matched in cache_keys(prefix, namespace).items():
+        store = CACHE_CONFIG[name]
+        lock = _get_lock(name)
+        with _store_guard(store, lock):
+            for k in matched:
+                with contextlib.suppress(KeyError):
+                    del store[k]
+                    removed += 1
+            with _bookkeeping_guard(store, lock):
+                for k in matched:
+                    _expires_at.get(name, {}).pop(k, None)
+    for name in _namespaces(namespace):
+        with _get_lock(name):
+            negative = _negative.get(name)
+            if negative is None:
+                continue
+            for k in [k for k in negative if _key_str(k).startswith(prefix)]:
+                with contextlib.suppress(KeyError):
+                    del negative[k]
+                    removed += 1
+    return removed
+
+
+def _select_namespaces(namespaces: Iterable[str] | None) -> list[str]:
+    if namespaces is None:
+        return list(CACHE_CONFIG)
+    names = list(namespaces)
+    for name in names:
+        _get_store(name)
+    return names
+
+
+def export_cache(
+    path: str | os.PathLike[str], namespaces: Iterable[str] | None = None
+) -> int:
+    """Writes the cached DataFrames to a snapshot file
+
+    Entries are stored as Arrow IPC inside a zstd-compressed Parquet file along
+    with their expiry time, so ``import_cache`` on another node restores them
+    with their remaining lifetime. Only DataFrames under string keys, which all
+    providers use, are exported. Requires ``akshare-one[arrow]``.
+
+    Args:
+        path: 快照文件路径
+        namespaces: 需要导出的缓存名称，默认全部
+
+    Returns:
+        int: 导出的条目数
+    """
+    from .cache_backends.ipc import frame_to_ipc, write_bundle
+
+    now = time.time()
+    rows = []
+    for name in _select_namespaces(namespaces):
+        store = CACHE_CONFIG[name]
+        with _store_guard(store, _get_lock(name)):
+            entries = []
+            for k in list(store):
+                with contextlib.suppress(KeyError):
+                    entries.append((k, store[k], _entry_expiry(name, store, k)))
+
+        for k, value, expires in entries:
+            if not isinstance(k, str) or not isinstance(value, pd.DataFrame):
+                continue
+            if expires <= now or math.isinf(expires):
+                continue
+            rows.append(
+                {
+                    "namespace": name,
+                    "key": k,
+                    "expires": expires,
+                    "data": frame_to_ipc(value),
+                }
+            )
+
+    write_bundle(os.path.expanduser(path), rows)
+    return len(rows)
+
+
+def import_cache(
+    path: str | os.PathLike[str], namespaces: Iterable[str] | None = None
+) -> int:
+    """Loads a snapshot written by ``export_cache`` into the caches
+
+    Entries that expired since the export and namespaces that do not exist in
+    this process are skipped. Imported entries expire at their original time,
+    or earlier if the local cache's ttl is shorter.
+
+    Args:
+        path: 快照文件路径
+        namespaces: 需要导入的缓存名称，默认全部
+
+    Returns:
+        int: 导入的条目数
+    """
+    from .cache_backends.ipc import frame_from_ipc, read_bundle
+
+    selected = None if namespaces is None else set(namespaces)
+    now = time.time()
+    imported = 0
+    for row in read_bundle(os.path.expanduser(path)):
+        name = row["namespace"]
+        if name not in CACHE_CONFIG or row["expires"] <= now:
+            continue
+        if selected is not None and name not in selected:
+            continue
+        value = frame_from_ipc(row["data"])
+        _store(
+            name, CACHE_CONFIG[name], _get_lock(name), row["key"], value, row["expires"]
+        )
+        imported += 1
+    return imported
+
 
 def cache(cache_key: str, key: Callable[..., Any] | None = None) -> Callable[[F], F]:
+    """Caches a function's results in a namespace
+
+    Coroutine functions are supported as well: their results share the
+    namespace with the blocking functions, concurrent awaits of the same key
+    are collapsed, and stale entries are refreshed in a background task.
+
+    Args:
+        cache_key: 缓存名称
+        key: 根据参数生成缓存键，默认使用全部参数
+    """
+    make_key = key if key is not None else keys.hashkey
+    lock = _get_lock(cache_key)
+    stats = _get_stats(cache_key)
+
+    def fail(store: CacheBackend, k: Any, error: Exception) -> None:
+        with lock:
+            _remember_failure(cache_key, store, k, _failure_kind(error), error)
+
+    def keep(store: CacheBackend, k: Any, value: Any) -> Any:
+        if _is_partial(value):
+            with lock:
+                _remember_failure(cache_key, store, k, "error", value)
+            return value
+        if _is_empty(value):
+            with lock:
+                _remember_failure(cache_key, store, k, "no_data", value)
+            return value
+        _store(cache_key, store, lock, k, value)
+        with lock:
+            negative = _negative.get(cache_key)
+            if negative is not None:
+                negative.pop(k, None)
+        return value
+
+    def cached(store: CacheBackend, k: Any) -> Any:
+        """Returns the entry to load from, a remembered failure or _MISSING"""
+        value = _lookup(store, lock, k)
+        if value is _MISSING:
+            with lock:
+                failure = _negative_lookup(cache_key, k)
+            if failure is not None:
+                return _replay(failure)
+        if value is not _MISSING and _past_deadline(cache_key, k):
+            return _MISSING
+        return value
+
+    def probe(store: CacheBackend, k: Any) -> tuple[Any, Any, bool]:
+        """Looks up a call and counts it as a hit or miss
+
+        Returns (value or _MISSING, remembered failure or None, stale).
+        """
+        stale = False
+        failure = None
+        with _store_guard(store, lock):
+            try:
+                value = store[k]
+            except KeyError:
+                value = _MISSING
+            with _bookkeeping_guard(store, lock):
+                if value is not _MISSING:
+                    stale = _past_deadline(cache_key, k)
+                    if stale and cache_key not in _stale_grace:
+                        value = _MISSING
+                if value is _MISSING:
+                    failure = _negative_lookup(cache_key, k)
+                if failure is not None:
+                    stats.negative_hits += 1
+                elif value is _MISSING:
+                    stats.misses += 1
+                else:
+                    stats.hits += 1
+        return value, failure, stale
+
     def decorator(func: F) -> F:
+        def refresh(store: CacheBackend, k: Any, args: Any, kwargs: Any) -> Any:
+            try:
+                value = stats.timed(lambda: func(*args, **kwargs))
+            except Exception as e:
+                fail(store, k, e)
+                raise
+            return keep(store, k, value)
+
+        def load(store: CacheBackend, k: Any, args: Any, kwargs: Any) -> Any:
+            value = cached(store, k)
+            if value is _MISSING:
+                value = refresh(store, k, args, kwargs)
+            return value
+
+        async def arefresh(store: CacheBackend, k: Any, args: Any, kwargs: Any) -> Any:
+            try:
+                value = await stats.atimed(func(*args, **kwargs))
+            except Exception as e:
+                fail(store, k, e)
+                raise
+            return await _off_loop(store, keep, store, k, value)
+
+        async def aload(store: CacheBackend, k: Any, args: Any, kwargs: Any) -> Any:
+            value = await _off_loop(store, cached, store, k)
+            if value is _MISSING:
+                value = await arefresh(store, k, args, kwargs)
+            return value
+
+        @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            cache_enabled = os.getenv("AKSHARE_ONE_CACHE_ENABLED", "true").lower() in (
-                "1",
-                "true",
-                "yes",
-                "on",
-            )
-
-            if cache_enabled:
-                if cache_key not in CACHE_CONFIG:
-                    raise KeyError(
-                        f"Cache configuration '{cache_key}' not found. "
-                        f"Available keys: {list(CACHE_CONFIG.keys())}"
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            store = CACHE_CONFIG.get(cache_key)
+            if store is None:
+                store = _get_store(cache_key)
+            k = make_key(*args, **kwargs)
+            value, failure, stale = probe(store, k)
+
+            if failure is not None:
+                return _replay(failure)
+            if value is not _MISSING:
+                if stale:
+                    _revalidate(cache_key, k, lambda: refresh(store, k, args, kwargs))
+                return _share(value)
+
+            return _share(
+                _single_flight.do(cache_key, k, lambda: load(store, k, args, kwargs))
+            )
+
+        @functools.wraps(func)
+        async def awrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return await func(*args, **kwargs)
+
+            store = _get_store(cache_key)
+            k = make_key(*args, **kwargs)
+            value, failure, stale = await _off_loop(store, probe, store, k)
+
+            if failure is not None:
+                return _replay(failure)
+            if value is not _MISSING:
+                if stale:
+                    _arevalidate(cache_key, k, lambda: arefresh(store, k, args, kwargs))
+                return _share(value)
+
+            return _share(
+                await _async_single_flight.do(
+                    cache_key, k, lambda: aload(store, k, args, kwargs)
+                )
+            )
+
+        if inspect.iscoroutinefunction(func):
+            return awrapper  # type: ignore
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+_RANGE_START = "akshare_one_range_start"
+_RANGE_END = "akshare_one_range_end"
+_FETCHED_AT = "akshare_one_fetched_at"
+
+# 覆盖到当日的历史数据在交易时段内每5分钟刷新一次，收盘后保留到下次开盘
+HIST_REFRESH_INTERVAL = 300
+HIST_REFRESH_POLICY: TTLPolicy = TradingSessionTTL(open_ttl=HIST_REFRESH_INTERVAL)
+
+
+def _to_day(date_str: str) -> pd.Timestamp:
+    return pd.Timestamp(date_str).normalize()
+
+
+def _cached_span(entry: Any) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """Returns the date span covered by a cached series
+
+    Raises:
+        KeyError: If the entry is missing or is not a cached series
+    """
+    if not isinstance(entry, pd.DataFrame):
+        raise KeyError("not a cached series")
+    return pd.Timestamp(entry.attrs[_RANGE_START]), pd.Timestamp(
+        entry.attrs[_RANGE_END]
+    )
+
+
+def _slice_range(frame: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+    """Returns the rows of a timestamp-sorted frame within the requested dates
+
+    A date-only ``end_date`` includes the whole day.
+    """
+    timestamps = frame["timestamp"]
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date)
+    end_side: Literal["left", "right"] = "right"
+    if ":" not in end_date:
+        end, end_side = end.normalize() + pd.Timedelta(days=1), "left"
+
+    tz = getattr(timestamps.dt, "tz", None) if len(frame) else None
+    if tz is not None:
+        start, end = start.tz_localize(tz), end.tz_localize(tz)
+    lo = timestamps.searchsorted(start, side="left")
+    hi = timestamps.searchsorted(end, side=end_side)
+    result = frame.iloc[lo:hi].reset_index(drop=True)
+    result.attrs = {}
+    return result
+
+
+def _answer(frame: pd.DataFrame, provider: Any) -> pd.DataFrame:
+    """Returns the part of a cached series that answers the provider's request
+
+    Resampled series are cached per window and returned whole, since their
+    bins are anchored to the requested start and may be labelled past the end.
+    """
+    if provider._is_resampled():
+        result = frame.copy(deep=False)
+        result.attrs = {}
+        return result
+    return _slice_range(frame, provider.start_date, provider.end_date)
+
+
+def _is_stale(entry: pd.DataFrame, now: float, cache_key: str) -> bool:
+    """Whether the last bar of a cached series may have changed since it was fetched
+
+    A series fetched before the close of its last day may end with a partial
+    bar, so once that day is over it is refetched. For a series reaching today
+    the namespace's ``ttl_policy`` decides, defaulting to
+    ``HIST_REFRESH_POLICY``.
+    """
+    cached_end = pd.Timestamp(entry.attrs[_RANGE_END])
+    today = pd.Timestamp.now(tz="Asia/Shanghai").normalize().tz_localize(None)
+    fetched_at = float(entry.attrs.get(_FETCHED_AT, 0.0))
+    if cached_end < today:
+        closes = dt.datetime.combine(cached_end.date(), _SESSIONS[-1][1], _SHANGHAI)
+        return fetched_at < closes.timestamp()
+    policy = _ttl_policies.get(cache_key, HIST_REFRESH_POLICY)
+    return now >= policy.expires_at(fetched_at)
+
+
+def _advance(steps: Generator[Any, Any, Any], sent: Any) -> tuple[bool, Any]:
+    """Resumes a generator, returning (finished, yielded or returned value)
+
+    ``StopIteration`` cannot pass through a future, so the worker threads of
+    ``_off_loop`` report the end of the generator this way instead.
+    """
+    try:
+        return False, steps.send(sent)
+    except StopIteration as done:
+        return True, done.value
+
+
+def range_cache(
+    cache_key: str, key: Callable[[Any], str], incremental: bool = False
+) -> Callable[[F], F]:
+    """Caches a historical provider's series and serves any sub-range of it
+
+    The decorated method reads ``start_date``/``end_date`` from the provider and
+    must return a frame with a ``timestamp`` column. One entry per series key holds
+    the widest span fetched so far; requests inside that span are answered by
+    binary search on the timestamps, and only the missing head/tail is fetched.
+    Series aggregated locally (``_is_resampled()``) are cached per requested
+    window instead: their bins depend on where the window starts, so a slice of
+    a wider series would not match a fresh request.
+
+    A series whose span reaches today is refreshed when ``HIST_REFRESH_POLICY``
+    (or the namespace's ``ttl_policy``) expires it: every
+    ``HIST_REFRESH_INTERVAL`` seconds during the trading sessions, and not again
+    after the close until the next open. A series fetched before the close of
+    its last day is refetched once that day is over. With ``incremental`` the
+    refresh only fetches bars from the day of the last cached bar onwards,
+    overwriting the still-forming bar, instead of downloading the whole span
+    again. Forward adjusted (qfq) series are always refetched in full, as every
+    past bar changes on an ex-dividend date.
+
+    Concurrent requests for the same window share one load. Loads of
+    different windows of the same series run one at a time, each planned
+    against the series merged by the previous one, so overlapping requests
+    never fetch the same bars twice or overwrite each other's entry.
+
+    The method may also be a coroutine function; it then shares the cached
+    series with the blocking method using the same key, and its loads take
+    turns with the blocking ones.
+
+    Args:
+        cache_key: 缓存名称
+        key: 根据 provider 生成序列缓存键，不应包含日期范围
+        incremental: 是否增量刷新最新数据
+    """
+
+    lock = _get_lock(cache_key)
+    stats = _get_stats(cache_key)
+
+    def entry_key(provider: Any) -> str:
+        series_key = key(provider)
+        if provider._is_resampled():
+            # 重采样数据按请求区间分别缓存
+            series_key = f"{series_key}_{provider.start_date}_{provider.end_date}"
+        return series_key
+
+    def decorator(func: F) -> F:
+        def narrowed(provider: Any, start: pd.Timestamp, end: pd.Timestamp) -> Any:
+            sub = copy.copy(provider)
+            sub.start_date = start.strftime("%Y-%m-%d")
+            sub.end_date = end.strftime("%Y-%m-%d")
+            return sub
+
+        def fetch(provider: Any, start: pd.Timestamp, end: pd.Timestamp) -> Any:
+            return stats.timed(lambda: func(narrowed(provider, start, end)))
+
+        async def afetch(provider: Any, start: pd.Timestamp, end: pd.Timestamp) -> Any:
+            return await stats.atimed(func(narrowed(provider, start, end)))
+
+        def plan(
+            provider: Any, store: CacheBackend, series_key: str
+        ) -> Generator[tuple[pd.Timestamp, pd.Timestamp], Any, Any]:
+            """Merges the cached series with fetched spans and stores the result
+
+            Yields each (start, end) span to fetch and receives the fetched
+            frame, so the same logic drives blocking and async fetches.
+            """
+            start = _to_day(provider.start_date)
+            end = _to_day(provider.end_date)
+            now = time.time()
+
+            entry = _lookup(store, lock, series_key)
+            try:
+                cached_start, cached_end = _cached_span(entry)
+                fetched_at = float(entry.attrs.get(_FETCHED_AT, 0.0))
+            except KeyError:
+                entry = None
+
+            if entry is not None and _past_deadline(cache_key, series_key):
+                entry = None
+            elif entry is not None and _is_stale(entry, now, cache_key):
+                if (
+                    incremental
+                    and not entry.empty
+                    and not provider._is_resampled()
+                    and provider.adjust != "qfq"
+                ):
+                    last_day = entry["timestamp"].iloc[-1].tz_localize(None).normalize()
+                    tail = yield last_day, cached_end
+                    if not tail.empty:
+                        attrs = entry.attrs
+                        entry = pd.concat([entry, tail], ignore_index=True)
+                        entry = entry.drop_duplicates("timestamp", keep="last")
+                        entry = entry.reset_index(drop=True)
+                        entry.attrs = attrs
+                    fetched_at = now
+                else:
+                    entry = None
+
+            if entry is None:
+                frame = yield start, end
+                if "timestamp" not in frame.columns:
+                    return frame
+                span = (start, end)
+                fetched_at = now
+            elif cached_start <= start and end <= cached_end:
+                if fetched_at != entry.attrs.get(_FETCHED_AT):
+                    entry.attrs[_FETCHED_AT] = fetched_at
+                    _store(cache_key, store, lock, series_key, entry)
+                return _answer(entry, provider)
+            else:
+                span = (min(start, cached_start), max(end, cached_end))
+                pieces = [entry]
+                if start < cached_start:
+                    head = yield start, cached_start - pd.Timedelta(days=1)
+                    pieces.append(head)
+                if end > cached_end:
+                    tail = yield cached_end + pd.Timedelta(days=1), end
+                    pieces.append(tail)
+                    fetched_at = now
+                pieces = [piece for piece in pieces if not piece.empty]
+                frame = pd.concat(pieces, ignore_index=True) if pieces else entry
+
+            frame = frame.sort_values("timestamp", kind="stable")
+            frame = frame.drop_duplicates("timestamp", keep="last")
+            frame = frame.reset_index(drop=True)
+            frame.attrs = {
+                _RANGE_START: span[0].isoformat(),
+                _RANGE_END: span[1].isoformat(),
+                _FETCHED_AT: fetched_at,
+            }
+            _store(cache_key, store, lock, series_key, frame)
+            return _answer(frame, provider)
+
+        def load(provider: Any, store: CacheBackend, series_key: str) -> Any:
+            with _series_locks.hold((cache_key, series_key)):
+                steps = plan(provider, store, series_key)
+                done, result = _advance(steps, None)
+                while not done:
+                    done, result = _advance(steps, fetch(provider, *result))
+                return result
+
+        async def aload(provider: Any, store: CacheBackend, series_key: str) -> Any:
+            async with _series_locks.ahold((cache_key, series_key)):
+                # 读写缓存和合并在工作线程中进行，只有请求在事件循环上等待
+                steps = plan(provider, store, series_key)
+                done, result = await _off_loop(store, _advance, steps, None)
+                while not done:
+                    frame = await afetch(provider, *result)
+                    done, result = await _off_loop(store, _advance, steps, frame)
+                return result
+
+        def probe(provider: Any, store: CacheBackend, series_key: str) -> Any:
+            """Returns the cached series if it covers the request, else None
+
+            Expired series are only returned in stale-while-revalidate
+            namespaces, together with a flag asking for a background refresh.
+            Counts the call as a hit or miss.
+            """
+            entry = _lookup(store, lock, series_key)
+            try:
+                cached_start, cached_end = _cached_span(entry)
+                covered = (
+                    cached_start <= _to_day(provider.start_date)
+                    and _to_day(provider.end_date) <= cached_end
+                )
+            except KeyError:
+                covered = False
+
+            if covered:
+                expired = _is_stale(entry, time.time(), cache_key) or _past_deadline(
+                    cache_key, series_key
+                )
+                if not expired or cache_key in _stale_grace:
+                    with lock:
+                        stats.hits += 1
+                    return entry, expired
+
+            with lock:
+                stats.misses += 1
+            return None, False
+
+        @functools.wraps(func)
+        def wrapper(provider: Any) -> Any:
+            if not _enabled:
+                return func(provider)
+
+            store = _get_store(cache_key)
+            series_key = entry_key(provider)
+            flight_key = (series_key, provider.start_date, provider.end_date)
+            entry, expired = probe(provider, store, series_key)
+            if entry is not None:
+                if expired:
+                    _revalidate(
+                        cache_key,
+                        flight_key,
+                        lambda: load(provider, store, series_key),
                     )
-                if key is not None:
-                    return cached(CACHE_CONFIG[cache_key], key=key)(func)(
-                        *args, **kwargs
+                return _answer(entry, provider)
+
+            return _single_flight.do(
+                cache_key, flight_key, lambda: load(provider, store, series_key)
+            )
+
+        @functools.wraps(func)
+        async def awrapper(provider: Any) -> Any:
+            if not _enabled:
+                return await func(provider)
+
+            store = _get_store(cache_key)
+            series_key = entry_key(provider)
+            flight_key = (series_key, provider.start_date, provider.end_date)
+            entry, expired = await _off_loop(store, probe, provider, store, series_key)
+            if entry is not None:
+                if expired:
+                    _arevalidate(
+                        cache_key,
+                        flight_key,
+                        lambda: aload(provider, store, series_key),
                     )
-                else:
-                    return cached(CACHE_CONFIG[cache_key])(func)(*args, **kwargs)
-            return func(*args, **kwargs)
+                return _answer(entry, provider)
+
+            return await _async_single_flight.do(
+                cache_key, flight_key, lambda: aload(provider, store, series_key)
+            )
 
+        if inspect.iscoroutinefunction(func):
+            return awrapper  # type: ignore
         return wrapper  # type: ignore
 
     return decorator
+
+
+if os.getenv("AKSHARE_ONE_CACHE_DIR"):
+    enable_disk_cache(os.environ["AKSHARE_ONE_CACHE_DIR"])
+if _env_flag("AKSHARE_ONE_SHARED_CACHE", "false"):
+    enable_shared_memory_cache()
+if os.getenv("AKSHARE_ONE_CACHE_COMPRESS_AFTER"):
+    enable_compressed_cache(idle=float(os.environ["AKSHARE_ONE_CACHE_COMPRESS_AFTER"]))
+if os.getenv("AKSHARE_ONE_REDIS_URL"):
+    enable_redis_cache(os.environ["AKSHARE_ONE_REDIS_URL"])
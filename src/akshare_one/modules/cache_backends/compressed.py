@@ -0,0 +1,212 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, MutableMapping
+from typing import Any
+
+import pandas as pd
+
+from ..cache import SerializationError, ValueTooLargeError, frame_size
+from .ipc import frame_from_ipc, frame_to_ipc
+
+
+class _Entry:
+    __slots__ = ("value", "data", "size", "expires", "accessed")
+
+    def __init__(self, value: Any, size: int, expires: float, accessed: float):
+        self.value = value
+        # 压缩后的 Arrow IPC 数据，冷数据的 value 为 None
+        self.data: bytes | None = None
+        self.size = size
+        self.expires = expires
+        self.accessed = accessed
+
+
+class CompressedCache(MutableMapping[Any, Any]):
+    """
+    An in-memory TTL cache that compresses DataFrames nobody has read recently.
+
+    Entries start hot, as live DataFrames. Once an entry has not been accessed
+    for ``idle`` seconds it is replaced in place by a compressed Arrow IPC
+    buffer, which for OHLCV data is several times smaller, and it is
+    decompressed on the next access. Expiry times and the least recently used
+    order are kept when entries change tier. ``maxsize`` is measured with
+    ``getsizeof`` for hot entries and the buffer length for cold ones, so with
+    ``frame_size`` the byte budget counts the compressed size. When full, the
+    least recently used entries are dropped.
+
+    Every read and write compresses at most ``batch`` idle entries, the ones
+    idle the longest, so no single call pays for compressing the whole cache;
+    ``compact()`` compresses all of them at once. Frames Arrow cannot serialize
+    stay uncompressed.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        idle: float = 300,
+        timer: Callable[[], float] = time.time,
+        getsizeof: Callable[[Any], int] | None = None,
+        ttu: Callable[[Any, Any, float], float] | None = None,
+        compression: str = "zstd",
+        batch: int = 4,
+    ) -> None:
+        """
+        Args:
+            idle: 多久未访问后压缩（秒）
+            compression: IPC 压缩算法 ('zstd', 'lz4')
+            batch: 每次读写最多压缩的闲置条目数
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.idle = idle
+        self.timer = timer
+        self._getsizeof = getsizeof
+        self.ttu = ttu
+        self.compression = compression
+        self.batch = batch
+        self.evictions = 0
+        self.expirations = 0
+        # 键 -> 条目，按访问时间从旧到新排列
+        self._entries: OrderedDict[Any, _Entry] = OrderedDict()
+        # 未压缩的 DataFrame 条目，同样按访问时间排列，最前面的闲置最久
+        self._hot: OrderedDict[Any, None] = OrderedDict()
+        self._currsize = 0
+
+    def getsizeof(self, value: Any) -> int:
+        return 1 if self._getsizeof is None else self._getsizeof(value)
+
+    @property
+    def currsize(self) -> int:
+        return self._currsize
+
+    def _pop(self, key: Any) -> _Entry:
+        entry = self._entries.pop(key)
+        self._hot.pop(key, None)
+        self._currsize -= entry.size
+        return entry
+
+    def _touch(self, key: Any, entry: _Entry, now: float) -> None:
+        entry.accessed = now
+        self._entries.move_to_end(key)
+        if isinstance(entry.value, pd.DataFrame):
+            self._hot[key] = None
+            self._hot.move_to_end(key)
+
+    def _make_room(self, size: int, keep: Any) -> None:
+        """Drops the least recently used entries until ``size`` more fits"""
+        now = self.timer()
+        while self._currsize + size > self.maxsize:
+            key = next((key for key in self._entries if key != keep), None)
+            if key is None:
+                return
+            if self._pop(key).expires > now:
+                self.evictions += 1
+            else:
+                self.expirations += 1
+
+    def __getitem__(self, key: Any) -> Any:
+        now = self.timer()
+        entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError(key)
+        if entry.expires <= now:
+            self._pop(key)
+            self.expirations += 1
+            raise KeyError(key)
+        if entry.data is not None:
+            value = frame_from_ipc(entry.data)
+            size = self.getsizeof(value)
+            self._make_room(size - entry.size, keep=key)
+            self._currsize += size - entry.size
+            entry.value, entry.data, entry.size = value, None, size
+        self._touch(key, entry, now)
+        self._compact(now, self.batch)
+        return entry.value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        size = self.getsizeof(value)
+        if size > self.maxsize:
+            raise ValueTooLargeError("value too large")
+        now = self.timer()
+        expires = now + self.ttl if self.ttu is None else self.ttu(key, value, now)
+        if key in self._entries:
+            self._pop(key)
+        self._make_room(size, keep=key)
+        entry = self._entries[key] = _Entry(value, size, expires, now)
+        self._currsize += size
+        self._touch(key, entry, now)
+        self._compact(now, self.batch)
+
+    def __delitem__(self, key: Any) -> None:
+        self._pop(key)
+
+    def __iter__(self) -> Iterator[Any]:
+        now = self.timer()
+        keys = [key for key, entry in self._entries.items() if entry.expires > now]
+        return iter(keys)
+
+    def __len__(self) -> int:
+        now = self.timer()
+        return sum(entry.expires > now for entry in self._entries.values())
+
+    def __contains__(self, key: object) -> bool:
+        return self.expires_at(key) is not None
+
+    def expires_at(self, key: Any) -> float | None:
+        """Returns the expiry time of an unexpired entry"""
+        entry = self._entries.get(key)
+        if entry is None or entry.expires <= self.timer():
+            return None
+        return entry.expires
+
+    def expire(self) -> list[Any]:
+        """Removes expired entries and returns their keys"""
+        now = self.timer()
+        expired = [key for key, entry in self._entries.items() if entry.expires <= now]
+        for key in expired:
+            self._pop(key)
+        self.expirations += len(expired)
+        return expired
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._hot.clear()
+        self._currsize = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the entries, counting cold ones at their compressed size"""
+        return sum(
+            frame_size(entry.value) if entry.data is None else len(entry.data)
+            for entry in self._entries.values()
+        )
+
+    def _compact(self, now: float, limit: int | None) -> int:
+        # 只从闲置最久的一端压缩，不改变条目的访问顺序
+        compressed = 0
+        while self._hot and (limit is None or compressed < limit):
+            key = next(iter(self._hot))
+            entry = self._entries[key]
+            if now - entry.accessed < self.idle:
+                break
+            del self._hot[key]
+            if entry.expires <= now:
+                self._pop(key)
+                self.expirations += 1
+                continue
+            try:
+                entry.data = frame_to_ipc(entry.value, compression=self.compression)
+            except SerializationError:
+                # Arrow 无法序列化的 DataFrame（如混合类型的 object 列）保持不压缩
+                continue
+            entry.value = None
+            if self._getsizeof is frame_size:
+                self._currsize += len(entry.data) - entry.size
+                entry.size = len(entry.data)
+            compressed += 1
+        return compressed
+
+    def compact(self) -> int:
+        """Compresses entries idle for ``idle`` seconds and returns their count"""
+        return self._compact(self.timer(), None)
@@ -0,0 +1,292 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator, MutableMapping
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+
+from ..cache import SerializationError, ValueTooLargeError
+
+_METADATA_KEY = b"akshare_one"
+
+
+class _Entry(NamedTuple):
+    expires: float
+    # getsizeof 计算的大小
+    size: int
+    # 文件大小（字节）
+    nbytes: int
+
+
+class DiskCache(MutableMapping[Any, pd.DataFrame]):
+    """
+    A TTL cache that persists DataFrames as Parquet files on disk.
+
+    Each entry is stored as ``<directory>/<sha1(key)>.parquet`` with the original
+    key, its expiry time and ``DataFrame.attrs`` kept in the Parquet schema
+    metadata, so entries survive process restarts. It implements the same mapping
+    interface as ``cachetools.TTLCache`` and can be used as a drop-in value in
+    ``CACHE_CONFIG``. Like cachetools, ``maxsize`` is measured with ``getsizeof``,
+    which counts entries by default, and ``ttu(key, value, now)`` replaces the
+    fixed ``ttl`` when given, as in ``TLRUCache``.
+
+    The expiry and size of every entry are indexed in memory, oldest first,
+    when the cache is opened, so writes, ``len()`` and ``currsize`` do not scan
+    the directory. Entries written by other processes sharing the directory
+    are added to the index when they are first looked up.
+    """
+
+    # 索引由 _lock 保护，缓存装饰器在命名空间锁之外读写磁盘
+    thread_safe = True
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.time,
+        getsizeof: Callable[[Any], int] | None = None,
+        ttu: Callable[[Any, Any, float], float] | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self._getsizeof = getsizeof
+        self.ttu = ttu
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+        # 键 -> 条目，按写入时间从旧到新排列
+        self._index: dict[str, _Entry] = {}
+        self._currsize = 0
+        self._load_index()
+
+    def getsizeof(self, value: Any) -> int:
+        return 1 if self._getsizeof is None else self._getsizeof(value)
+
+    @staticmethod
+    def _key_str(key: Any) -> str:
+        return key if isinstance(key, str) else repr(key)
+
+    def _path(self, key: Any) -> Path:
+        digest = hashlib.sha1(self._key_str(key).encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.parquet"
+
+    def _read_metadata(self, path: Path) -> dict[str, Any] | None:
+        """Reads the entry metadata, or returns None if the file is unusable"""
+        try:
+            metadata = pq.read_schema(path).metadata or {}
+            return json.loads(metadata[_METADATA_KEY])  # type: ignore
+        except FileNotFoundError:
+            return None
+        except (KeyError, ValueError, pa.ArrowException):
+            path.unlink(missing_ok=True)
+            return None
+
+    def _load_index(self) -> None:
+        """Indexes the entries already on disk, oldest first"""
+        found = []
+        for path in self.directory.glob("*.parquet"):
+            meta = self._read_metadata(path)
+            if meta is None:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entry = _Entry(
+                float(meta["expires"]), int(meta.get("size", 1)), stat.st_size
+            )
+            found.append((stat.st_mtime, meta["key"], entry))
+        for _, key, entry in sorted(found, key=lambda item: item[0]):
+            self._add(key, entry)
+
+    def _add(self, key: str, entry: _Entry) -> None:
+        """Indexes an entry as the newest; callers must hold the lock"""
+        self._discard(key)
+        self._index[key] = entry
+        self._currsize += entry.size
+
+    def _discard(self, key: str) -> _Entry | None:
+        """Drops an entry from the index; callers must hold the lock"""
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._currsize -= entry.size
+        return entry
+
+    def _live_entry(self, key: Any) -> _Entry | None:
+        """Returns the index entry of an unexpired key, dropping expired ones
+
+        Keys missing from the index are looked up on disk, in case another
+        process wrote them.
+        """
+        key_str = self._key_str(key)
+        with self._lock:
+            entry = self._index.get(key_str)
+        if entry is None:
+            path = self._path(key_str)
+            meta = self._read_metadata(path)
+            if meta is None or meta["key"] != key_str:
+                return None
+            try:
+                nbytes = path.stat().st_size
+            except FileNotFoundError:
+                return None
+            entry = _Entry(float(meta["expires"]), int(meta.get("size", 1)), nbytes)
+            with self._lock:
+                self._add(key_str, entry)
+        if entry.expires > self.timer():
+            return entry
+        with self._lock:
+            # 其他线程可能已经写入了新值
+            expired = self._index.get(key_str) is entry
+            if expired:
+                self._discard(key_str)
+                self.expirations += 1
+        if expired:
+            self._path(key_str).unlink(missing_ok=True)
+        return None
+
+    def __getitem__(self, key: Any) -> pd.DataFrame:
+        if self._live_entry(key) is None:
+            raise KeyError(key)
+
+        try:
+            table = pq.read_table(self._path(key))
+        except (FileNotFoundError, pa.ArrowException):
+            with self._lock:
+                self._discard(self._key_str(key))
+            raise KeyError(key) from None
+        metadata = table.schema.metadata or {}
+        meta = json.loads(metadata.get(_METADATA_KEY, b"{}"))
+        if meta.get("key") != self._key_str(key):
+            raise KeyError(key)
+        df: pd.DataFrame = table.to_pandas()
+        df.attrs.update(meta.get("attrs", {}))
+        return df
+
+    def __setitem__(self, key: Any, value: pd.DataFrame) -> None:
+        if not isinstance(value, pd.DataFrame):
+            raise TypeError(
+                f"DiskCache can only store DataFrames, got {type(value).__name__}"
+            )
+
+        size = self.getsizeof(value)
+        if size > self.maxsize:
+            raise ValueTooLargeError("value too large")
+
+        now = self.timer()
+        key_str = self._key_str(key)
+        expires = now + self.ttl if self.ttu is None else self.ttu(key, value, now)
+        meta = {
+            "key": key_str,
+            "expires": expires,
+            "size": size,
+            "attrs": value.attrs,
+        }
+        try:
+            table = pa.Table.from_pandas(value)
+            metadata = json.dumps(meta)
+        except (pa.ArrowException, TypeError) as e:
+            raise SerializationError(str(e)) from e
+        table = table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), _METADATA_KEY: metadata}
+        )
+
+        # Write to a temporary file first so concurrent readers never observe
+        # a partially written entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path)
+            nbytes = os.path.getsize(tmp_path)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            self._add(key_str, _Entry(float(expires), size, nbytes))
+            over = self._currsize > self.maxsize
+        if over:
+            self._evict()
+
+    def __delitem__(self, key: Any) -> None:
+        path = self._path(key)
+        with self._lock:
+            entry = self._discard(self._key_str(key))
+        if entry is None and not path.exists():
+            raise KeyError(key)
+        path.unlink(missing_ok=True)
+
+    def __iter__(self) -> Iterator[str]:
+        now = self.timer()
+        with self._lock:
+            keys = [key for key, entry in self._index.items() if entry.expires > now]
+        return iter(keys)
+
+    def __len__(self) -> int:
+        now = self.timer()
+        with self._lock:
+            return sum(entry.expires > now for entry in self._index.values())
+
+    def __contains__(self, key: object) -> bool:
+        return self._live_entry(key) is not None
+
+    def expires_at(self, key: Any) -> float | None:
+        """Returns the expiry time of an unexpired entry"""
+        entry = self._live_entry(key)
+        return None if entry is None else entry.expires
+
+    @property
+    def currsize(self) -> int:
+        return self._currsize
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the cache files on disk"""
+        with self._lock:
+            return sum(entry.nbytes for entry in self._index.values())
+
+    def expire(self) -> list[str]:
+        """Removes expired entries from disk and returns their keys"""
+        now = self.timer()
+        with self._lock:
+            expired = [
+                key for key, entry in self._index.items() if entry.expires <= now
+            ]
+            for key in expired:
+                self._discard(key)
+            self.expirations += len(expired)
+        for key in expired:
+            self._path(key).unlink(missing_ok=True)
+        return expired
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index.clear()
+            self._currsize = 0
+        for path in self.directory.glob("*.parquet"):
+            path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Removes expired entries, then the oldest ones until within maxsize"""
+        self.expire()
+        evicted = []
+        with self._lock:
+            while self._currsize > self.maxsize and self._index:
+                key = next(iter(self._index))
+                self._discard(key)
+                evicted.append(key)
+            self.evictions += len(evicted)
+        for key in evicted:
+            self._path(key).unlink(missing_ok=True)
@@ -0,0 +1,73 @@
+import json
+import os
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+
+from ..cache import SerializationError
+
+_ATTRS_KEY = b"akshare_one_attrs"
+
+_BUNDLE_SCHEMA = pa.schema(
+    [
+        ("namespace", pa.string()),
+        ("key", pa.string()),
+        ("expires", pa.float64()),
+        ("data", pa.binary()),
+    ]
+)
+
+
+def frame_to_ipc(df: pd.DataFrame, compression: str | None = None) -> bytes:
+    """Serializes a DataFrame and its attrs to an Arrow IPC stream
+
+    Raises ``SerializationError`` for frames Arrow cannot represent, such as
+    object columns of mixed types, and attrs that are not JSON serializable.
+
+    Args:
+        df: 需要序列化的 DataFrame
+        compression: IPC 压缩算法 ('zstd', 'lz4')，默认不压缩
+    """
+    try:
+        table = pa.Table.from_pandas(df)
+        attrs = json.dumps(df.attrs)
+    except (pa.ArrowException, TypeError) as e:
+        raise SerializationError(str(e)) from e
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), _ATTRS_KEY: attrs}
+    )
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()  # type: ignore
+
+
+def frame_from_ipc(data: bytes | memoryview) -> pd.DataFrame:
+    """Restores a DataFrame written by ``frame_to_ipc``
+
+    Numeric columns without nulls reference ``data`` instead of copying it.
+    """
+    table = pa.ipc.open_stream(pa.py_buffer(data)).read_all()
+    df: pd.DataFrame = table.to_pandas(split_blocks=True)
+    metadata = table.schema.metadata or {}
+    if _ATTRS_KEY in metadata:
+        df.attrs.update(json.loads(metadata[_ATTRS_KEY]))
+    return df
+
+
+def write_bundle(path: str | os.PathLike[str], rows: list[dict[str, Any]]) -> None:
+    """Writes cache entries to a zstd-compressed Parquet snapshot
+
+    Each row holds ``namespace``, ``key``, ``expires`` (Unix time) and ``data``
+    (the frame as Arrow IPC bytes).
+    """
+    table = pa.Table.from_pylist(rows, schema=_BUNDLE_SCHEMA)
+    pq.write_table(table, path, compression="zstd")
+
+
+def read_bundle(path: str | os.PathLike[str]) -> list[dict[str, Any]]:
+    """Reads the rows of a snapshot written by ``write_bundle``"""
+    return pq.read_table(path, schema=_BUNDLE_SCHEMA).to_pylist()  # type: ignore
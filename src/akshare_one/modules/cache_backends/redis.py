@@ -0,0 +1,134 @@
+import time
+from collections.abc import Callable, Iterator, MutableMapping
+from typing import Any
+
+import pandas as pd
+
+from ..cache import ValueTooLargeError
+from .ipc import frame_from_ipc, frame_to_ipc
+
+
+class RedisCache(MutableMapping[Any, pd.DataFrame]):
+    """
+    A TTL cache that keeps DataFrames in Redis, shared by every process using it.
+
+    Each entry is a Redis hash ``<prefix><key>`` holding the frame as an Arrow
+    IPC stream and its ``getsizeof`` size, and expires through Redis' own key
+    expiry, so all pods pointing at the same server share fetched data. It
+    implements the same mapping interface as ``cachetools.TTLCache``; ``ttu``
+    replaces the fixed ``ttl`` when given, as in ``TLRUCache``.
+
+    ``maxsize`` only rejects single values that are too large. Evicting entries
+    when the server runs out of memory is left to Redis (``maxmemory-policy``),
+    as several clients write to the same keys.
+    """
+
+    # redis 客户端是线程安全的，缓存装饰器在命名空间锁之外访问 Redis
+    thread_safe = True
+
+    def __init__(
+        self,
+        client: Any,
+        prefix: str,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.time,
+        getsizeof: Callable[[Any], int] | None = None,
+        ttu: Callable[[Any, Any, float], float] | None = None,
+        compression: str | None = None,
+    ) -> None:
+        """
+        Args:
+            client: redis.Redis 客户端
+            prefix: 键名前缀，例如 "akshare_one:hist_data_cache:"
+            compression: IPC 压缩算法 ('zstd', 'lz4')，默认不压缩
+        """
+        self.client = client
+        self.prefix = prefix
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self._getsizeof = getsizeof
+        self.ttu = ttu
+        self.compression = compression
+
+    def getsizeof(self, value: Any) -> int:
+        return 1 if self._getsizeof is None else self._getsizeof(value)
+
+    def _name(self, key: Any) -> str:
+        return self.prefix + (key if isinstance(key, str) else repr(key))
+
+    def _names(self) -> Iterator[str]:
+        for name in self.client.scan_iter(match=f"{self.prefix}*"):
+            yield name.decode("utf-8") if isinstance(name, bytes) else name
+
+    def __getitem__(self, key: Any) -> pd.DataFrame:
+        data = self.client.hget(self._name(key), "data")
+        if data is None:
+            raise KeyError(key)
+        return frame_from_ipc(data)
+
+    def __setitem__(self, key: Any, value: pd.DataFrame) -> None:
+        if not isinstance(value, pd.DataFrame):
+            raise TypeError(
+                f"RedisCache can only store DataFrames, got {type(value).__name__}"
+            )
+        size = self.getsizeof(value)
+        if size > self.maxsize:
+            raise ValueTooLargeError("value too large")
+
+        now = self.timer()
+        expires = now + self.ttl if self.ttu is None else self.ttu(key, value, now)
+        ttl_ms = int((expires - now) * 1000)
+        name = self._name(key)
+        if ttl_ms <= 0:
+            self.client.delete(name)
+            return
+
+        data = frame_to_ipc(value, compression=self.compression)
+        pipe = self.client.pipeline()
+        pipe.delete(name)
+        pipe.hset(name, mapping={"data": data, "size": size})
+        pipe.pexpire(name, ttl_ms)
+        pipe.execute()
+
+    def __delitem__(self, key: Any) -> None:
+        if not self.client.delete(self._name(key)):
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self._names():
+            yield name[len(self.prefix) :]
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._names())
+
+    def __contains__(self, key: object) -> bool:
+        return bool(self.client.exists(self._name(key)))
+
+    def expires_at(self, key: Any) -> float | None:
+        """Returns the expiry time of an unexpired entry"""
+        ttl_ms = self.client.pttl(self._name(key))
+        if ttl_ms is None or ttl_ms < 0:
+            return None
+        return self.timer() + int(ttl_ms) / 1000
+
+    def _sum_fields(self, fetch: Callable[[Any, str], Any]) -> int:
+        pipe = self.client.pipeline()
+        for name in self._names():
+            fetch(pipe, name)
+        return sum(int(value) for value in pipe.execute() if value is not None)
+
+    @property
+    def currsize(self) -> int:
+        return self._sum_fields(lambda pipe, name: pipe.hget(name, "size"))
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the serialized frames in Redis"""
+        return self._sum_fields(lambda pipe, name: pipe.hstrlen(name, "data"))
+
+    def clear(self) -> None:
+        names = list(self._names())
+        if names:
+            self.client.delete(*names)
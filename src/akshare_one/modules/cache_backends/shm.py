@@ -0,0 +1,315 @@
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import Callable, Iterator, MutableMapping
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any
+
+import pandas as pd
+
+from ..cache import ValueTooLargeError
+from .ipc import frame_from_ipc, frame_to_ipc
+
+# 索引段头部：版本号和 JSON 长度
+_HEADER = struct.Struct("<QQ")
+
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> Any:
+    """Opens a shared memory segment that outlives the process creating it"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(
+            name=name, create=create, size=size, track=False
+        )
+    shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+    # Before 3.13 the resource tracker unlinks every segment a process touched
+    # when it exits, which would wipe entries still used by other workers
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore
+    return shm
+
+
+def _unlink(shm: Any) -> None:
+    if sys.version_info < (3, 13):
+        # unlink() unregisters the segment again, so keep the tracker in sync
+        resource_tracker.register(shm._name, "shared_memory")
+    with contextlib.suppress(FileNotFoundError):
+        shm.unlink()
+
+
+def _map_segment(name: str, nbytes: int) -> memoryview:
+    """Maps a segment read-only for as long as the returned view is referenced
+
+    The mapping is detached from the ``SharedMemory`` handle, so frames built on
+    it keep it alive and it is unmapped once they are garbage collected.
+    """
+    shm = _open_segment(name)
+    view = memoryview(shm._mmap)[:nbytes].toreadonly()
+    shm._buf.release()
+    shm._buf = shm._mmap = None
+    shm.close()
+    return view
+
+
+def _remove_segment(name: str) -> None:
+    with contextlib.suppress(FileNotFoundError):
+        shm = _open_segment(name)
+        shm.close()
+        _unlink(shm)
+
+
+class SharedMemoryCache(MutableMapping[Any, pd.DataFrame]):
+    """
+    A TTL cache that keeps DataFrames in shared memory for all processes on a host.
+
+    Each entry is one ``multiprocessing.shared_memory`` segment holding the frame
+    as an Arrow IPC stream. A small JSON index in a separate segment maps keys to
+    segments and expiry times; it is guarded by a file lock and versioned, so
+    readers only re-parse it after another process changed it. Frames are mapped
+    from the segment without copying numeric columns. Caches created with the
+    same ``name`` in different processes share their entries.
+
+    Like ``DiskCache`` it implements the ``cachetools.TTLCache`` mapping
+    interface, measures ``maxsize`` with ``getsizeof`` and evicts the oldest
+    entries first. POSIX only, as the index lock uses ``fcntl``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.time,
+        getsizeof: Callable[[Any], int] | None = None,
+        ttu: Callable[[Any, Any, float], float] | None = None,
+        index_size: int = 4 * 1024 * 1024,
+    ) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self._getsizeof = getsizeof
+        self.ttu = ttu
+        self.evictions = 0
+        self.expirations = 0
+
+        digest = hashlib.sha1(name.encode("utf-8")).hexdigest()[:16]
+        self._prefix = f"ak1_{digest}"
+        self._lock_path = os.path.join(tempfile.gettempdir(), f"{self._prefix}.lock")
+        with self._locked():
+            try:
+                self._index_shm = _open_segment(f"{self._prefix}_idx")
+            except FileNotFoundError:
+                self._index_shm = _open_segment(
+                    f"{self._prefix}_idx", create=True, size=index_size
+                )
+                self._index_shm.buf[: _HEADER.size] = _HEADER.pack(1, 2)
+                self._index_shm.buf[_HEADER.size : _HEADER.size + 2] = b"{}"
+
+        self._version = 0
+        self._index: dict[str, dict[str, Any]] = {}
+        # 本进程已映射的段对应的 DataFrame
+        self._frames: dict[str, pd.DataFrame] = {}
+
+    def getsizeof(self, value: Any) -> int:
+        return 1 if self._getsizeof is None else self._getsizeof(value)
+
+    @staticmethod
+    def _key_str(key: Any) -> str:
+        return key if isinstance(key, str) else repr(key)
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_index(self) -> dict[str, dict[str, Any]]:
+        """Returns the shared index, re-parsing it only if it changed"""
+        version, length = _HEADER.unpack_from(self._index_shm.buf)
+        if version != self._version:
+            with self._locked():
+                version, length = _HEADER.unpack_from(self._index_shm.buf)
+                raw = bytes(self._index_shm.buf[_HEADER.size : _HEADER.size + length])
+            self._index = json.loads(raw)
+            self._version = version
+            self._forget_stale_segments()
+        return self._index
+
+    def _write_index(self, index: dict[str, dict[str, Any]]) -> None:
+        """Publishes a new index; must be called while holding the lock"""
+        raw = json.dumps(index).encode("utf-8")
+        if _HEADER.size + len(raw) > self._index_shm.size:
+            raise ValueTooLargeError("shared cache index is full")
+        version, _ = _HEADER.unpack_from(self._index_shm.buf)
+        self._index_shm.buf[_HEADER.size : _HEADER.size + len(raw)] = raw
+        _HEADER.pack_into(self._index_shm.buf, 0, version + 1, len(raw))
+        self._index = index
+        self._version = version + 1
+        self._forget_stale_segments()
+
+    def _locked_index(self) -> dict[str, dict[str, Any]]:
+        """Reads the current index; must be called while holding the lock"""
+        version, length = _HEADER.unpack_from(self._index_shm.buf)
+        if version != self._version:
+            raw = bytes(self._index_shm.buf[_HEADER.size : _HEADER.size + length])
+            self._index = json.loads(raw)
+            self._version = version
+        return dict(self._index)
+
+    def _forget_stale_segments(self) -> None:
+        """Drops frames of segments that are no longer indexed"""
+        live = {entry["segment"] for entry in self._index.values()}
+        for segment in [s for s in self._frames if s not in live]:
+            del self._frames[segment]
+
+    def _live_entry(self, key: Any) -> dict[str, Any] | None:
+        entry = self._read_index().get(self._key_str(key))
+        if entry is None or entry["expires"] <= self.timer():
+            return None
+        return entry
+
+    def __getitem__(self, key: Any) -> pd.DataFrame:
+        entry = self._live_entry(key)
+        if entry is None:
+            raise KeyError(key)
+
+        segment = entry["segment"]
+        frame = self._frames.get(segment)
+        if frame is None:
+            try:
+                frame = frame_from_ipc(_map_segment(segment, entry["nbytes"]))
+            except FileNotFoundError:
+                raise KeyError(key) from None
+            self._frames[segment] = frame
+        return frame
+
+    def __setitem__(self, key: Any, value: pd.DataFrame) -> None:
+        if not isinstance(value, pd.DataFrame):
+            raise TypeError(
+                "SharedMemoryCache can only store DataFrames, "
+                f"got {type(value).__name__}"
+            )
+        size = self.getsizeof(value)
+        if size > self.maxsize:
+            raise ValueTooLargeError("value too large")
+
+        data = frame_to_ipc(value)
+        segment = f"{self._prefix}_{uuid.uuid4().hex[:16]}"
+        shm = _open_segment(segment, create=True, size=max(len(data), 1))
+        shm.buf[: len(data)] = data
+        shm.close()
+
+        now = self.timer()
+        expires = now + self.ttl if self.ttu is None else self.ttu(key, value, now)
+        with self._locked():
+            index = self._locked_index()
+            old = index.pop(self._key_str(key), None)
+            index[self._key_str(key)] = {
+                "segment": segment,
+                "nbytes": len(data),
+                "size": size,
+                "expires": expires,
+            }
+            removed = self._evict(index, now)
+            try:
+                self._write_index(index)
+            except ValueTooLargeError:
+                _remove_segment(segment)
+                raise
+        for entry in [old, *removed]:
+            if entry is not None:
+                _remove_segment(entry["segment"])
+
+    def _evict(
+        self, index: dict[str, dict[str, Any]], now: float
+    ) -> list[dict[str, Any]]:
+        """Removes expired, then the oldest entries until within maxsize"""
+        removed = []
+        for key in [k for k, entry in index.items() if entry["expires"] <= now]:
+            removed.append(index.pop(key))
+            self.expirations += 1
+        total = sum(entry["size"] for entry in index.values())
+        for key in list(index):
+            if total <= self.maxsize:
+                break
+            entry = index.pop(key)
+            removed.append(entry)
+            total -= entry["size"]
+            self.evictions += 1
+        return removed
+
+    def __delitem__(self, key: Any) -> None:
+        with self._locked():
+            index = self._locked_index()
+            entry = index.pop(self._key_str(key), None)
+            if entry is None:
+                raise KeyError(key)
+            self._write_index(index)
+        _remove_segment(entry["segment"])
+
+    def __iter__(self) -> Iterator[str]:
+        now = self.timer()
+        for key, entry in list(self._read_index().items()):
+            if entry["expires"] > now:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        return self._live_entry(key) is not None
+
+    def expires_at(self, key: Any) -> float | None:
+        """Returns the expiry time of an unexpired entry"""
+        entry = self._live_entry(key)
+        return None if entry is None else float(entry["expires"])
+
+    @property
+    def currsize(self) -> int:
+        now = self.timer()
+        return sum(
+            entry["size"]
+            for entry in self._read_index().values()
+            if entry["expires"] > now
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the shared memory segments"""
+        return sum(entry["nbytes"] for entry in self._read_index().values())
+
+    def expire(self) -> list[str]:
+        """Removes expired entries and returns their keys"""
+        now = self.timer()
+        with self._locked():
+            index = self._locked_index()
+            expired = [k for k, entry in index.items() if entry["expires"] <= now]
+            removed = [index.pop(k) for k in expired]
+            if removed:
+                self._write_index(index)
+        for entry in removed:
+            _remove_segment(entry["segment"])
+        self.expirations += len(expired)
+        return expired
+
+    def clear(self) -> None:
+        with self._locked():
+            removed = list(self._locked_index().values())
+            self._write_index({})
+        for entry in removed:
+            _remove_segment(entry["segment"])
+
+    def destroy(self) -> None:
+        """Removes all entries and the shared index itself"""
+        self.clear()
+        self._index_shm.close()
+        _unlink(self._index_shm)
@@ -0,0 +1,277 @@
+"""Per-host circuit breakers that fail fast while an upstream is down"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from .ratelimit import acquire
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 默认设置，可用 configure_circuit_breaker 修改
+CIRCUIT_BREAKER_SETTINGS: dict[str, Any] = {
+    # 连续失败多少次后断开
+    "failure_threshold": 5,
+    # 统计窗口（秒）内请求数不少于 min_requests 且错误率达到 error_rate 时断开
+    "error_rate": 0.5,
+    "window": 60.0,
+    "min_requests": 20,
+    # 断开后多久（秒）允许试探请求
+    "cooldown": 30.0,
+    # 半开状态下同时允许的试探请求数，全部成功后恢复
+    "probes": 1,
+}
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling an upstream whose circuit breaker is open"""
+
+    def __init__(self, host: str, retry_after: float) -> None:
+        super().__init__(
+            f"Circuit breaker for {host} is open, retry in {retry_after:.1f}s"
+        )
+        self.host = host
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Tracks the outcome of calls to one upstream host.
+
+    The breaker is closed while calls succeed. It opens after
+    ``failure_threshold`` consecutive failures, or when at least half
+    (``error_rate``) of the last ``window`` seconds' calls failed once there
+    were ``min_requests`` of them. While open, ``allow()`` raises
+    ``CircuitOpenError`` at once. After ``cooldown`` seconds it half-opens and
+    lets ``probes`` calls through: if they all succeed it closes again, if one
+    fails it reopens for another cool-down.
+
+    Every call allowed through must report its outcome with ``record()``.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = 5,
+        error_rate: float = 0.5,
+        window: float = 60.0,
+        min_requests: int = 20,
+        cooldown: float = 30.0,
+        probes: int = 1,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.error_rate = error_rate
+        self.window = window
+        self.min_requests = min_requests
+        self.cooldown = cooldown
+        self.probes = probes
+        self.timer = timer
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = 0
+        self._probed = 0
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self.times_opened = 0
+        self.rejected = 0
+
+    def _update(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.cooldown:
+            self._state = HALF_OPEN
+            self._probing = self._probed = 0
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self.times_opened += 1
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._update(self.timer())
+            return self._state
+
+    def allow(self) -> None:
+        """Raises ``CircuitOpenError`` unless a call may be made now"""
+        with self._lock:
+            now = self.timer()
+            self._update(now)
+            if self._state == HALF_OPEN and self._probing < self.probes:
+                self._probing += 1
+                return
+            if self._state != CLOSED:
+                self.rejected += 1
+                retry_after = max(self._opened_at + self.cooldown - now, 0.0)
+                raise CircuitOpenError(self.host, retry_after)
+
+    def record(self, ok: bool | None) -> None:
+        """Reports the outcome of an allowed call
+
+        Args:
+            ok: 是否成功，None 表示调用被取消，只释放试探名额
+        """
+        with self._lock:
+            now = self.timer()
+            self._update(now)
+            if self._state == HALF_OPEN:
+                self._probing = max(self._probing - 1, 0)
+                if ok is False:
+                    self._open(now)
+                elif ok:
+                    self._probed += 1
+                    if self._probed >= self.probes:
+                        self._state = CLOSED
+                        self._failures = 0
+                return
+            if self._state != CLOSED or ok is None:
+                return
+
+            self._outcomes.append((now, ok))
+            self._failures = 0 if ok else self._failures + 1
+            errors = sum(1 for _, succeeded in self._outcomes if not succeeded)
+            if self._failures >= self.failure_threshold or (
+                len(self._outcomes) >= self.min_requests
+                and errors / len(self._outcomes) >= self.error_rate
+            ):
+                self._open(now)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            now = self.timer()
+            self._update(now)
+            errors = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "requests": len(self._outcomes),
+                "error_rate": errors / len(self._outcomes) if self._outcomes else 0.0,
+                "retry_after": (
+                    max(self._opened_at + self.cooldown - now, 0.0)
+                    if self._state == OPEN
+                    else 0.0
+                ),
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+# 主机 -> 覆盖默认值的设置
+_host_settings: dict[str, dict[str, Any]] = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker(host: str) -> CircuitBreaker:
+    """Returns the process-wide circuit breaker of ``host``"""
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(host)
+            if breaker is None:
+                settings = {**CIRCUIT_BREAKER_SETTINGS, **_host_settings.get(host, {})}
+                breaker = _breakers[host] = CircuitBreaker(host, **settings)
+    return breaker
+
+
+def _network_errors() -> tuple[type[BaseException], ...]:
+    errors: tuple[type[BaseException], ...] = (OSError, asyncio.TimeoutError)
+    try:
+        import aiohttp  # type: ignore
+    except ImportError:
+        return errors
+    return errors + (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+
+
+def _upstream_failed(error: BaseException) -> bool:
+    """Whether an error counts as a failure of the upstream
+
+    Only network errors, timeouts and HTTP 5xx/429 responses do. Errors about
+    the request or the data, such as HTTP 4xx, an unknown symbol
+    (``KeyError``, ``ValueError``, ``NoDataError``) or a response that cannot
+    be parsed, show that the upstream still answers.
+    """
+    # requests 的 HTTPError 带 response.status_code，aiohttp 的带 status
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", getattr(error, "status", None))
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(error, _network_errors())
+
+
+@contextmanager
+def upstream_call(host: str) -> Iterator[None]:
+    """Guards a call to ``host`` with its circuit breaker and rate limit
+
+    Raises ``CircuitOpenError`` without calling when the breaker is open;
+    otherwise waits for the rate limit and records whether the block failed.
+    Only network errors, timeouts and HTTP 5xx/429 responses count as
+    failures; errors about the data, such as an unknown symbol, do not.
+    """
+    breaker = circuit_breaker(host)
+    breaker.allow()
+    ok = None
+    try:
+        acquire(host)
+        yield
+        ok = True
+    except Exception as e:
+        ok = not _upstream_failed(e)
+        raise
+    finally:
+        breaker.record(ok)
+
+
+def configure_circuit_breaker(host: str | None = None, **settings: Any) -> None:
+    """Changes circuit breaker settings and resets the affected breakers
+
+    Args:
+        host: 只修改该主机的设置，默认修改所有主机
+        **settings: failure_threshold, error_rate, window, min_requests,
+            cooldown, probes，含义见 CIRCUIT_BREAKER_SETTINGS
+    """
+    unknown = set(settings) - set(CIRCUIT_BREAKER_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown circuit breaker settings: {sorted(unknown)}")
+    with _breakers_lock:
+        if host is None:
+            CIRCUIT_BREAKER_SETTINGS.update(settings)
+            _breakers.clear()
+        else:
+            _host_settings.setdefault(host, {}).update(settings)
+            _breakers.pop(host, None)
+
+
+def reset_circuit(host: str | None = None) -> None:
+    """Closes the breaker of ``host``, or of every host, and forgets its history"""
+    with _breakers_lock:
+        if host is None:
+            _breakers.clear()
+        else:
+            _breakers.pop(host, None)
+
+
+def circuit_stats() -> dict[str, dict[str, Any]]:
+    """Returns the state of every host's circuit breaker
+
+    Returns:
+        dict: 主机 -> 状态:
+        - state: "closed", "open" 或 "half_open"
+        - consecutive_failures: 连续失败次数
+        - requests / error_rate: 统计窗口内的请求数和错误率
+        - retry_after: 断开状态下距离允许试探的秒数
+        - times_opened: 断开次数
+        - rejected: 被直接拒绝的请求数
+    """
+    return {host: breaker.stats() for host, breaker in list(_breakers.items())}
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 import pandas as pd
@@ -26,3 +27,11 @@ class FinancialDataProvider(ABC):
     def get_financial_metrics(self) -> pd.DataFrame:
         """Fetch financial metrics"""
         pass
+
+    async def aget_financial_metrics(self) -> pd.DataFrame:
+        """Fetches financial metrics without blocking the event loop
+
+        Sources without a native async implementation run
+        ``get_financial_metrics`` in a worker thread.
+        """
+        return await asyncio.to_thread(self.get_financial_metrics)
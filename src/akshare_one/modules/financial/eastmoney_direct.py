@@ -1,9 +1,12 @@
+import asyncio
 import logging
+from typing import Any
 
 import pandas as pd
-import requests
 
-from akshare_one.modules.cache import cache
+from akshare_one.eastmoney.async_client import AsyncEastMoneyClient
+from akshare_one.eastmoney.client import EastMoneyClient
+from akshare_one.modules.cache import cache, mark_partial
 
 from .base import FinancialDataProvider
 
@@ -40,8 +43,17 @@ class EastMoneyDirectFinancialReport(FinancialDataProvider):
         "CCE_ADD": "change_in_cash_and_equivalents",
     }
 
+    # 报表名称 -> (接口报表名, 字段映射)
+    _reports = {
+        "balance sheet": ("RPT_DMSK_FN_BALANCE", _balance_sheet_rename_map),
+        "income statement": ("RPT_DMSK_FN_INCOME", _income_statement_rename_map),
+        "cash flow statement": ("RPT_DMSK_FN_CASHFLOW", _cash_flow_rename_map),
+    }
+
     def __init__(self, symbol: str) -> None:
         super().__init__(symbol)
+        self.client = EastMoneyClient()
+        self.aclient = AsyncEastMoneyClient()
 
     def get_income_statement(self) -> pd.DataFrame:
         return self._fetch_income_statement()
@@ -52,16 +64,62 @@ class EastMoneyDirectFinancialReport(FinancialDataProvider):
     def get_cash_flow(self) -> pd.DataFrame:
         return self._fetch_cash_flow()
 
-    @cache(
-        "financial_cache",
-        key=lambda self: f"eastmoney_financial_metrics_{self.symbol}",
-    )
+    def _cache_key(self) -> str:
+        return f"eastmoney_financial_metrics_{self.symbol}"
+
+    @cache("financial_cache", key=_cache_key)
     def get_financial_metrics(self) -> pd.DataFrame:
         """获取三大财务报表关键指标"""
-        balance_sheet = self._fetch_balance_sheet()
-        income_statement = self._fetch_income_statement()
-        cash_flow = self._fetch_cash_flow()
+        reports: list[pd.DataFrame | Exception] = []
+        for report in self._reports:
+            try:
+                reports.append(self._request_report(report))
+            except Exception as e:
+                reports.append(e)
+        return self._merge_partial(reports)
+
+    @cache("financial_cache", key=_cache_key)
+    async def aget_financial_metrics(self) -> pd.DataFrame:
+        """异步获取三大财务报表关键指标，三张报表并发请求"""
+        reports = await asyncio.gather(
+            *(self._arequest_report(report) for report in self._reports),
+            return_exceptions=True,
+        )
+        return self._merge_partial(reports)
 
+    def _merge_partial(self, reports: list[Any]) -> pd.DataFrame:
+        """Merges the reports that were fetched, marking the result as partial
+
+        Failed reports are logged and left out. When no report with data was
+        fetched the first error is raised, so that an outage is not cached as
+        "no data"; a partial result is only kept for the error TTL.
+        """
+        errors = [result for result in reports if isinstance(result, BaseException)]
+        for error in errors:
+            # 取消等不是请求失败，直接抛出
+            if not isinstance(error, Exception):
+                raise error
+        if not errors:
+            return self._merge_reports(*reports)
+        if all(isinstance(r, Exception) or r.empty for r in reports):
+            raise errors[0]
+        frames = []
+        for report, result in zip(self._reports, reports, strict=True):
+            if isinstance(result, Exception):
+                result = self._failed(report, result)
+            frames.append(result)
+        return mark_partial(self._merge_reports(*frames))
+
+    def _failed(self, report: str, error: BaseException) -> pd.DataFrame:
+        logger.warning("Error fetching %s for %s: %s", report, self.symbol, error)
+        return pd.DataFrame()
+
+    def _merge_reports(
+        self,
+        balance_sheet: pd.DataFrame,
+        income_statement: pd.DataFrame,
+        cash_flow: pd.DataFrame,
+    ) -> pd.DataFrame:
         if balance_sheet.empty and income_statement.empty and cash_flow.empty:
             return pd.DataFrame()
 
@@ -92,118 +150,55 @@ class EastMoneyDirectFinancialReport(FinancialDataProvider):
 
         return merged
 
-    def _fetch_balance_sheet(self) -> pd.DataFrame:
+    def _report_frame(self, report: str, data: dict[str, Any]) -> pd.DataFrame:
+        """Extracts a report table from the API response"""
+        _, rename_map = self._reports[report]
+        if data.get("result") and data["result"].get("data"):
+            df = pd.DataFrame(data["result"]["data"])
+            df.rename(columns=rename_map, inplace=True)
+            return df
+        logger.warning("No %s data found in API response for %s", report, self.symbol)
+        return pd.DataFrame()
+
+    def _request_report(self, report: str) -> pd.DataFrame:
+        report_name, rename_map = self._reports[report]
+        data = self.client.fetch_financial_report(
+            report_name, self.symbol, list(rename_map)
+        )
+        return self._report_frame(report, data)
+
+    async def _arequest_report(self, report: str) -> pd.DataFrame:
+        report_name, rename_map = self._reports[report]
+        data = await self.aclient.fetch_financial_report(
+            report_name, self.symbol, list(rename_map)
+        )
+        return self._report_frame(report, data)
+
+    def _fetch_report(self, report: str) -> pd.DataFrame:
         """
-        Get stock balance sheet data from East Money API
+        Get a financial statement from East Money API
+
+        Request failures are logged and return an empty frame.
         """
         try:
-            # API endpoint and parameters
-            api_url = "https://datacenter-web.eastmoney.com/api/data/v1/get"
-            params = {
-                "reportName": "RPT_DMSK_FN_BALANCE",
-                "filter": f'(SECURITY_CODE="{self.symbol}")',
-                "pageNumber": "1",
-                "pageSize": "1000",
-                "sortColumns": "REPORT_DATE",
-                "sortTypes": "-1",
-                "columns": ",".join(self._balance_sheet_rename_map.keys()),
-            }
-
-            # Fetch data from API
-            response = requests.get(api_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            # Extract the actual data
-            if data.get("result") and data["result"].get("data"):
-                df = pd.DataFrame(data["result"]["data"])
-                df.rename(columns=self._balance_sheet_rename_map, inplace=True)
-                return df
-            else:
-                logger.warning(
-                    "No balance sheet data found in API response for %s", self.symbol
-                )
-                return pd.DataFrame()
-
+            return self._request_report(report)
         except Exception as e:
-            logger.error("Error fetching balance sheet for %s: %s", self.symbol, str(e))
-            return pd.DataFrame()
+            return self._failed(report, e)
+
+    def _fetch_balance_sheet(self) -> pd.DataFrame:
+        """
+        Get stock balance sheet data from East Money API
+        """
+        return self._fetch_report("balance sheet")
 
     def _fetch_income_statement(self) -> pd.DataFrame:
         """
         Get stock income statement data from East Money API
         """
-        try:
-            # API endpoint and parameters
-            api_url = "https://datacenter-web.eastmoney.com/api/data/v1/get"
-            params = {
-                "reportName": "RPT_DMSK_FN_INCOME",
-                "filter": f'(SECURITY_CODE="{self.symbol}")',
-                "pageNumber": "1",
-                "pageSize": "1000",
-                "sortColumns": "REPORT_DATE",
-                "sortTypes": "-1",
-                "columns": ",".join(self._income_statement_rename_map.keys()),
-            }
-
-            # Fetch data from API
-            response = requests.get(api_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            # Extract the actual data
-            if data.get("result") and data["result"].get("data"):
-                df = pd.DataFrame(data["result"]["data"])
-                df.rename(columns=self._income_statement_rename_map, inplace=True)
-                return df
-            else:
-                logger.warning(
-                    "No income statement data found in API response for %s", self.symbol
-                )
-                return pd.DataFrame()
-
-        except Exception as e:
-            logger.error(
-                "Error fetching income statement for %s: %s", self.symbol, str(e)
-            )
-            return pd.DataFrame()
+        return self._fetch_report("income statement")
 
     def _fetch_cash_flow(self) -> pd.DataFrame:
         """
         Get stock cash flow statement data from East Money API
         """
-        try:
-            # API endpoint and parameters
-            api_url = "https://datacenter-web.eastmoney.com/api/data/v1/get"
-            params = {
-                "reportName": "RPT_DMSK_FN_CASHFLOW",
-                "filter": f'(SECURITY_CODE="{self.symbol}")',
-                "pageNumber": "1",
-                "pageSize": "1000",
-                "sortColumns": "REPORT_DATE",
-                "sortTypes": "-1",
-                "columns": ",".join(self._cash_flow_rename_map.keys()),
-            }
-
-            # Fetch data from API
-            response = requests.get(api_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            # Extract the actual data
-            if data.get("result") and data["result"].get("data"):
-                df = pd.DataFrame(data["result"]["data"])
-                df.rename(columns=self._cash_flow_rename_map, inplace=True)
-                return df
-            else:
-                logger.warning(
-                    "No cash flow statement data found in API response for %s",
-                    self.symbol,
-                )
-                return pd.DataFrame()
-
-        except Exception as e:
-            logger.error(
-                "Error fetching cash flow statement for %s: %s", self.symbol, str(e)
-            )
-            return pd.DataFrame()
+        return self._fetch_report("cash flow statement")
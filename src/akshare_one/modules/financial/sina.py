@@ -1,7 +1,9 @@
 import akshare as ak  # type: ignore
 import pandas as pd
 
-from ..cache import cache
+from ..cache import NoDataError, cache
+from ..circuit import upstream_call
+from ..ratelimit import SINA_HOST
 from .base import FinancialDataProvider
 
 
@@ -29,11 +31,12 @@ class SinaFinancialReport(FinancialDataProvider):
             Standardized DataFrame with balance sheet data
         """
         try:
-            raw_df = ak.stock_financial_report_sina(
-                stock=self.stock, symbol="资产负债表"
-            )
+            with upstream_call(SINA_HOST):
+                raw_df = ak.stock_financial_report_sina(
+                    stock=self.stock, symbol="资产负债表"
+                )
             if raw_df is None or raw_df.empty:
-                raise ValueError(f"Invalid stock symbol: {self.symbol}")
+                raise NoDataError(f"Invalid stock symbol: {self.symbol}")
             return self._clean_balance_data(raw_df)
         except Exception as e:
             raise ValueError(
@@ -51,9 +54,12 @@ class SinaFinancialReport(FinancialDataProvider):
             Standardized DataFrame with income statement data
         """
         try:
-            raw_df = ak.stock_financial_report_sina(stock=self.stock, symbol="利润表")
+            with upstream_call(SINA_HOST):
+                raw_df = ak.stock_financial_report_sina(
+                    stock=self.stock, symbol="利润表"
+                )
             if raw_df is None or raw_df.empty:
-                raise ValueError(f"Invalid stock symbol: {self.symbol}")
+                raise NoDataError(f"Invalid stock symbol: {self.symbol}")
             return self._clean_income_data(raw_df)
         except Exception as e:
             raise ValueError(
@@ -71,11 +77,12 @@ class SinaFinancialReport(FinancialDataProvider):
             Standardized DataFrame with cash flow data
         """
         try:
-            raw_df = ak.stock_financial_report_sina(
-                stock=self.stock, symbol="现金流量表"
-            )
+            with upstream_call(SINA_HOST):
+                raw_df = ak.stock_financial_report_sina(
+                    stock=self.stock, symbol="现金流量表"
+                )
             if raw_df is None or raw_df.empty:
-                raise ValueError(f"Invalid stock symbol: {self.symbol}")
+                raise NoDataError(f"Invalid stock symbol: {self.symbol}")
             return self._clean_cash_data(raw_df)
         except Exception as e:
             raise ValueError(
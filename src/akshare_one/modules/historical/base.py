@@ -1,7 +1,46 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 import pandas as pd
 
+# 所有数据源统一的输出列
+HIST_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+
+def normalize_hist_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Coerces a provider's result to the common schema, so sources can be swapped
+
+    Keeps the ``HIST_COLUMNS`` in order, with Asia/Shanghai timestamps,
+    float64 prices and int64 volume (float64 if it has missing values),
+    sorted by timestamp without duplicates.
+
+    Raises:
+        ValueError: 缺少标准列
+    """
+    missing = [name for name in HIST_COLUMNS if name not in df.columns]
+    if missing:
+        raise ValueError(f"Historical data is missing columns: {missing}")
+
+    timestamps = pd.to_datetime(df["timestamp"])
+    if timestamps.dt.tz is None:
+        timestamps = timestamps.dt.tz_localize("Asia/Shanghai")
+    else:
+        timestamps = timestamps.dt.tz_convert("Asia/Shanghai")
+    volume = pd.to_numeric(df["volume"])
+    result = pd.DataFrame(
+        {
+            "timestamp": timestamps,
+            **{
+                name: pd.to_numeric(df[name]).astype("float64")
+                for name in ("open", "high", "low", "close")
+            },
+            "volume": volume.astype("int64") if volume.notna().all() else volume,
+        }
+    )
+    result = result.sort_values("timestamp", kind="stable")
+    result = result.drop_duplicates("timestamp", keep="last")
+    return result.reset_index(drop=True)
+
 
 class HistoricalDataProvider(ABC):
     def __init__(
@@ -28,6 +67,10 @@ class HistoricalDataProvider(ABC):
         except ValueError:
             raise ValueError("Invalid date format. Please use YYYY-MM-DD.") from None
 
+    def _is_resampled(self) -> bool:
+        """Whether bars are aggregated locally from a finer upstream series"""
+        return self.interval_multiplier > 1 or self.interval.lower() == "year"
+
     @classmethod
     def get_supported_intervals(cls) -> list[str]:
         return ["minute", "hour", "day", "week", "month", "year"]
@@ -46,3 +89,11 @@ class HistoricalDataProvider(ABC):
             - volume
         """
         pass
+
+    async def aget_hist_data(self) -> pd.DataFrame:
+        """Fetches historical market data without blocking the event loop
+
+        Sources without a native async implementation run ``get_hist_data`` in a
+        worker thread.
+        """
+        return await asyncio.to_thread(self.get_hist_data)
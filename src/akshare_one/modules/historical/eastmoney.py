@@ -1,14 +1,16 @@
 import akshare as ak  # type: ignore
 import pandas as pd
 
-from ..cache import cache
+from ..cache import range_cache
+from ..circuit import upstream_call
+from ..ratelimit import SINA_HOST
 from .base import HistoricalDataProvider
 
 
 class EastMoneyHistorical(HistoricalDataProvider):
     """Adapter for EastMoney historical stock data API"""
 
-    @cache(
+    @range_cache(
         "hist_data_cache",
         key=lambda self: (
             f"eastmoney_hist_{self.symbol}_{self.interval}_{self.interval_multiplier}_{self.adjust}"
@@ -47,13 +49,14 @@ class EastMoneyHistorical(HistoricalDataProvider):
 
         # Get raw data
         period = "1" if self.interval == "minute" else "60"
-        raw_df = ak.stock_zh_a_hist_min_em(
-            symbol=self.symbol,
-            period=period,
-            start_date=start_date,
-            end_date=end_date,
-            adjust=self._map_adjust_param(self.adjust),
-        )
+        with upstream_call("push2his.eastmoney.com"):
+            raw_df = ak.stock_zh_a_hist_min_em(
+                symbol=self.symbol,
+                period=period,
+                start_date=start_date,
+                end_date=end_date,
+                adjust=self._map_adjust_param(self.adjust),
+            )
 
         # Process data
         resampled = self._resample_intraday_data(
@@ -81,13 +84,14 @@ class EastMoneyHistorical(HistoricalDataProvider):
         if self._is_etf_code(self.symbol):
             raw_df = self._get_etf_data(start_date, end_date)
         else:
-            raw_df = ak.stock_zh_a_hist(
-                symbol=self.symbol,
-                period=period,
-                start_date=start_date,
-                end_date=end_date,
-                adjust=self._map_adjust_param(self.adjust),
-            )
+            with upstream_call("push2his.eastmoney.com"):
+                raw_df = ak.stock_zh_a_hist(
+                    symbol=self.symbol,
+                    period=period,
+                    start_date=start_date,
+                    end_date=end_date,
+                    adjust=self._map_adjust_param(self.adjust),
+                )
 
         if self.interval == "year":
             self.interval_multiplier *= 12
@@ -248,7 +252,8 @@ class EastMoneyHistorical(HistoricalDataProvider):
 
         etf_symbol = f"{market_prefix}{self.symbol}"
 
-        raw_df: pd.DataFrame = ak.fund_etf_hist_sina(symbol=etf_symbol)
+        with upstream_call(SINA_HOST):
+            raw_df: pd.DataFrame = ak.fund_etf_hist_sina(symbol=etf_symbol)
 
         if raw_df.empty:
             raise ValueError(f"No data found for ETF {self.symbol}")
@@ -2,10 +2,11 @@ from typing import Any
 
 import pandas as pd
 
+from akshare_one.eastmoney.async_client import AsyncEastMoneyClient
 from akshare_one.eastmoney.client import EastMoneyClient
 from akshare_one.eastmoney.utils import parse_kline_data, resample_historical_data
 
-from ..cache import cache
+from ..cache import range_cache
 from .base import HistoricalDataProvider
 
 
@@ -15,49 +16,68 @@ class EastMoneyDirectHistorical(HistoricalDataProvider):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.client = EastMoneyClient()
+        self.aclient = AsyncEastMoneyClient()
 
-    @cache(
-        "hist_data_cache",
-        key=lambda self: (
-            f"eastmoney_direct_hist_{self.symbol}_{self.interval}_{self.interval_multiplier}_{self.adjust}"
-        ),
-    )
-    def get_hist_data(self) -> pd.DataFrame:
-        """Fetches EastMoney historical market data directly from API"""
+    def _series_key(self) -> str:
+        return (
+            f"eastmoney_direct_hist_{self.symbol}_{self.interval}_"
+            f"{self.interval_multiplier}_{self.adjust}"
+        )
+
+    def _kline_params(self) -> dict[str, str]:
         self.interval = self.interval.lower()
         self._validate_interval_params()
+        return {
+            "symbol": self.symbol,
+            "klt": self._get_kline_type(),
+            "fqt": self._get_adjust_type(),
+            "start_date": self.start_date.replace("-", ""),
+            "end_date": self.end_date.replace("-", ""),
+        }
 
-        try:
-            klt = self._get_kline_type()
-            fqt = self._get_adjust_type()
-            start_date = self.start_date.replace("-", "")
-            end_date = self.end_date.replace("-", "")
-
-            raw_data = self.client.fetch_historical_klines(
-                symbol=self.symbol,
-                klt=klt,
-                fqt=fqt,
-                start_date=start_date,
-                end_date=end_date,
+    def _to_frame(self, raw_data: dict[str, Any]) -> pd.DataFrame:
+        if raw_data.get("rc") != 0:
+            raise ValueError(
+                f"API returned error: {raw_data.get('msg')}, rc: {raw_data.get('rc')}"
             )
 
-            if raw_data.get("rc") != 0:
-                raise ValueError(
-                    f"API returned error: {raw_data.get('msg')}, "
-                    f"rc: {raw_data.get('rc')}"
-                )
-
-            df = parse_kline_data(raw_data)
+        # 与其他数据源保持相同的输出列，只重采样这些列
+        df = parse_kline_data(raw_data)[
+            ["timestamp", "open", "high", "low", "close", "volume"]
+        ]
+        return resample_historical_data(df, self.interval, self.interval_multiplier)
 
-            df = resample_historical_data(df, self.interval, self.interval_multiplier)
-
-            return df
+    @range_cache("hist_data_cache", key=_series_key, incremental=True)
+    def get_hist_data(self) -> pd.DataFrame:
+        """Fetches EastMoney historical market data directly from API"""
+        try:
+            raw_data = self.client.fetch_historical_klines(**self._kline_params())
+            return self._to_frame(raw_data)
+        except Exception as e:
+            raise ValueError(
+                f"Failed to fetch historical data for {self.symbol}: {e}"
+            ) from e
 
+    @range_cache("hist_data_cache", key=_series_key, incremental=True)
+    async def aget_hist_data(self) -> pd.DataFrame:
+        """Fetches EastMoney historical market data without blocking"""
+        try:
+            raw_data = await self.aclient.fetch_historical_klines(
+                **self._kline_params()
+            )
+            return self._to_frame(raw_data)
         except Exception as e:
             raise ValueError(
                 f"Failed to fetch historical data for {self.symbol}: {e}"
             ) from e
 
+    def _is_resampled(self) -> bool:
+        """Minute/hour multipliers map to native K-line types, not resampling"""
+        return (
+            self.interval.lower() in ["day", "week", "month", "year"]
+            and self.interval_multiplier > 1
+        )
+
     def _get_kline_type(self) -> str:
         """Get K-line type based on interval."""
         kline_map = {
@@ -0,0 +1,265 @@
+"""Hedged historical data requests across two sources"""
+
+import asyncio
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .base import HistoricalDataProvider, normalize_hist_data
+from .factory import HistoricalDataFactory
+
+# 默认设置，可用 configure_hedging 修改
+HEDGE_SETTINGS: dict[str, Any] = {
+    # 主数据源超过其延迟的该分位数仍未返回时请求备用数据源
+    "quantile": 0.9,
+    # 每个数据源保留的最近成功请求的延迟数
+    "window": 200,
+    # 样本少于该数量时使用 delay 作为阈值
+    "min_samples": 20,
+    "delay": 1.0,
+    # 阈值下限（秒），避免缓存命中拉低分位数后几乎每次都请求备用数据源
+    "min_delay": 0.05,
+}
+# 执行对冲请求的线程数，每个同步请求占用一到两个线程
+HEDGE_WORKERS = 32
+
+# 数据源 -> 最近成功请求的延迟（秒）
+_latencies: dict[str, deque[float]] = {}
+# 主数据源 -> 计数，见 hedge_stats
+_counts: dict[str, Counter[str]] = {}
+_lock = threading.Lock()
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=HEDGE_WORKERS, thread_name_prefix="akshare-one-hedge"
+                )
+    return _executor
+
+
+def record_latency(source: str, seconds: float) -> None:
+    """Adds the duration of a successful request to ``source``'s window"""
+    with _lock:
+        window = _latencies.get(source)
+        if window is None or window.maxlen != HEDGE_SETTINGS["window"]:
+            window = _latencies[source] = deque(
+                window or (), maxlen=HEDGE_SETTINGS["window"]
+            )
+        window.append(seconds)
+
+
+def hedge_delay(source: str) -> float:
+    """Returns how long to wait for ``source`` before also asking the hedge
+
+    The observed ``quantile`` (p90 by default) of its recent latencies, or
+    ``delay`` until there are ``min_samples`` of them, and never less than
+    ``min_delay``.
+    """
+    with _lock:
+        samples = list(_latencies.get(source, ()))
+    if len(samples) < HEDGE_SETTINGS["min_samples"]:
+        delay = HEDGE_SETTINGS["delay"]
+    else:
+        delay = float(np.quantile(samples, HEDGE_SETTINGS["quantile"]))
+    return max(float(delay), float(HEDGE_SETTINGS["min_delay"]))
+
+
+def _count(source: str, *events: str) -> None:
+    with _lock:
+        _counts.setdefault(source, Counter()).update(events)
+
+
+def configure_hedging(**settings: Any) -> None:
+    """Changes hedging settings
+
+    Args:
+        **settings: quantile, window, min_samples, delay, min_delay，
+            含义见 HEDGE_SETTINGS
+    """
+    unknown = set(settings) - set(HEDGE_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown hedging settings: {sorted(unknown)}")
+    if not 0 < settings.get("quantile", 0.5) < 1:
+        raise ValueError("quantile must be between 0 and 1")
+    with _lock:
+        HEDGE_SETTINGS.update(settings)
+
+
+def hedge_stats() -> dict[str, dict[str, Any]]:
+    """Returns latency and hedging counts per source
+
+    Returns:
+        dict: 数据源 -> 统计:
+        - samples: 延迟样本数
+        - p50 / p90: 最近成功请求的延迟（秒）
+        - threshold: 当前的对冲阈值（秒）
+        - requests: 作为主数据源的请求数
+        - hedged: 请求了备用数据源的次数
+        - hedge_wins: 采用备用数据源结果的次数
+    """
+    with _lock:
+        samples = {source: list(window) for source, window in _latencies.items()}
+        counts = {source: Counter(counter) for source, counter in _counts.items()}
+    stats = {}
+    for source in sorted(set(samples) | set(counts)):
+        latencies = samples.get(source, [])
+        stats[source] = {
+            "samples": len(latencies),
+            "p50": float(np.quantile(latencies, 0.5)) if latencies else None,
+            "p90": float(np.quantile(latencies, 0.9)) if latencies else None,
+            "threshold": hedge_delay(source),
+            **{
+                event: counts.get(source, Counter())[event]
+                for event in ("requests", "hedged", "hedge_wins")
+            },
+        }
+    return stats
+
+
+class HedgedHistorical(HistoricalDataProvider):
+    """
+    Requests historical data from a primary source and, when it is slow,
+    also from a hedge source; the first valid result wins.
+
+    The hedge request starts once the primary has not answered within
+    ``hedge_delay(source)``, its observed p90 latency by default, or at once
+    if the primary fails. A result is valid when it is non-empty and has the
+    standard columns; both are normalized with ``normalize_hist_data`` so
+    either can be returned. If neither is valid, an empty result is returned
+    if there is one, otherwise the primary's error is raised.
+
+    The losing request is cancelled: the asyncio version cancels its task,
+    the blocking version stops waiting for its thread and discards the
+    result (it still fills that source's cache).
+    """
+
+    def __init__(self, source: str, hedge: str, **kwargs: Any) -> None:
+        """
+        Args:
+            source: 主数据源名称
+            hedge: 备用数据源名称，须已在 HistoricalDataFactory 注册
+            **kwargs: symbol, interval 等，同 HistoricalDataProvider
+        """
+        super().__init__(**kwargs)
+        if source.lower() == hedge.lower():
+            raise ValueError("hedge must be a different source than source")
+        self.source = source.lower()
+        self.hedge = hedge.lower()
+        self.providers = {
+            name: HistoricalDataFactory.get_provider(name, **kwargs)
+            for name in (self.source, self.hedge)
+        }
+
+    def _settle(
+        self,
+        name: str,
+        outcome: "Future[pd.DataFrame] | asyncio.Task[pd.DataFrame]",
+        failures: dict[str, Any],
+    ) -> pd.DataFrame | None:
+        """Returns a finished request's result if it is valid, else records it"""
+        try:
+            df = outcome.result()
+        except Exception as e:
+            failures[name] = e
+            return None
+        if df.empty:
+            failures[name] = df
+            return None
+        if name == self.hedge:
+            _count(self.source, "hedge_wins")
+        return df
+
+    def _give_up(self, failures: dict[str, Any]) -> pd.DataFrame:
+        # 没有有效结果时优先返回空表，否则抛出主数据源的错误
+        outcomes = [failures[name] for name in self.providers if name in failures]
+        for outcome in outcomes:
+            if isinstance(outcome, pd.DataFrame):
+                return outcome
+        raise outcomes[0]
+
+    def _timed(self, name: str) -> pd.DataFrame:
+        started = time.perf_counter()
+        df = self.providers[name].get_hist_data()
+        record_latency(name, time.perf_counter() - started)
+        return normalize_hist_data(df)
+
+    def get_hist_data(self) -> pd.DataFrame:
+        """Fetches historical data from whichever source answers first"""
+        _count(self.source, "requests")
+        executor = _get_executor()
+        pending: dict[Future[pd.DataFrame], str] = {
+            executor.submit(self._timed, self.source): self.source
+        }
+        failures: dict[str, Any] = {}
+        hedged = False
+        timeout: float | None = hedge_delay(self.source)
+        try:
+            while True:
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    df = self._settle(pending.pop(future), future, failures)
+                    if df is not None:
+                        return df
+                if not hedged:
+                    # 主数据源超时或没有有效结果，请求备用数据源
+                    hedged = True
+                    timeout = None
+                    _count(self.source, "hedged")
+                    pending[executor.submit(self._timed, self.hedge)] = self.hedge
+                elif not pending:
+                    return self._give_up(failures)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def _atimed(self, name: str) -> pd.DataFrame:
+        started = time.perf_counter()
+        try:
+            df = await self.providers[name].aget_hist_data()
+        except asyncio.CancelledError:
+            # 被取消时的耗时是实际延迟的下限
+            record_latency(name, time.perf_counter() - started)
+            raise
+        record_latency(name, time.perf_counter() - started)
+        return normalize_hist_data(df)
+
+    async def aget_hist_data(self) -> pd.DataFrame:
+        """Fetches historical data from whichever source answers first"""
+        _count(self.source, "requests")
+        pending: dict[asyncio.Task[pd.DataFrame], str] = {
+            asyncio.create_task(self._atimed(self.source)): self.source
+        }
+        failures: dict[str, Any] = {}
+        hedged = False
+        timeout: float | None = hedge_delay(self.source)
+        try:
+            while True:
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    df = self._settle(pending.pop(task), task, failures)
+                    if df is not None:
+                        return df
+                if not hedged:
+                    hedged = True
+                    timeout = None
+                    _count(self.source, "hedged")
+                    pending[asyncio.create_task(self._atimed(self.hedge))] = self.hedge
+                elif not pending:
+                    return self._give_up(failures)
+        finally:
+            for task in pending:
+                task.cancel()
@@ -1,14 +1,16 @@
 import akshare as ak  # type: ignore
 import pandas as pd
 
-from ..cache import cache
+from ..cache import range_cache
+from ..circuit import upstream_call
+from ..ratelimit import SINA_HOST
 from .base import HistoricalDataProvider
 
 
 class SinaHistorical(HistoricalDataProvider):
     """Adapter for Sina historical stock data API"""
 
-    @cache(
+    @range_cache(
         "hist_data_cache",
         key=lambda self: (
             f"sina_hist_{self.symbol}_{self.interval}_{self.interval_multiplier}_{self.adjust}"
@@ -49,11 +51,12 @@ class SinaHistorical(HistoricalDataProvider):
 
     def _get_minute_data(self, stock: str) -> pd.DataFrame:
         """Fetches minute level data"""
-        raw_df = ak.stock_zh_a_minute(
-            symbol=stock,
-            period="1",
-            adjust=self._map_adjust_param(self.adjust),
-        )
+        with upstream_call(SINA_HOST):
+            raw_df = ak.stock_zh_a_minute(
+                symbol=stock,
+                period="1",
+                adjust=self._map_adjust_param(self.adjust),
+            )
         raw_df = raw_df.rename(columns={"day": "date"})
         raw_df["date"] = pd.to_datetime(raw_df["date"])
         raw_df = raw_df.set_index("date")
@@ -77,11 +80,12 @@ class SinaHistorical(HistoricalDataProvider):
         if self.interval_multiplier < 1:
             raise ValueError("Hour interval multiplier must be >= 1")
 
-        raw_df = ak.stock_zh_a_minute(
-            symbol=stock,
-            period="60",
-            adjust=self._map_adjust_param(self.adjust),
-        )
+        with upstream_call(SINA_HOST):
+            raw_df = ak.stock_zh_a_minute(
+                symbol=stock,
+                period="60",
+                adjust=self._map_adjust_param(self.adjust),
+            )
         raw_df = raw_df.rename(columns={"day": "date"})
         raw_df["date"] = pd.to_datetime(raw_df["date"])
         raw_df = raw_df.set_index("date")
@@ -107,11 +111,12 @@ class SinaHistorical(HistoricalDataProvider):
 
         if self.interval in ["minute", "hour"]:
             period = "1" if self.interval == "minute" else "60"
-            raw_df = ak.stock_zh_b_minute(
-                symbol=stock,
-                period=period,
-                adjust=self._map_adjust_param(self.adjust),
-            )
+            with upstream_call(SINA_HOST):
+                raw_df = ak.stock_zh_b_minute(
+                    symbol=stock,
+                    period=period,
+                    adjust=self._map_adjust_param(self.adjust),
+                )
             # Rename 'day' to 'date' for consistency
             raw_df = raw_df.rename(columns={"day": "date"})
 
@@ -120,12 +125,13 @@ class SinaHistorical(HistoricalDataProvider):
                     raw_df, self.interval, self.interval_multiplier
                 )
         else:
-            raw_df = ak.stock_zh_b_daily(
-                symbol=stock,
-                start_date=start_date,
-                end_date=end_date,
-                adjust=self._map_adjust_param(self.adjust),
-            )
+            with upstream_call(SINA_HOST):
+                raw_df = ak.stock_zh_b_daily(
+                    symbol=stock,
+                    start_date=start_date,
+                    end_date=end_date,
+                    adjust=self._map_adjust_param(self.adjust),
+                )
             if self.interval_multiplier > 1:
                 raw_df = self._resample_data(
                     raw_df, self.interval, self.interval_multiplier
@@ -142,12 +148,13 @@ class SinaHistorical(HistoricalDataProvider):
         start_date = self._convert_date_format(self.start_date)
         end_date = self._convert_date_format(self.end_date)
 
-        raw_df = ak.stock_zh_a_daily(
-            symbol=stock,
-            start_date=start_date,
-            end_date=end_date,
-            adjust=self._map_adjust_param(self.adjust),
-        )
+        with upstream_call(SINA_HOST):
+            raw_df = ak.stock_zh_a_daily(
+                symbol=stock,
+                start_date=start_date,
+                end_date=end_date,
+                adjust=self._map_adjust_param(self.adjust),
+            )
 
         if self.interval_multiplier > 1:
             raw_df = self._resample_data(
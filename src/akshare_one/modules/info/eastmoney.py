@@ -2,6 +2,7 @@ import akshare as ak  # type: ignore
 import pandas as pd
 
 from ..cache import cache
+from ..circuit import upstream_call
 from .base import InfoDataProvider
 
 
@@ -24,7 +25,8 @@ class EastmoneyInfo(InfoDataProvider):
     )
     def get_basic_info(self) -> pd.DataFrame:
         """获取东方财富个股信息"""
-        info_df = ak.stock_individual_info_em(symbol=self.symbol)
+        with upstream_call("push2.eastmoney.com"):
+            info_df = ak.stock_individual_info_em(symbol=self.symbol)
         info_df = info_df.set_index("item").T
         info_df.reset_index(drop=True, inplace=True)
         info_df.rename(columns=self._basic_info_rename_map, inplace=True)
@@ -2,6 +2,8 @@ import akshare as ak  # type: ignore
 import pandas as pd
 
 from ..cache import cache
+from ..circuit import upstream_call
+from ..ratelimit import XUEQIU_HOST
 from ..utils import convert_xieqiu_symbol
 from .base import InsiderDataProvider
 
@@ -31,7 +33,8 @@ class XueQiuInsider(InsiderDataProvider):
             - relationship: 与董监高关系
             - position: 董监高职务
         """
-        raw_df = ak.stock_inner_trade_xq()
+        with upstream_call(XUEQIU_HOST):
+            raw_df = ak.stock_inner_trade_xq()
         if self.symbol:
             xueqiu_symbol = convert_xieqiu_symbol(self.symbol)
             raw_df = raw_df[raw_df["股票代码"] == xueqiu_symbol]
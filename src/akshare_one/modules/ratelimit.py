@@ -0,0 +1,175 @@
+"""Process-wide token-bucket rate limits for upstream hosts"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any
+
+# 主机 -> (每秒请求数, 突发请求数)
+# 直连接口按请求的主机限流，通过 akshare 访问的新浪、雪球、东方财富接口按所属主机限流
+RATE_LIMITS: dict[str, tuple[float, int]] = {
+    "push2his.eastmoney.com": (10.0, 20),
+    "push2.eastmoney.com": (10.0, 20),
+    "datacenter-web.eastmoney.com": (5.0, 10),
+    "finance.sina.com.cn": (5.0, 10),
+    "stock.xueqiu.com": (5.0, 10),
+}
+
+SINA_HOST = "finance.sina.com.cn"
+XUEQIU_HOST = "stock.xueqiu.com"
+
+
+class TokenBucket:
+    """
+    A token bucket allowing ``rate`` requests per second on average and up to
+    ``burst`` at once.
+
+    Callers reserve a token under a lock and then wait outside it, so the
+    bucket can be shared by threads and event loops alike: ``acquire()`` sleeps
+    the thread, ``aacquire()`` only suspends the coroutine. Reservations may
+    drive the balance negative, which queues later callers behind earlier ones.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        Args:
+            rate: 每秒请求数
+            burst: 桶容量，即空闲后可以立即发出的请求数
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def reserve(self) -> float:
+        """Takes a token and returns how long to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            delay = max(-self._tokens / self.rate, 0.0)
+            self.requests += 1
+            if delay > 0:
+                self.throttled += 1
+                self.waited += delay
+            return delay
+
+    def acquire(self) -> float:
+        """Blocks until a request may be sent and returns the wait"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def aacquire(self) -> float:
+        """Waits without blocking the event loop and returns the wait"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _bucket(host: str) -> TokenBucket | None:
+    bucket = _buckets.get(host)
+    if bucket is None and host in RATE_LIMITS:
+        with _buckets_lock:
+            bucket = _buckets.get(host)
+            if bucket is None and host in RATE_LIMITS:
+                rate, burst = RATE_LIMITS[host]
+                bucket = _buckets[host] = TokenBucket(rate, burst)
+    return bucket
+
+
+def acquire(host: str) -> float:
+    """Waits for the rate limit of ``host`` in the calling thread
+
+    Hosts without a limit return at once.
+
+    Returns:
+        float: 等待时间（秒）
+    """
+    bucket = _bucket(host)
+    return 0.0 if bucket is None else bucket.acquire()
+
+
+async def aacquire(host: str) -> float:
+    """Waits for the rate limit of ``host`` without blocking the event loop"""
+    bucket = _bucket(host)
+    return 0.0 if bucket is None else await bucket.aacquire()
+
+
+def configure_rate_limit(
+    host: str, rate: float | None, burst: int | None = None
+) -> None:
+    """Sets the request rate allowed to a host
+
+    The limit is shared by every provider and thread in the process.
+
+    Args:
+        host: 主机名，例如 "push2his.eastmoney.com"
+        rate: 每秒请求数，None 表示不限流
+        burst: 突发请求数，默认与原设置相同，没有原设置时为 max(1, rate)
+    """
+    with _buckets_lock:
+        _buckets.pop(host, None)
+        if rate is None:
+            RATE_LIMITS.pop(host, None)
+            return
+        if burst is None:
+            burst = RATE_LIMITS.get(host, (rate, max(1, int(rate))))[1]
+        # 先构造以校验参数
+        _buckets[host] = TokenBucket(rate, burst)
+        RATE_LIMITS[host] = (rate, burst)
+
+
+def configure_rate_limits(limits: Mapping[str, tuple[float, int] | None]) -> None:
+    """Sets the limits of several hosts, see ``configure_rate_limit``
+
+    Args:
+        limits: 主机 -> (每秒请求数, 突发请求数)，None 表示不限流
+    """
+    for host, limit in limits.items():
+        if limit is None:
+            configure_rate_limit(host, None)
+        else:
+            configure_rate_limit(host, *limit)
+
+
+def rate_limit_stats() -> dict[str, dict[str, Any]]:
+    """Returns the limit and usage of each host with a limit
+
+    Returns:
+        dict: 主机 -> 统计:
+        - rate / burst: 当前限制
+        - requests: 请求数
+        - throttled: 需要等待的请求数
+        - waited: 累计等待时间（秒）
+    """
+    stats = {}
+    for host in list(RATE_LIMITS):
+        bucket = _bucket(host)
+        if bucket is not None:
+            stats[host] = {
+                "rate": bucket.rate,
+                "burst": bucket.burst,
+                "requests": bucket.requests,
+                "throttled": bucket.throttled,
+                "waited": bucket.waited,
+            }
+    return stats
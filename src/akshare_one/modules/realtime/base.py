@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 import pandas as pd
@@ -26,3 +27,11 @@ class RealtimeDataProvider(ABC):
             - prev_close: 昨收
         """
         pass
+
+    async def aget_current_data(self) -> pd.DataFrame:
+        """Fetches realtime market data without blocking the event loop
+
+        Sources without a native async implementation run ``get_current_data`` in a
+        worker thread.
+        """
+        return await asyncio.to_thread(self.get_current_data)
@@ -2,6 +2,7 @@ import akshare as ak  # type: ignore
 import pandas as pd
 
 from ..cache import cache
+from ..circuit import upstream_call
 from .base import RealtimeDataProvider
 
 
@@ -12,7 +13,8 @@ class EastmoneyRealtime(RealtimeDataProvider):
     )
     def get_current_data(self) -> pd.DataFrame:
         """获取沪深京A股实时行情数据"""
-        raw_df = ak.stock_zh_a_spot_em()
+        with upstream_call("push2.eastmoney.com"):
+            raw_df = ak.stock_zh_a_spot_em()
         df = self._clean_spot_data(raw_df)
         if self.symbol:
             df = df[df["symbol"] == self.symbol].reset_index(drop=True)
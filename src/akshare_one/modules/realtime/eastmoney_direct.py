@@ -1,5 +1,8 @@
+from typing import Any
+
 import pandas as pd
 
+from akshare_one.eastmoney.async_client import AsyncEastMoneyClient
 from akshare_one.eastmoney.client import EastMoneyClient
 from akshare_one.eastmoney.utils import parse_realtime_data
 
@@ -13,27 +16,38 @@ class EastMoneyDirectRealtime(RealtimeDataProvider):
     def __init__(self, symbol: str):
         super().__init__(symbol)
         self.client = EastMoneyClient()
+        self.aclient = AsyncEastMoneyClient()
 
-    @cache(
-        "realtime_cache",
-        key=lambda self: f"eastmoney_direct_realtime_{self.symbol}",
-    )
-    def get_current_data(self) -> pd.DataFrame:
-        """Get real-time stock data"""
-        try:
-            raw_data = self.client.fetch_realtime_quote(self.symbol)
+    def _cache_key(self) -> str:
+        return f"eastmoney_direct_realtime_{self.symbol}"
 
-            if raw_data.get("rc") != 0:
-                raise ValueError(f"API returned error: {raw_data.get('msg')}")
+    def _to_frame(self, raw_data: dict[str, Any]) -> pd.DataFrame:
+        if raw_data.get("rc") != 0:
+            raise ValueError(f"API returned error: {raw_data.get('msg')}")
 
-            df = parse_realtime_data(raw_data)
+        df = parse_realtime_data(raw_data)
 
-            # Ensure the output matches the base class definition
-            if self.symbol:
-                df = df[df["symbol"] == self.symbol].reset_index(drop=True)
+        # Ensure the output matches the base class definition
+        if self.symbol:
+            df = df[df["symbol"] == self.symbol].reset_index(drop=True)
 
-            return df
+        return df
 
+    @cache("realtime_cache", key=_cache_key)
+    def get_current_data(self) -> pd.DataFrame:
+        """Get real-time stock data"""
+        try:
+            return self._to_frame(self.client.fetch_realtime_quote(self.symbol))
+        except Exception as e:
+            raise ValueError(
+                f"Failed to get real-time data for {self.symbol}: {e}"
+            ) from e
+
+    @cache("realtime_cache", key=_cache_key)
+    async def aget_current_data(self) -> pd.DataFrame:
+        """Get real-time stock data without blocking"""
+        try:
+            return self._to_frame(await self.aclient.fetch_realtime_quote(self.symbol))
         except Exception as e:
             raise ValueError(
                 f"Failed to get real-time data for {self.symbol}: {e}"
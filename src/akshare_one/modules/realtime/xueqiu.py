@@ -2,6 +2,8 @@ import akshare as ak  # type: ignore
 import pandas as pd
 
 from ..cache import cache
+from ..circuit import upstream_call
+from ..ratelimit import XUEQIU_HOST
 from ..utils import convert_xieqiu_symbol
 from .base import RealtimeDataProvider
 
@@ -31,7 +33,10 @@ class XueQiuRealtime(RealtimeDataProvider):
             - low: 最低
             - prev_close: 昨收
         """
-        raw_df = ak.stock_individual_spot_xq(symbol=convert_xieqiu_symbol(self.symbol))
+        with upstream_call(XUEQIU_HOST):
+            raw_df = ak.stock_individual_spot_xq(
+                symbol=convert_xieqiu_symbol(self.symbol)
+            )
 
         # Convert to dictionary for easier lookup
         data_map = dict(zip(raw_df["item"], raw_df["value"], strict=True))
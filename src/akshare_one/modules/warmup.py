@@ -0,0 +1,185 @@
+"""Prefetches data for a symbol universe into the cache ahead of the open"""
+
+import datetime as dt
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from .cache import TradingSessionTTL, is_cache_enabled
+
+logger = logging.getLogger(__name__)
+
+_SHANGHAI = ZoneInfo("Asia/Shanghai")
+
+# (函数或 akshare_one 中的函数名, 除 symbol 以外的参数)
+WarmupTemplate = tuple[Callable[..., Any] | str, Mapping[str, Any]]
+
+
+def _resolve(func: Callable[..., Any] | str) -> Callable[..., Any]:
+    if callable(func):
+        return func
+    import akshare_one
+
+    resolved = getattr(akshare_one, func, None)
+    if not callable(resolved):
+        raise ValueError(f"Unknown akshare_one function: {func}")
+    return resolved  # type: ignore
+
+
+def warm_cache(
+    universe: Iterable[str],
+    templates: Sequence[WarmupTemplate],
+    max_workers: int = 8,
+    progress: Callable[[int, int], None] | None = None,
+) -> dict[str, Any]:
+    """Calls every template for every symbol so the results are cached
+
+    Calls go through the public functions and their cache decorators, so each
+    result is stored with the TTL of its namespace, entries that are still
+    fresh are not fetched again and duplicate requests are collapsed. At most
+    ``max_workers`` requests run at once. Failures are logged and reported
+    instead of raised.
+
+    Args:
+        universe: 股票代码列表
+        templates: (函数, 参数) 列表，例如 (get_hist_data, {"interval": "day"})，
+            函数也可以是 akshare_one 中的函数名
+        max_workers: 最大并发请求数
+        progress: 每完成一个请求调用一次 progress(已完成数, 总数)
+
+    Returns:
+        dict:
+        - total: 请求总数
+        - succeeded: 成功数
+        - failed: 失败数
+        - elapsed: 耗时（秒）
+        - failures: 失败请求列表，包含 function, symbol, kwargs, error
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    if not is_cache_enabled():
+        logger.warning("Cache is disabled, warm-up results will not be kept")
+
+    resolved = [(_resolve(func), dict(kwargs)) for func, kwargs in templates]
+    tasks = [
+        (func, symbol, kwargs)
+        for symbol in dict.fromkeys(universe)
+        for func, kwargs in resolved
+    ]
+    started = time.perf_counter()
+    failures: list[dict[str, Any]] = []
+    done = 0
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="akshare-one-warmup"
+    ) as executor:
+        futures = {
+            executor.submit(func, symbol=symbol, **kwargs): (func, symbol, kwargs)
+            for func, symbol, kwargs in tasks
+        }
+        for future in as_completed(futures):
+            func, symbol, kwargs = futures[future]
+            error = future.exception()
+            if error is not None:
+                name = getattr(func, "__name__", repr(func))
+                logger.warning("Warm-up of %s(%s) failed: %s", name, symbol, error)
+                failures.append(
+                    {
+                        "function": name,
+                        "symbol": symbol,
+                        "kwargs": kwargs,
+                        "error": error,
+                    }
+                )
+            done += 1
+            if progress is not None:
+                progress(done, len(tasks))
+
+    return {
+        "total": len(tasks),
+        "succeeded": len(tasks) - len(failures),
+        "failed": len(failures),
+        "elapsed": time.perf_counter() - started,
+        "failures": failures,
+    }
+
+
+class WarmupScheduler:
+    """Runs ``warm_cache`` every trading day at a fixed Shanghai time
+
+    The schedule runs on a daemon thread; call ``cancel()`` to stop it. The
+    report of the latest run is kept in ``last_report``.
+
+    Args:
+        universe: 股票代码列表
+        templates: (函数, 参数) 列表，同 warm_cache
+        at: 每个交易日的预热时间 (HH:MM)，默认在开盘集合竞价开始 (09:15) 之后，
+            按交易时段过期的条目在此之前预热会在 09:15 全部过期
+        max_workers: 最大并发请求数
+        progress: 进度回调，同 warm_cache
+        holidays: 休市日期（周末以外）
+    """
+
+    def __init__(
+        self,
+        universe: Iterable[str],
+        templates: Sequence[WarmupTemplate],
+        at: str = "09:21",
+        max_workers: int = 8,
+        progress: Callable[[int, int], None] | None = None,
+        holidays: Iterable[dt.date] = (),
+    ) -> None:
+        self.universe = list(universe)
+        self.templates = list(templates)
+        self.at = dt.time.fromisoformat(at)
+        self.max_workers = max_workers
+        self.progress = progress
+        self.calendar = TradingSessionTTL(open_ttl=0, holidays=holidays)
+        self.last_report: dict[str, Any] | None = None
+        self._cancelled = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def next_run(self, now: float | None = None) -> float:
+        """Returns the next warm-up time (Unix time) after ``now``"""
+        local = dt.datetime.fromtimestamp(
+            time.time() if now is None else now, _SHANGHAI
+        )
+        day = local.date()
+        for _ in range(366):
+            if self.calendar.is_trading_day(day):
+                runs = dt.datetime.combine(day, self.at, _SHANGHAI)
+                if runs > local:
+                    return runs.timestamp()
+            day += dt.timedelta(days=1)
+        raise ValueError("no trading day within a year")
+
+    def run(self) -> dict[str, Any]:
+        """Warms the cache now and returns the report"""
+        self.last_report = warm_cache(
+            self.universe, self.templates, self.max_workers, self.progress
+        )
+        return self.last_report
+
+    def start(self) -> "WarmupScheduler":
+        if self._thread is not None:
+            raise RuntimeError("WarmupScheduler already started")
+
+        def loop() -> None:
+            while not self._cancelled.wait(max(self.next_run() - time.time(), 0)):
+                try:
+                    self.run()
+                except Exception as e:
+                    logger.warning("Cache warm-up failed: %s", e)
+
+        self._thread = threading.Thread(
+            target=loop, name="akshare-one-warmup-scheduler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        self._cancelled.set()
@@ -0,0 +1,30 @@
+import contextlib
+from unittest import mock
+
+import pytest
+
+from akshare_one.modules import cache as cache_module
+
+from .helpers import FakeTimer
+
+
+@pytest.fixture
+def timer():
+    return FakeTimer()
+
+
+@pytest.fixture(autouse=True)
+def cache_state():
+    """Restores the cache configuration and bookkeeping a test changes"""
+    with contextlib.ExitStack() as stack:
+        for settings in (
+            cache_module.CACHE_CONFIG,
+            cache_module._expires_at,
+            cache_module._stale_grace,
+            cache_module._ttl_policies,
+            cache_module._negative_ttls,
+            cache_module._negative,
+            cache_module._writes,
+        ):
+            stack.enter_context(mock.patch.dict(settings))
+        yield
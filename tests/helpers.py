@@ -0,0 +1,78 @@
+"""Test doubles shared by the test modules"""
+
+import json
+import time
+
+import pandas as pd
+import requests
+
+
+class FakeTimer:
+    """A clock that only moves when a test advances ``now``"""
+
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def sample_frame(rows: int = 3) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range(
+                "2024-01-02", periods=rows, freq="D", tz="Asia/Shanghai"
+            ),
+            "close": [float(i) for i in range(rows)],
+            "volume": list(range(rows)),
+        }
+    )
+
+
+def wait_for(condition) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+class FakeResponse:
+    """A ``requests`` response with a JSON payload, or raw bytes"""
+
+    def __init__(self, payload, status_code=200, headers=None):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+    @property
+    def content(self) -> bytes:
+        if isinstance(self.payload, bytes):
+            return self.payload
+        return json.dumps(self.payload).encode("utf-8")
+
+    def iter_content(self, chunk_size=1):
+        content = self.content
+        for start in range(0, len(content), chunk_size):
+            yield content[start : start + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+
+class ScriptedSession:
+    """Answers each request with the next response or exception"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None, stream=False):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
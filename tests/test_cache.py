@@ -0,0 +1,970 @@
+import asyncio
+import contextlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+from cachetools import TTLCache
+
+import akshare_one
+from akshare_one import get_hist_data
+from akshare_one.eastmoney.mock_server import MockUpstream
+from akshare_one.modules import cache as cache_module
+from akshare_one.modules.cache import (
+    CACHE_CONFIG,
+    HIST_REFRESH_INTERVAL,
+    FixedTTL,
+    NoDataError,
+    TradingSessionTTL,
+    cache,
+    cache_stats,
+    configure_cache,
+    export_cache,
+    frame_size,
+    import_cache,
+    invalidate_cache,
+    is_cache_enabled,
+    range_cache,
+    set_cache_enabled,
+)
+from akshare_one.modules.historical.base import HistoricalDataProvider
+
+from .helpers import sample_frame, wait_for
+
+try:
+    import pyarrow  # noqa: F401
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+class FakeHistorical(HistoricalDataProvider):
+    """Returns one bar per day and records the requested spans"""
+
+    fetched: list[tuple[str, str]] = []
+
+    def bars(self) -> pd.DataFrame:
+        FakeHistorical.fetched.append((self.start_date, self.end_date))
+        timestamps = pd.date_range(
+            self.start_date, self.end_date, freq="D", tz="Asia/Shanghai"
+        )
+        return pd.DataFrame(
+            {"timestamp": timestamps, "close": [t.day for t in timestamps]}
+        )
+
+    @range_cache(
+        "hist_data_cache",
+        key=lambda self: f"fake_hist_{self.symbol}_{self.interval_multiplier}",
+    )
+    def get_hist_data(self) -> pd.DataFrame:
+        return self.bars()
+
+
+class IncrementalFakeHistorical(FakeHistorical):
+    version = 0
+
+    @range_cache(
+        "hist_data_cache",
+        key=lambda self: f"fake_incremental_{self.symbol}_{self.adjust}",
+        incremental=True,
+    )
+    def get_hist_data(self) -> pd.DataFrame:
+        df = self.bars()
+        df["close"] = self.version
+        return df
+
+
+class AsyncFakeHistorical(FakeHistorical):
+    @range_cache(
+        "hist_data_cache",
+        key=lambda self: f"fake_hist_{self.symbol}_{self.interval_multiplier}",
+    )
+    async def aget_hist_data(self) -> pd.DataFrame:
+        await asyncio.sleep(0)
+        return self.bars()
+
+
+@pytest.fixture
+def fixed_refresh(monkeypatch):
+    """Refreshes series reaching today on a fixed interval, whatever the clock"""
+    monkeypatch.setattr(
+        cache_module, "HIST_REFRESH_POLICY", FixedTTL(HIST_REFRESH_INTERVAL)
+    )
+
+
+@pytest.fixture
+def advance_clock(monkeypatch):
+    """Moves the wall clock seen by the cache forward"""
+
+    def advance(seconds: float) -> None:
+        now = time.time() + seconds
+        monkeypatch.setattr(cache_module.time, "time", lambda: now)
+
+    return advance
+
+
+class HistCacheTests:
+    """Runs the fake historical provider against a private series cache"""
+
+    @pytest.fixture(autouse=True)
+    def hist_cache(self):
+        self.store = TTLCache(maxsize=100, ttl=3600)
+        CACHE_CONFIG["hist_data_cache"] = self.store
+        FakeHistorical.fetched = []
+
+    @staticmethod
+    def get(start: str, end: str, multiplier: int = 1) -> pd.DataFrame:
+        provider = FakeHistorical(
+            "600000", interval_multiplier=multiplier, start_date=start, end_date=end
+        )
+        return provider.get_hist_data()
+
+
+class TestRangeCache(HistCacheTests):
+    def test_sub_range_served_from_cache(self):
+        """测试子区间直接从缓存切片"""
+        self.get("2024-01-01", "2024-01-31")
+        df = self.get("2024-01-10", "2024-01-12")
+
+        assert FakeHistorical.fetched == [("2024-01-01", "2024-01-31")]
+        assert len(df) == 3
+        assert df["timestamp"].iloc[0] == pd.Timestamp("2024-01-10", tz="Asia/Shanghai")
+        assert df.attrs == {}
+
+    def test_fetches_only_missing_head_and_tail(self):
+        """测试只请求缺失的头部和尾部"""
+        self.get("2024-01-10", "2024-01-20")
+        df = self.get("2024-01-05", "2024-01-25")
+
+        assert FakeHistorical.fetched == [
+            ("2024-01-10", "2024-01-20"),
+            ("2024-01-05", "2024-01-09"),
+            ("2024-01-21", "2024-01-25"),
+        ]
+        assert len(df) == 21
+        assert df["timestamp"].is_monotonic_increasing
+
+        self.get("2024-01-06", "2024-01-24")
+        assert len(FakeHistorical.fetched) == 3
+
+    def test_concurrent_windows_merge(self):
+        """测试同一序列不同区间的并发请求依次合并，不重复获取"""
+        started = threading.Event()
+        release = threading.Event()
+
+        class SlowHistorical(FakeHistorical):
+            @range_cache("hist_data_cache", key=lambda self: f"slow_{self.symbol}")
+            def get_hist_data(self) -> pd.DataFrame:
+                started.set()
+                release.wait(5)
+                return self.bars()
+
+        def get(start: str, end: str) -> pd.DataFrame:
+            provider = SlowHistorical("600000", start_date=start, end_date=end)
+            return provider.get_hist_data()
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(get, "2024-01-01", "2024-01-20")
+            started.wait(5)
+            second = pool.submit(get, "2024-01-10", "2024-01-31")
+            time.sleep(0.05)
+            release.set()
+
+        assert len(first.result()) == 20
+        assert len(second.result()) == 22
+        assert FakeHistorical.fetched == [
+            ("2024-01-01", "2024-01-20"),
+            ("2024-01-21", "2024-01-31"),
+        ]
+        assert len(self.store["slow_600000"]) == 31
+
+    def test_partial_last_day_refetched_after_close(self):
+        """测试收盘前获取的数据过了当日后重新获取"""
+        yesterday = pd.Timestamp.now(tz="Asia/Shanghai").normalize() - pd.Timedelta(
+            days=1
+        )
+        start = (yesterday - pd.Timedelta(days=5)).strftime("%Y-%m-%d")
+        end = yesterday.strftime("%Y-%m-%d")
+        self.get(start, end)
+        self.get(start, end)
+        assert len(FakeHistorical.fetched) == 1
+
+        # 模拟在昨日盘中获取
+        entry = self.store["fake_hist_600000_1"]
+        entry.attrs[cache_module._FETCHED_AT] = (
+            yesterday + pd.Timedelta(hours=10)
+        ).timestamp()
+        self.get(start, end)
+        self.get(start, end)
+
+        assert FakeHistorical.fetched == [(start, end)] * 2
+
+    def test_resampled_series_cached_per_window(self):
+        """测试重采样数据按请求区间分别缓存"""
+        self.get("2024-01-10", "2024-01-20", multiplier=2)
+        df = self.get("2024-01-15", "2024-01-25", multiplier=2)
+        self.get("2024-01-15", "2024-01-25", multiplier=2)
+
+        assert FakeHistorical.fetched == [
+            ("2024-01-10", "2024-01-20"),
+            ("2024-01-15", "2024-01-25"),
+        ]
+        assert len(df) == 11
+        assert df.attrs == {}
+
+    def test_resampled_matches_uncached(self):
+        """测试倍数大于1时缓存结果与直接请求一致"""
+        requests = [
+            ("week", 2, "2020-01-01", "2020-06-30"),
+            ("day", 3, "2020-01-01", "2020-06-30"),
+            ("day", 3, "2020-01-03", "2020-06-30"),
+            ("day", 3, "2020-01-06", "2020-03-30"),
+            ("month", 2, "2020-02-01", "2020-12-31"),
+        ]
+        with MockUpstream():
+            set_cache_enabled(False)
+            try:
+                expected = [get_hist_data("600000", *r) for r in requests]
+            finally:
+                set_cache_enabled(True)
+            for _ in range(2):
+                for request, frame in zip(requests, expected, strict=True):
+                    pd.testing.assert_frame_equal(
+                        get_hist_data("600000", *request), frame
+                    )
+
+    def test_different_windows_return_different_frames(self):
+        """测试不同日期区间不会返回同一份数据"""
+        df1 = self.get("2024-01-01", "2024-01-05")
+        df2 = self.get("2024-02-01", "2024-02-03")
+
+        assert len(df1) == 5
+        assert len(df2) == 3
+        assert df2["timestamp"].iloc[0].month == 2
+
+
+class TestSingleFlight:
+    @pytest.fixture(autouse=True)
+    def private_cache(self):
+        CACHE_CONFIG["test_cache"] = TTLCache(maxsize=10, ttl=60)
+
+    def run_concurrently(self, func, workers: int, release: threading.Event):
+        """Runs func from several threads and releases it once all callers joined"""
+        collapsed = cache_stats()["test_cache"]["collapsed"]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(func) for _ in range(workers)]
+            wait_for(
+                lambda: (
+                    cache_stats()["test_cache"]["collapsed"] - collapsed >= workers - 1
+                )
+            )
+            release.set()
+        return futures, cache_stats()["test_cache"]["collapsed"] - collapsed
+
+    def test_concurrent_misses_collapse(self):
+        """测试并发未命中只请求一次上游"""
+        release = threading.Event()
+        calls = []
+
+        @cache("test_cache", key=lambda symbol: f"test_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            calls.append(symbol)
+            release.wait(5)
+            return sample_frame()
+
+        futures, collapsed = self.run_concurrently(lambda: fetch("600000"), 8, release)
+
+        assert len(calls) == 1
+        assert collapsed == 7
+        closes = [f.result()["close"].to_numpy() for f in futures]
+        assert all(np.shares_memory(close, closes[0]) for close in closes)
+
+    def test_exception_is_shared(self):
+        """测试等待中的调用共享异常"""
+        release = threading.Event()
+        calls = []
+
+        @cache("test_cache", key=lambda symbol: f"test_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            calls.append(symbol)
+            release.wait(5)
+            raise ValueError("upstream failed")
+
+        futures, _ = self.run_concurrently(lambda: fetch("600000"), 4, release)
+
+        assert len(calls) == 1
+        for future in futures:
+            with pytest.raises(ValueError, match="upstream failed"):
+                future.result()
+
+
+class SizedTTLCache(TTLCache):
+    """Counts how often the cache is sized"""
+
+    sized = 0
+
+    def __len__(self) -> int:
+        self.sized += 1
+        return super().__len__()
+
+
+class TestExpiryBookkeeping:
+    def test_writes_do_not_size_the_store(self, monkeypatch):
+        """测试写入时不统计缓存条目数，只定期清理过期时间记录"""
+        store = SizedTTLCache(maxsize=10, ttl=60)
+        CACHE_CONFIG["test_cache"] = store
+        cache_module._writes["test_cache"] = 0
+
+        @cache("test_cache", key=lambda i: f"test_{i}")
+        def fetch(i: int) -> pd.DataFrame:
+            return sample_frame()
+
+        monkeypatch.setattr(cache_module, "PRUNE_INTERVAL", 100)
+        for i in range(250):
+            fetch(i)
+
+        assert store.sized == 2
+        assert len(cache_module._expires_at["test_cache"]) == 60
+
+
+class TestByteBudget:
+    def test_evicts_by_bytes(self):
+        """测试按内存占用淘汰最久未使用的缓存"""
+        budget = frame_size(sample_frame(100)) * 2 + frame_size(sample_frame(1))
+        configure_cache("test_cache", ttl=60, max_bytes=budget)
+
+        @cache("test_cache", key=lambda rows: f"test_{rows}")
+        def fetch(rows: int) -> pd.DataFrame:
+            return sample_frame(rows)
+
+        fetch(100)
+        fetch(1)
+        fetch(100)
+        stats = cache_stats()["test_cache"]
+        assert stats["entries"] == 2
+        assert stats["bytes"] == frame_size(sample_frame(100)) + frame_size(
+            sample_frame(1)
+        )
+
+        fetch(1000)
+        store = CACHE_CONFIG["test_cache"]
+        assert "test_1000" not in store  # 超过总容量
+        fetch(150)
+        assert "test_1" not in store
+        assert "test_150" in store
+        assert cache_stats()["test_cache"]["bytes"] <= budget
+
+    def test_reports_bytes_of_count_bounded_cache(self):
+        """测试按条目数限制的缓存也能统计内存占用"""
+        store = TTLCache(maxsize=10, ttl=60)
+        CACHE_CONFIG["test_cache"] = store
+        store["a"] = sample_frame(10)
+
+        stats = cache_stats()["test_cache"]
+        assert stats["entries"] == 1
+        assert stats["bytes"] == frame_size(sample_frame(10))
+
+    def test_configure_requires_size(self):
+        """测试新建缓存时必须指定容量和过期时间"""
+        with pytest.raises(ValueError):
+            configure_cache("test_cache", maxsize=10)
+        with pytest.raises(ValueError):
+            configure_cache("test_cache", ttl=60)
+
+
+class TestStaleWhileRevalidate(HistCacheTests):
+    @pytest.fixture(autouse=True)
+    def stale_cache(self, hist_cache):
+        configure_cache("test_cache", maxsize=10, ttl=0.05, stale_grace=60)
+
+    def test_serves_stale_and_refreshes(self):
+        """测试过期后立即返回旧数据并在后台刷新"""
+        release = threading.Event()
+        versions = iter(range(1, 10))
+        calls = []
+
+        @cache("test_cache", key=lambda symbol: f"test_{symbol}")
+        def fetch(symbol: str) -> int:
+            calls.append(symbol)
+            if len(calls) > 1:
+                release.wait(5)
+            return next(versions)
+
+        assert fetch("600000") == 1
+        time.sleep(0.06)
+        assert fetch("600000") == 1
+        assert fetch("600000") == 1
+        release.set()
+        wait_for(lambda: fetch("600000") == 2)
+        assert len(calls) == 2
+
+    def test_refresh_failure_keeps_stale_value(self):
+        """测试后台刷新失败时保留旧数据"""
+        calls = []
+
+        @cache("test_cache", key=lambda symbol: f"test_{symbol}")
+        def fetch(symbol: str) -> int:
+            calls.append(symbol)
+            if len(calls) > 1:
+                raise ConnectionError("upstream down")
+            return 1
+
+        fetch("600000")
+        time.sleep(0.06)
+        assert fetch("600000") == 1
+        wait_for(lambda: len(calls) == 2)
+        assert fetch("600000") == 1
+
+    def test_range_cache_refreshes_in_background(self, fixed_refresh, advance_clock):
+        """测试历史数据到期刷新时先返回缓存数据"""
+        configure_cache("hist_data_cache", maxsize=10, ttl=3600, stale_grace=60)
+        today = pd.Timestamp.now(tz="Asia/Shanghai").strftime("%Y-%m-%d")
+        self.get("2024-01-01", today)
+        advance_clock(HIST_REFRESH_INTERVAL + 1)
+
+        df = self.get("2024-01-01", today)
+        assert not df.empty
+        wait_for(lambda: len(FakeHistorical.fetched) == 2)
+
+
+def shanghai(value: str) -> float:
+    return pd.Timestamp(value, tz="Asia/Shanghai").timestamp()
+
+
+class TestTradingSessionTTL:
+    policy = TradingSessionTTL(
+        open_ttl=60, holidays=[pd.Timestamp("2024-01-01").date()]
+    )
+
+    def test_in_session(self):
+        """测试交易时段内使用短过期时间"""
+        now = shanghai("2024-01-03 10:00")
+        assert self.policy.in_session(now)
+        assert self.policy.expires_at(now) == now + 60
+
+    def test_lunch_break(self):
+        """测试午间休市缓存到下午开盘"""
+        now = shanghai("2024-01-03 12:00")
+        assert not self.policy.in_session(now)
+        assert self.policy.expires_at(now) == shanghai("2024-01-03 13:00")
+
+    def test_after_close_until_next_open(self):
+        """测试周五收盘后缓存到下周一开盘"""
+        now = shanghai("2024-01-05 15:30")
+        assert self.policy.expires_at(now) == shanghai("2024-01-08 09:15")
+
+    def test_skips_holidays(self):
+        """测试跳过节假日"""
+        now = shanghai("2023-12-30 10:00")
+        assert self.policy.expires_at(now) == shanghai("2024-01-02 09:15")
+
+    def test_closed_ttl_cap(self):
+        """测试非交易时段的最长过期时间"""
+        policy = TradingSessionTTL(open_ttl=60, closed_ttl=3600)
+        now = shanghai("2024-01-05 15:30")
+        assert policy.expires_at(now) == now + 3600
+
+    def test_configure_cache_with_policy(self):
+        """测试为命名空间配置过期策略"""
+        configure_cache("test_cache", maxsize=10, ttl_policy=FixedTTL(60))
+        calls = []
+
+        @cache("test_cache", key=lambda symbol: f"test_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            calls.append(symbol)
+            return sample_frame()
+
+        fetch("600000")
+        fetch("600000")
+        assert calls == ["600000"]
+
+
+class TestIntrospection:
+    @pytest.fixture(autouse=True)
+    def stats_cache(self):
+        configure_cache("stats_cache", maxsize=2, ttl=60)
+
+        @cache("stats_cache", key=lambda symbol: f"test_{symbol}_day")
+        def fetch(symbol: str) -> pd.DataFrame:
+            time.sleep(0.01)
+            return sample_frame()
+
+        self.fetch = fetch
+
+    def test_counts_hits_misses_and_evictions(self):
+        """测试统计命中、未命中和淘汰次数"""
+        before = akshare_one.cache_stats()["stats_cache"]
+        for symbol in ["600000", "600000", "000001", "600036"]:
+            self.fetch(symbol)
+        stats = akshare_one.cache_stats()["stats_cache"]
+
+        assert stats["hits"] - before["hits"] == 1
+        assert stats["misses"] - before["misses"] == 3
+        assert stats["evictions"] == 1
+        assert stats["entries"] == 2
+        assert stats["avg_latency_saved"] >= 0.01
+
+    def test_list_inspect_and_invalidate_by_prefix(self):
+        """测试按前缀列出、查看和清除缓存"""
+        self.fetch("600000")
+        self.fetch("000001")
+
+        keys = akshare_one.cache_keys("test_6", namespace="stats_cache")
+        assert keys == {"stats_cache": ["test_600000_day"]}
+
+        (info,) = akshare_one.inspect_cache("test_600000_day", namespace="stats_cache")
+        assert info["rows"] == 3
+        assert info["bytes"] == frame_size(sample_frame())
+
+        assert akshare_one.invalidate_cache("test_6", namespace="stats_cache") == 1
+        assert list(CACHE_CONFIG["stats_cache"]) == ["test_000001_day"]
+
+    def test_unknown_namespace(self):
+        """测试不存在的缓存名称"""
+        with pytest.raises(KeyError):
+            akshare_one.cache_keys(namespace="missing_cache")
+
+
+class TestZeroCopy:
+    @pytest.fixture(autouse=True)
+    def counted_fetch(self):
+        CACHE_CONFIG["test_cache"] = TTLCache(maxsize=10, ttl=60)
+        self.calls = 0
+
+        @cache("test_cache", key=lambda symbol: f"test_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            self.calls += 1
+            return sample_frame()
+
+        self.fetch = fetch
+
+    def test_hits_share_memory(self):
+        """测试命中时不复制数据"""
+        first = self.fetch("600000")
+        second = self.fetch("600000")
+
+        assert first is not second
+        assert np.shares_memory(first["close"].to_numpy(), second["close"].to_numpy())
+        assert not second["close"].to_numpy().flags.writeable
+
+    def test_mutation_does_not_reach_cache(self):
+        """测试修改返回结果不会影响缓存"""
+        df = self.fetch("600000")
+        df["sma"] = df["close"].rolling(2).mean()
+        with contextlib.suppress(ValueError):  # 未启用 Copy-on-Write 时为只读
+            df.loc[0, "close"] = 99.0
+
+        cached = self.fetch("600000")
+        assert "sma" not in cached.columns
+        pd.testing.assert_frame_equal(cached, sample_frame())
+
+    def test_dropped_columns_do_not_reach_cache(self):
+        """测试原地删除列不会影响缓存"""
+        df = self.fetch("600000")
+        df["sma"] = df["close"].rolling(2).mean()
+        df.drop(columns=["close"], inplace=True)
+
+        pd.testing.assert_frame_equal(self.fetch("600000"), sample_frame())
+        assert self.calls == 1
+
+    def test_assign_does_not_reach_cache(self):
+        """测试通过 assign 添加列不影响缓存"""
+        df = self.fetch("600000").assign(sma=lambda d: d["close"].rolling(2).mean())
+
+        assert "sma" in df.columns
+        pd.testing.assert_frame_equal(self.fetch("600000"), sample_frame())
+
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="需要 pyarrow")
+class TestSnapshot(HistCacheTests):
+    @pytest.fixture(autouse=True)
+    def snapshot(self, hist_cache, tmp_path):
+        CACHE_CONFIG["test_cache"] = TTLCache(maxsize=10, ttl=60)
+        self.path = tmp_path / "snapshot.parquet"
+        self.calls = []
+
+        @cache("test_cache", key=lambda symbol: f"test_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            self.calls.append(symbol)
+            return sample_frame()
+
+        self.fetch = fetch
+
+    def test_roundtrip_with_cache_keys(self):
+        """测试导入快照后直接命中缓存"""
+        self.fetch("600000")
+        assert export_cache(self.path, ["test_cache"]) == 1
+
+        CACHE_CONFIG["test_cache"] = TTLCache(maxsize=10, ttl=60)
+        assert import_cache(self.path) == 1
+        pd.testing.assert_frame_equal(self.fetch("600000"), sample_frame())
+        assert self.calls == ["600000"]
+
+    def test_keeps_remaining_ttl(self, advance_clock):
+        """测试导入的条目保留原来的剩余有效期"""
+        self.fetch("600000")
+        export_cache(self.path, ["test_cache"])
+        CACHE_CONFIG["test_cache"] = TTLCache(maxsize=10, ttl=3600)
+        import_cache(self.path, ["test_cache"])
+
+        advance_clock(61)
+        self.fetch("600000")
+        assert self.calls == ["600000", "600000"]
+
+    def test_range_cache_series(self):
+        """测试历史数据序列导入后可以按子区间命中"""
+        self.get("2024-01-01", "2024-01-31")
+        export_cache(self.path, ["hist_data_cache"])
+
+        CACHE_CONFIG["hist_data_cache"] = TTLCache(maxsize=10, ttl=3600)
+        assert import_cache(self.path) == 1
+        df = self.get("2024-01-10", "2024-01-12")
+        assert len(df) == 3
+        assert len(FakeHistorical.fetched) == 1
+
+
+class TestCacheToggle:
+    def test_disabled_cache_bypasses_store(self):
+        """测试运行时关闭缓存后直接调用函数"""
+        store = TTLCache(maxsize=10, ttl=60)
+        CACHE_CONFIG["test_cache"] = store
+        calls = []
+
+        @cache("test_cache", key=lambda symbol: f"test_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            calls.append(symbol)
+            return sample_frame()
+
+        assert fetch.__name__ == "fetch"
+        set_cache_enabled(False)
+        try:
+            assert not is_cache_enabled()
+            fetch("600000")
+            fetch("600000")
+            assert len(store) == 0
+        finally:
+            set_cache_enabled(True)
+
+        fetch("600000")
+        fetch("600000")
+        assert calls == ["600000"] * 3
+
+
+class TestIncrementalRefresh(HistCacheTests):
+    @pytest.fixture(autouse=True)
+    def dates(self, hist_cache, fixed_refresh):
+        today = pd.Timestamp.now(tz="Asia/Shanghai").normalize()
+        self.today = today.strftime("%Y-%m-%d")
+        self.start = (today - pd.Timedelta(days=5)).strftime("%Y-%m-%d")
+
+    def get_incremental(self, adjust: str = "none") -> pd.DataFrame:
+        provider = IncrementalFakeHistorical(
+            "600000", start_date=self.start, end_date=self.today, adjust=adjust
+        )
+        return provider.get_hist_data()
+
+    def test_refreshes_only_the_tail(self, advance_clock):
+        """测试过期后只增量获取最新数据并覆盖最后一根K线"""
+        IncrementalFakeHistorical.version = 1
+        self.get_incremental()
+        self.get_incremental()
+        assert len(FakeHistorical.fetched) == 1
+
+        IncrementalFakeHistorical.version = 2
+        advance_clock(HIST_REFRESH_INTERVAL + 1)
+        df = self.get_incremental()
+
+        assert FakeHistorical.fetched[-1] == (self.today, self.today)
+        assert len(df) == 6
+        assert df["close"].tolist() == [1, 1, 1, 1, 1, 2]
+
+        self.get_incremental()
+        assert len(FakeHistorical.fetched) == 2
+
+    def test_qfq_refetches_full_span(self, advance_clock):
+        """测试前复权数据过期后完整重新获取"""
+        self.get_incremental(adjust="qfq")
+        advance_clock(HIST_REFRESH_INTERVAL + 1)
+        self.get_incremental(adjust="qfq")
+
+        assert FakeHistorical.fetched[-1] == (self.start, self.today)
+
+
+class TestNegativeCache:
+    @pytest.fixture(autouse=True)
+    def negative_cache(self):
+        configure_cache("negative_cache", maxsize=100, ttl=60)
+
+    def test_empty_result_cached_briefly(self):
+        """测试空结果只缓存较短时间"""
+        configure_cache("negative_cache", no_data_ttl=0.2)
+        calls = []
+
+        @cache("negative_cache", key=lambda symbol: f"empty_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            calls.append(symbol)
+            return pd.DataFrame()
+
+        assert fetch("000000").empty
+        assert fetch("000000").empty
+        assert len(calls) == 1
+        assert "empty_000000" not in CACHE_CONFIG["negative_cache"]
+
+        time.sleep(0.3)
+        fetch("000000")
+        assert len(calls) == 2
+
+    def test_no_data_and_errors_classified(self):
+        """测试区分无数据和临时错误"""
+        configure_cache("negative_cache", no_data_ttl=60, error_ttl=0.2)
+        hits = cache_stats()["negative_cache"]["negative_hits"]
+        calls = []
+
+        @cache("negative_cache", key=lambda symbol: f"fail_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            calls.append(symbol)
+            if symbol == "delisted":
+                try:
+                    raise NoDataError(f"Invalid stock symbol: {symbol}")
+                except NoDataError as e:
+                    raise ValueError(f"Failed to get data for {symbol}") from e
+            raise ConnectionError("connection reset")
+
+        for _ in range(2):
+            with pytest.raises(ValueError, match="delisted") as raised:
+                fetch("delisted")
+            assert isinstance(raised.value.__cause__, NoDataError)
+            with pytest.raises(ConnectionError) as raised:
+                fetch("600000")
+            assert raised.value.__cause__ is None
+        assert calls == ["delisted", "600000"]
+
+        time.sleep(0.3)
+        with pytest.raises(ConnectionError):
+            fetch("600000")
+        with pytest.raises(ValueError):
+            fetch("delisted")
+        assert calls == ["delisted", "600000", "600000"]
+
+        stats = cache_stats()["negative_cache"]
+        assert stats["negative_hits"] - hits == 3
+        assert stats["negative_entries"] == 2
+
+    def test_success_and_invalidate_clear_failures(self):
+        """测试成功结果和手动清除都会移除负缓存"""
+        configure_cache("negative_cache", error_ttl=60)
+        results = [ConnectionError("timeout"), sample_frame()]
+
+        @cache("negative_cache", key=lambda symbol: f"flaky_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with pytest.raises(ConnectionError):
+            fetch("600000")
+        assert invalidate_cache("flaky_", "negative_cache") == 1
+        assert len(fetch("600000")) == 3
+        assert cache_stats()["negative_cache"]["negative_entries"] == 0
+
+    def test_disabled_with_zero_ttl(self):
+        """测试负缓存时间为0时不缓存"""
+        configure_cache("negative_cache", no_data_ttl=0, error_ttl=0)
+        calls = []
+
+        @cache("negative_cache", key=lambda: "nothing")
+        def fetch() -> pd.DataFrame:
+            calls.append(1)
+            return pd.DataFrame()
+
+        fetch()
+        fetch()
+        assert len(calls) == 2
+
+
+class ThreadRecordingCache(TTLCache):
+    """A thread-safe backend that records the threads doing its I/O"""
+
+    thread_safe = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = set()
+
+    def __getitem__(self, key):
+        self.threads.add(threading.get_ident())
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        self.threads.add(threading.get_ident())
+        super().__setitem__(key, value)
+
+
+class TestAsyncCache(HistCacheTests):
+    @pytest.fixture(autouse=True)
+    def private_cache(self, hist_cache):
+        CACHE_CONFIG["test_cache"] = TTLCache(maxsize=10, ttl=60)
+
+    def test_coroutine_results_cached(self):
+        """测试协程函数的结果被缓存"""
+        calls = []
+
+        @cache("test_cache", key=lambda symbol: f"async_{symbol}")
+        async def fetch(symbol: str) -> pd.DataFrame:
+            calls.append(symbol)
+            return sample_frame()
+
+        async def main():
+            first = await fetch("600000")
+            second = await fetch("600000")
+            return first, second
+
+        first, second = asyncio.run(main())
+        assert calls == ["600000"]
+        assert first.equals(second)
+        assert "async_600000" in CACHE_CONFIG["test_cache"]
+
+    def test_concurrent_misses_collapse(self):
+        """测试同一事件循环中的并发未命中只请求一次"""
+        calls = []
+        collapsed = cache_stats()["test_cache"]["collapsed"]
+
+        @cache("test_cache", key=lambda: "async_shared")
+        async def fetch() -> pd.DataFrame:
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return sample_frame()
+
+        async def main():
+            return await asyncio.gather(*(fetch() for _ in range(5)))
+
+        results = asyncio.run(main())
+        assert len(calls) == 1
+        assert all(len(df) == 3 for df in results)
+        assert cache_stats()["test_cache"]["collapsed"] - collapsed == 4
+
+    def test_errors_propagate(self):
+        """测试协程异常传给所有等待者"""
+
+        @cache("test_cache", key=lambda: "async_error")
+        async def fetch() -> pd.DataFrame:
+            await asyncio.sleep(0.01)
+            raise ConnectionError("connection reset")
+
+        async def main():
+            return await asyncio.gather(fetch(), fetch(), return_exceptions=True)
+
+        results = asyncio.run(main())
+        assert all(isinstance(e, ConnectionError) for e in results)
+
+    def test_concurrent_windows_merge(self):
+        """测试同一事件循环中不同区间的并发请求依次合并"""
+
+        async def main():
+            return await asyncio.gather(
+                *(
+                    AsyncFakeHistorical(
+                        "600000", start_date=start, end_date=end
+                    ).aget_hist_data()
+                    for start, end in [
+                        ("2024-01-01", "2024-01-20"),
+                        ("2024-01-10", "2024-01-31"),
+                    ]
+                )
+            )
+
+        first, second = asyncio.run(main())
+        assert (len(first), len(second)) == (20, 22)
+        assert FakeHistorical.fetched == [
+            ("2024-01-01", "2024-01-20"),
+            ("2024-01-21", "2024-01-31"),
+        ]
+
+    def test_range_cache_shared_with_sync(self):
+        """测试异步方法和同步方法共用区间缓存"""
+        self.get("2024-01-10", "2024-01-20")
+        provider = AsyncFakeHistorical(
+            "600000", start_date="2024-01-05", end_date="2024-01-15"
+        )
+
+        df = asyncio.run(provider.aget_hist_data())
+
+        assert FakeHistorical.fetched == [
+            ("2024-01-10", "2024-01-20"),
+            ("2024-01-05", "2024-01-09"),
+        ]
+        assert len(df) == 11
+        assert len(self.get("2024-01-06", "2024-01-18")) == 13
+        assert len(FakeHistorical.fetched) == 2
+
+    def test_backend_io_off_event_loop(self):
+        """测试线程安全的后端在工作线程中读写，不阻塞事件循环"""
+        CACHE_CONFIG["test_cache"] = ThreadRecordingCache(maxsize=10, ttl=60)
+        CACHE_CONFIG["hist_data_cache"] = ThreadRecordingCache(maxsize=10, ttl=60)
+
+        @cache("test_cache", key=lambda symbol: f"async_{symbol}")
+        async def fetch(symbol: str) -> pd.DataFrame:
+            return sample_frame()
+
+        async def main():
+            provider = AsyncFakeHistorical(
+                "600000", start_date="2024-01-01", end_date="2024-01-10"
+            )
+            for _ in range(2):
+                await fetch("600000")
+                await provider.aget_hist_data()
+
+        asyncio.run(main())
+        loop_thread = threading.get_ident()
+        for name in ("test_cache", "hist_data_cache"):
+            threads = CACHE_CONFIG[name].threads
+            assert threads
+            assert loop_thread not in threads
+        assert len(FakeHistorical.fetched) == 1
+
+    def test_sync_and_async_windows_merge(self):
+        """测试同步和异步方法对同一序列的并发加载依次合并"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def key(provider) -> str:
+            return f"mixed_{provider.symbol}"
+
+        class SlowHistorical(FakeHistorical):
+            @range_cache("hist_data_cache", key=key)
+            def get_hist_data(self) -> pd.DataFrame:
+                started.set()
+                release.wait(5)
+                return self.bars()
+
+            @range_cache("hist_data_cache", key=key)
+            async def aget_hist_data(self) -> pd.DataFrame:
+                return self.bars()
+
+        def get(start: str, end: str) -> pd.DataFrame:
+            provider = SlowHistorical("600000", start_date=start, end_date=end)
+            return provider.get_hist_data()
+
+        async def aget(start: str, end: str) -> pd.DataFrame:
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.05, release.set)
+            provider = SlowHistorical("600000", start_date=start, end_date=end)
+            return await provider.aget_hist_data()
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            first = pool.submit(get, "2024-01-01", "2024-01-20")
+            started.wait(5)
+            second = asyncio.run(aget("2024-01-10", "2024-01-31"))
+
+        assert len(first.result()) == 20
+        assert len(second) == 22
+        assert FakeHistorical.fetched == [
+            ("2024-01-01", "2024-01-20"),
+            ("2024-01-21", "2024-01-31"),
+        ]
+        assert len(self.store["mixed_600000"]) == 31
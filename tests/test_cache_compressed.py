@@ -0,0 +1,123 @@
+import pandas as pd
+import pytest
+
+from akshare_one.modules.cache import (
+    CACHE_CONFIG,
+    enable_compressed_cache,
+    frame_size,
+)
+
+from .helpers import sample_frame
+
+try:
+    from akshare_one.modules.cache_backends.compressed import CompressedCache
+except ImportError:  # 需要 akshare-one[arrow]
+    CompressedCache = None
+
+
+@pytest.mark.skipif(CompressedCache is None, reason="需要 pyarrow")
+class TestCompressedCache:
+    def test_idle_entries_compressed(self, timer):
+        """测试闲置条目被压缩，再次访问时解压"""
+        store = CompressedCache(
+            maxsize=10**8, ttl=3600, idle=60, timer=timer, getsizeof=frame_size
+        )
+        df = sample_frame(10_000)
+        df.attrs["symbol"] = "600000"
+        store["key"] = df
+        hot = store.currsize
+
+        timer.now += 61
+        assert store.compact() == 1
+        assert store.currsize < hot / 2
+        assert store.nbytes == store.currsize
+
+        restored = store["key"]
+        pd.testing.assert_frame_equal(restored, df)
+        assert restored.attrs == {"symbol": "600000"}
+        assert store.currsize == frame_size(restored)
+        assert store.compact() == 0  # 刚访问过
+
+    def test_expiry_kept_across_tiers(self, timer):
+        """测试压缩和解压不改变过期时间"""
+        store = CompressedCache(maxsize=10, ttl=100, idle=10, timer=timer)
+        store["key"] = sample_frame()
+        expires = store.expires_at("key")
+
+        timer.now += 40
+        store["other"] = sample_frame()  # 写入时顺带压缩闲置条目
+        assert store._entries["key"].data is not None
+        assert store.expires_at("key") == expires
+        store["key"]
+        assert store.expires_at("key") == expires
+
+        timer.now += 61
+        assert "key" not in store
+        assert store.expire() == ["key"]
+
+    def test_compacts_bounded_batch_per_call(self, timer):
+        """测试每次读写最多压缩 batch 个闲置条目，闲置最久的优先"""
+        store = CompressedCache(maxsize=100, ttl=3600, idle=10, timer=timer, batch=2)
+        for i in range(5):
+            store[f"key_{i}"] = sample_frame()
+            timer.now += 1
+
+        timer.now += 10
+        store["new"] = sample_frame()
+        cold = [key for key, entry in store._entries.items() if entry.data is not None]
+        assert cold == ["key_0", "key_1"]
+
+        store["new"]
+        assert store.compact() == 1
+        assert store._entries["key_4"].data is not None
+
+    def test_compaction_keeps_lru_order(self, timer):
+        """测试压缩不改变条目的访问顺序"""
+        store = CompressedCache(maxsize=3, ttl=3600, idle=10, timer=timer)
+        store["old"] = sample_frame()
+        timer.now += 1
+        store["recent"] = sample_frame()
+        store["old"]
+
+        timer.now += 20
+        assert store.compact() == 2
+        store["a"] = sample_frame()
+        store["b"] = sample_frame()  # 淘汰最久未访问的 recent
+
+        assert list(store) == ["old", "a", "b"]
+        assert store.evictions == 1
+
+    def test_non_frame_values_stay_hot(self, timer):
+        """测试非 DataFrame 的值不压缩"""
+        store = CompressedCache(maxsize=10, ttl=100, idle=10, timer=timer)
+        store["none"] = None
+        store["dict"] = {"a": 1}
+
+        timer.now += 20
+        assert store.compact() == 0
+        assert store["none"] is None
+        assert store["dict"] == {"a": 1}
+
+    def test_unserializable_frames_stay_hot(self, timer):
+        """测试 Arrow 无法序列化的条目保持不压缩，不影响其他键的读写"""
+        store = CompressedCache(maxsize=10, ttl=100, idle=10, timer=timer)
+        mixed = pd.DataFrame({"value": [1, "a", 2.5]})
+        store["mixed"] = mixed
+        store["key"] = sample_frame()
+
+        timer.now += 20
+        store["other"] = sample_frame()
+        pd.testing.assert_frame_equal(store["other"], sample_frame())
+        assert store._entries["mixed"].data is None
+        assert store._entries["key"].data is not None
+        pd.testing.assert_frame_equal(store["mixed"], mixed)
+
+    def test_enable_compressed_cache(self):
+        """测试替换命名空间后保留容量和过期时间"""
+        enable_compressed_cache(["hist_data_cache"], idle=60)
+
+        store = CACHE_CONFIG["hist_data_cache"]
+        assert isinstance(store, CompressedCache)
+        assert store.maxsize == 512 * 1024 * 1024
+        assert store.ttl == 86400
+        assert store.getsizeof(sample_frame()) == frame_size(sample_frame())
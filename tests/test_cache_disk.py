@@ -0,0 +1,197 @@
+import logging
+import threading
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from akshare_one.modules.cache import (
+    CACHE_CONFIG,
+    FixedTTL,
+    ValueTooLargeError,
+    _get_lock,
+    cache,
+    enable_disk_cache,
+    frame_size,
+)
+
+from .helpers import sample_frame
+
+try:
+    import pyarrow.parquet as pq
+
+    from akshare_one.modules.cache_backends.disk import DiskCache
+except ImportError:  # 需要 akshare-one[arrow]
+    DiskCache = None
+
+
+@pytest.mark.skipif(DiskCache is None, reason="需要 pyarrow")
+class TestDiskCache:
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path):
+        self.directory = tmp_path
+
+    def test_roundtrip(self):
+        """测试 DataFrame 写入和读取"""
+        store = DiskCache(self.directory, maxsize=10, ttl=60)
+        df = sample_frame()
+        store["eastmoney_direct_hist_600000"] = df
+
+        pd.testing.assert_frame_equal(store["eastmoney_direct_hist_600000"], df)
+        assert "eastmoney_direct_hist_600000" in store
+        assert list(store) == ["eastmoney_direct_hist_600000"]
+        assert store.currsize == 1
+
+    def test_survives_restart(self):
+        """测试缓存在新实例中仍然可用"""
+        DiskCache(self.directory, maxsize=10, ttl=60)["key"] = sample_frame()
+
+        reopened = DiskCache(self.directory, maxsize=10, ttl=60)
+        pd.testing.assert_frame_equal(reopened["key"], sample_frame())
+
+    def test_expiry(self, timer):
+        """测试缓存过期"""
+        store = DiskCache(self.directory, maxsize=10, ttl=60, timer=timer)
+        store["key"] = sample_frame()
+
+        timer.now += 61
+        with pytest.raises(KeyError):
+            store["key"]
+        assert len(list(self.directory.glob("*.parquet"))) == 0
+
+    def test_ttu(self, timer):
+        """测试按条目计算过期时间"""
+        store = DiskCache(
+            self.directory, maxsize=10, ttl=0, timer=timer, ttu=FixedTTL(60)
+        )
+        store["key"] = sample_frame()
+
+        timer.now += 59
+        assert "key" in store
+        timer.now += 2
+        assert "key" not in store
+
+    def test_maxsize_eviction(self):
+        """测试超过容量时淘汰最旧的缓存"""
+        store = DiskCache(self.directory, maxsize=2, ttl=60)
+        for i in range(3):
+            store[f"key_{i}"] = sample_frame()
+
+        assert store.currsize == 2
+        assert "key_2" in store
+
+    def test_writes_do_not_scan_directory(self):
+        """测试写入、淘汰和统计大小不扫描缓存目录"""
+        store = DiskCache(self.directory, maxsize=5, ttl=60)
+        for i in range(5):
+            store[f"key_{i}"] = sample_frame()
+
+        with (
+            mock.patch("pyarrow.parquet.read_schema", side_effect=AssertionError),
+            mock.patch.object(Path, "glob", side_effect=AssertionError),
+        ):
+            store["key_5"] = sample_frame()
+            assert store.currsize == 5
+            assert len(store) == 5
+        assert "key_0" not in store
+        assert store.evictions == 1
+
+    def test_sees_entries_of_other_instances(self):
+        """测试可以读取其他实例写入的条目"""
+        store = DiskCache(self.directory, maxsize=10, ttl=60)
+        DiskCache(self.directory, maxsize=10, ttl=60)["key"] = sample_frame()
+
+        assert "key" in store
+        pd.testing.assert_frame_equal(store["key"], sample_frame())
+        assert store.currsize == 1
+
+    def test_byte_budget(self):
+        """测试按内存占用淘汰磁盘缓存"""
+        size = frame_size(sample_frame())
+        store = DiskCache(
+            self.directory, maxsize=size * 2, ttl=60, getsizeof=frame_size
+        )
+        for i in range(3):
+            store[f"key_{i}"] = sample_frame()
+
+        assert store.currsize == size * 2
+        assert "key_0" not in store
+        assert store.nbytes > 0
+        with pytest.raises(ValueTooLargeError):
+            store["big"] = sample_frame(100)
+
+    def test_rejects_non_dataframe(self):
+        """测试非 DataFrame 值"""
+        store = DiskCache(self.directory, maxsize=10, ttl=60)
+        with pytest.raises(TypeError):
+            store["key"] = {"a": 1}
+
+    def test_enable_disk_cache(self):
+        """测试替换命名空间后缓存装饰器读写磁盘"""
+        enable_disk_cache(self.directory, namespaces=["info_cache"])
+        assert isinstance(CACHE_CONFIG["info_cache"], DiskCache)
+
+        calls = []
+
+        @cache("info_cache", key=lambda symbol: f"test_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            calls.append(symbol)
+            return sample_frame()
+
+        fetch("600000")
+        fetch("600000")
+        assert calls == ["600000"]
+        assert (self.directory / "info_cache").is_dir()
+
+    def test_unserializable_results_logged(self, caplog):
+        """测试无法序列化的结果照常返回，不缓存并记录警告，过大的结果直接跳过"""
+        enable_disk_cache(self.directory, namespaces=["hist_data_cache"])
+        CACHE_CONFIG["hist_data_cache"].maxsize = frame_size(sample_frame(10))
+        calls = []
+
+        @cache("hist_data_cache", key=lambda name: f"test_{name}")
+        def fetch(name: str) -> pd.DataFrame:
+            calls.append(name)
+            if name == "mixed":
+                return pd.DataFrame({"value": [1, "a", 2.5]})
+            return sample_frame(100)
+
+        caplog.set_level(logging.WARNING, "akshare_one.modules.cache")
+        assert len(fetch("mixed")) == 3
+        assert "Cannot cache test_mixed" in caplog.records[0].getMessage()
+        caplog.clear()
+        assert len(fetch("big")) == 100
+        assert caplog.records == []
+
+        fetch("mixed")
+        fetch("big")
+        assert calls == ["mixed", "big"] * 2
+
+    def test_writes_outside_namespace_lock(self):
+        """测试写入磁盘时不持有命名空间锁"""
+        enable_disk_cache(self.directory, namespaces=["info_cache"])
+        writing = threading.Event()
+        release = threading.Event()
+
+        @cache("info_cache", key=lambda symbol: f"test_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            return sample_frame()
+
+        write_table = pq.write_table
+
+        def slow_write(*args, **kwargs):
+            writing.set()
+            release.wait(5)
+            return write_table(*args, **kwargs)
+
+        with mock.patch.object(pq, "write_table", slow_write):
+            writer = threading.Thread(target=fetch, args=("600000",))
+            writer.start()
+            assert writing.wait(5)
+            lock = _get_lock("info_cache")
+            assert lock.acquire(timeout=1)
+            lock.release()
+            release.set()
+            writer.join()
+        assert "test_600000" in CACHE_CONFIG["info_cache"]
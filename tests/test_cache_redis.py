@@ -0,0 +1,192 @@
+import fnmatch
+import threading
+
+import pandas as pd
+import pytest
+
+from akshare_one.modules.cache import (
+    CACHE_CONFIG,
+    FixedTTL,
+    _get_lock,
+    cache,
+    enable_redis_cache,
+    frame_size,
+)
+
+from .helpers import FakeTimer, sample_frame
+
+try:
+    from akshare_one.modules.cache_backends.redis import RedisCache
+except ImportError:  # 需要 akshare-one[arrow]
+    RedisCache = None
+
+
+class FakeRedis:
+    """In-process stand-in for the redis.Redis hash and expiry commands"""
+
+    def __init__(self, timer: FakeTimer) -> None:
+        self.timer = timer
+        self.hashes: dict[str, dict[str, bytes]] = {}
+        self.expiry: dict[str, float] = {}
+
+    def _live(self, name: str) -> dict[str, bytes] | None:
+        if name in self.expiry and self.expiry[name] <= self.timer():
+            del self.hashes[name], self.expiry[name]
+        return self.hashes.get(name)
+
+    def hset(self, name: str, mapping: dict[str, object]) -> int:
+        entry = self.hashes.setdefault(name, {})
+        for field, value in mapping.items():
+            entry[field] = value if isinstance(value, bytes) else str(value).encode()
+        return len(mapping)
+
+    def hget(self, name: str, field: str) -> bytes | None:
+        entry = self._live(name)
+        return None if entry is None else entry.get(field)
+
+    def hstrlen(self, name: str, field: str) -> int:
+        return len(self.hget(name, field) or b"")
+
+    def pexpire(self, name: str, ms: int) -> bool:
+        self.expiry[name] = self.timer() + ms / 1000
+        return name in self.hashes
+
+    def pttl(self, name: str) -> int:
+        if self._live(name) is None:
+            return -2
+        if name not in self.expiry:
+            return -1
+        return int((self.expiry[name] - self.timer()) * 1000)
+
+    def exists(self, *names: str) -> int:
+        return sum(self._live(name) is not None for name in names)
+
+    def delete(self, *names: str) -> int:
+        deleted = self.exists(*names)
+        for name in names:
+            self.hashes.pop(name, None)
+            self.expiry.pop(name, None)
+        return deleted
+
+    def scan_iter(self, match: str = "*") -> list[bytes]:
+        names = [name for name in list(self.hashes) if self._live(name) is not None]
+        return [name.encode() for name in names if fnmatch.fnmatchcase(name, match)]
+
+    def pipeline(self) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client: FakeRedis) -> None:
+        self.client = client
+        self.calls: list[tuple[str, tuple[object, ...], dict[str, object]]] = []
+
+    def __getattr__(self, command: str):
+        def queue(*args, **kwargs):
+            self.calls.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list[object]:
+        return [
+            getattr(self.client, command)(*args, **kwargs)
+            for command, args, kwargs in self.calls
+        ]
+
+
+@pytest.mark.skipif(RedisCache is None, reason="需要 pyarrow")
+class TestRedisCache:
+    @pytest.fixture(autouse=True)
+    def fake_redis(self, timer):
+        self.client = FakeRedis(timer)
+
+    def test_shared_between_clients(self):
+        """测试使用同一 Redis 的实例共享条目"""
+        store = RedisCache(self.client, "test:", maxsize=10, ttl=60)
+        df = sample_frame()
+        df.attrs["symbol"] = "600000"
+        store["key"] = df
+
+        other = RedisCache(self.client, "test:", maxsize=10, ttl=60)
+        pd.testing.assert_frame_equal(other["key"], df)
+        assert other["key"].attrs == {"symbol": "600000"}
+        assert list(other) == ["key"]
+        assert other.currsize == 1
+        assert other.nbytes > 0
+        assert list(RedisCache(self.client, "other:", maxsize=10, ttl=60)) == []
+
+    def test_expiry(self, timer):
+        """测试通过 Redis 键过期清除条目"""
+        store = RedisCache(
+            self.client, "test:", maxsize=10, ttl=0, timer=timer, ttu=FixedTTL(60)
+        )
+        store["key"] = sample_frame()
+        assert store.expires_at("key") == timer.now + 60
+
+        timer.now += 61
+        assert "key" not in store
+        with pytest.raises(KeyError):
+            store["key"]
+
+    def test_delete_and_size_limit(self):
+        """测试删除条目和拒绝超过容量的值"""
+        store = RedisCache(
+            self.client, "test:", maxsize=1000, ttl=60, getsizeof=frame_size
+        )
+        store["key"] = sample_frame()
+        del store["key"]
+        assert len(store) == 0
+        with pytest.raises(KeyError):
+            del store["key"]
+        with pytest.raises(ValueError):
+            store["large"] = sample_frame(1000)
+        with pytest.raises(TypeError):
+            store["text"] = "not a frame"
+
+    def test_enable_redis_cache(self):
+        """测试替换命名空间后缓存装饰器读写 Redis"""
+        enable_redis_cache(namespaces=["info_cache"], client=self.client)
+        assert isinstance(CACHE_CONFIG["info_cache"], RedisCache)
+
+        calls = []
+
+        @cache("info_cache", key=lambda symbol: f"test_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            calls.append(symbol)
+            return sample_frame()
+
+        fetch("600000")
+        fetch("600000")
+        assert calls == ["600000"]
+        assert self.client.scan_iter() == [b"akshare_one:info_cache:test_600000"]
+
+    def test_reads_outside_namespace_lock(self):
+        """测试读取 Redis 时不持有命名空间锁"""
+        enable_redis_cache(namespaces=["info_cache"], client=self.client)
+
+        @cache("info_cache", key=lambda symbol: f"test_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            return sample_frame()
+
+        fetch("600000")
+        reading = threading.Event()
+        release = threading.Event()
+        hget = self.client.hget
+
+        def slow_hget(name: str, field: str) -> bytes | None:
+            reading.set()
+            release.wait(5)
+            return hget(name, field)
+
+        self.client.hget = slow_hget
+        reader = threading.Thread(target=fetch, args=("600000",))
+        reader.start()
+        try:
+            assert reading.wait(5)
+            lock = _get_lock("info_cache")
+            assert lock.acquire(timeout=1)
+            lock.release()
+        finally:
+            release.set()
+            reader.join()
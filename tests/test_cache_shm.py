@@ -0,0 +1,104 @@
+import multiprocessing
+import uuid
+
+import pandas as pd
+import pytest
+
+from akshare_one.modules.cache import (
+    CACHE_CONFIG,
+    cache,
+    enable_shared_memory_cache,
+)
+
+from .helpers import sample_frame
+
+try:
+    from akshare_one.modules.cache_backends.shm import SharedMemoryCache
+except ImportError:  # 需要 akshare-one[arrow] 和 POSIX 系统
+    SharedMemoryCache = None
+
+
+def write_shared(name: str) -> None:
+    """Runs in a spawned process"""
+    SharedMemoryCache(name, maxsize=10, ttl=60)["key"] = sample_frame()
+
+
+@pytest.mark.skipif(SharedMemoryCache is None, reason="需要 pyarrow 和 fcntl")
+class TestSharedMemoryCache:
+    @pytest.fixture(autouse=True)
+    def stores(self):
+        self.stores: list[SharedMemoryCache] = []
+        yield
+        for store in self.stores:
+            store.destroy()
+
+    def shared_cache(self, name: str | None = None, **kwargs) -> "SharedMemoryCache":
+        store = SharedMemoryCache(
+            name or f"test_{uuid.uuid4().hex}", **{"maxsize": 10, "ttl": 60, **kwargs}
+        )
+        self.stores.append(store)
+        return store
+
+    def test_shared_between_instances(self):
+        """测试同名缓存共享条目"""
+        store = self.shared_cache()
+        store["key"] = sample_frame()
+
+        other = self.shared_cache(store.name)
+        pd.testing.assert_frame_equal(other["key"], sample_frame())
+        assert list(other) == ["key"]
+        assert not other["key"]["close"].to_numpy().flags.writeable
+
+    def test_shared_between_processes(self):
+        """测试其他进程写入的条目可以直接读取"""
+        store = self.shared_cache()
+        process = multiprocessing.get_context("spawn").Process(
+            target=write_shared, args=(store.name,)
+        )
+        process.start()
+        process.join(30)
+
+        assert process.exitcode == 0
+        pd.testing.assert_frame_equal(store["key"], sample_frame())
+
+    def test_replace_and_delete(self):
+        """测试覆盖和删除条目"""
+        store = self.shared_cache()
+        store["key"] = sample_frame(3)
+        old = store["key"]
+        store["key"] = sample_frame(5)
+
+        assert len(store["key"]) == 5
+        assert len(old) == 3  # 已返回的 DataFrame 仍然有效
+        del store["key"]
+        assert "key" not in store
+
+    def test_expiry_and_eviction(self, timer):
+        """测试过期和超过容量时淘汰最旧的条目"""
+        store = self.shared_cache(maxsize=2, timer=timer)
+        for i in range(3):
+            store[f"key_{i}"] = sample_frame()
+        assert list(store) == ["key_1", "key_2"]
+        assert store.evictions == 1
+
+        timer.now += 61
+        assert "key_2" not in store
+        assert store.expire() == ["key_1", "key_2"]
+
+    def test_enable_shared_memory_cache(self):
+        """测试替换命名空间后缓存装饰器读写共享内存"""
+        enable_shared_memory_cache(["info_cache"], prefix=f"test_{uuid.uuid4().hex}")
+        store = CACHE_CONFIG["info_cache"]
+        assert isinstance(store, SharedMemoryCache)
+        self.stores.append(store)
+
+        calls = []
+
+        @cache("info_cache", key=lambda symbol: f"test_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            calls.append(symbol)
+            return sample_frame()
+
+        fetch("600000")
+        fetch("600000")
+        assert calls == ["600000"]
@@ -0,0 +1,246 @@
+import asyncio
+
+import pytest
+import requests
+
+from akshare_one.eastmoney import client as client_module
+from akshare_one.eastmoney.async_client import AsyncEastMoneyClient
+from akshare_one.eastmoney.client import EastMoneyClient, configure_retries
+from akshare_one.modules import circuit
+from akshare_one.modules.cache import NoDataError
+from akshare_one.modules.circuit import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    circuit_breaker,
+    circuit_stats,
+    configure_circuit_breaker,
+    reset_circuit,
+    upstream_call,
+)
+
+from .helpers import FakeResponse, ScriptedSession
+
+
+@pytest.fixture(autouse=True)
+def breakers(monkeypatch):
+    """Gives each test fresh breakers and retries without waiting"""
+    monkeypatch.setattr(circuit, "_breakers", {})
+    monkeypatch.setattr(circuit, "_host_settings", {})
+    monkeypatch.setattr(
+        circuit, "CIRCUIT_BREAKER_SETTINGS", dict(circuit.CIRCUIT_BREAKER_SETTINGS)
+    )
+    for name in ("RETRY_ATTEMPTS", "RETRY_BACKOFF", "RETRY_MAX_BACKOFF"):
+        monkeypatch.setattr(client_module, name, getattr(client_module, name))
+    configure_retries(attempts=1, backoff=0)
+
+
+def fail(breaker: CircuitBreaker, times: int) -> None:
+    for _ in range(times):
+        breaker.allow()
+        breaker.record(False)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self, timer):
+        """测试连续失败后断开并快速失败"""
+        breaker = CircuitBreaker("example.com", failure_threshold=3, timer=timer)
+
+        fail(breaker, 2)
+        breaker.allow()
+        breaker.record(True)
+        fail(breaker, 2)
+        assert breaker.state == CLOSED
+
+        fail(breaker, 1)
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError) as info:
+            breaker.allow()
+        assert info.value.retry_after == pytest.approx(30)
+        assert breaker.stats()["rejected"] == 1
+
+    def test_opens_on_error_rate(self, timer):
+        """测试统计窗口内错误率过高时断开"""
+        breaker = CircuitBreaker(
+            "example.com",
+            failure_threshold=100,
+            error_rate=0.5,
+            min_requests=10,
+            window=60,
+            timer=timer,
+        )
+
+        for i in range(9):
+            breaker.allow()
+            breaker.record(i % 2 == 0)
+        assert breaker.state == CLOSED
+
+        breaker.allow()
+        breaker.record(False)
+        assert breaker.state == OPEN
+
+    def test_old_outcomes_leave_window(self, timer):
+        """测试超出统计窗口的结果不计入错误率"""
+        breaker = CircuitBreaker(
+            "example.com", failure_threshold=100, min_requests=4, timer=timer
+        )
+        fail(breaker, 3)
+        timer.now += 61
+
+        fail(breaker, 1)
+        assert breaker.state == CLOSED
+        assert breaker.stats()["requests"] == 1
+
+    def test_half_open_probes(self, timer):
+        """测试冷却后放行试探请求，成功则恢复，失败则重新断开"""
+        breaker = CircuitBreaker(
+            "example.com", failure_threshold=1, cooldown=10, timer=timer
+        )
+        fail(breaker, 1)
+
+        timer.now += 10
+        assert breaker.state == HALF_OPEN
+        breaker.allow()
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+        breaker.record(False)
+        assert breaker.state == OPEN
+
+        timer.now += 10
+        breaker.allow()
+        breaker.record(True)
+        assert breaker.state == CLOSED
+        assert breaker.stats()["times_opened"] == 2
+
+    def test_cancelled_probe_released(self, timer):
+        """测试被取消的试探请求释放名额"""
+        breaker = CircuitBreaker(
+            "example.com", failure_threshold=1, cooldown=10, timer=timer
+        )
+        fail(breaker, 1)
+        timer.now += 10
+
+        breaker.allow()
+        breaker.record(None)
+        breaker.allow()
+        assert breaker.state == HALF_OPEN
+
+
+def refused(times: int) -> ScriptedSession:
+    return ScriptedSession(*[requests.ConnectionError("connection refused")] * times)
+
+
+def answered(times: int, status_code: int = 200, payload=None) -> ScriptedSession:
+    payload = {"rc": 0, "data": None} if payload is None else payload
+    return ScriptedSession(*[FakeResponse(payload, status_code)] * times)
+
+
+class TestUpstreamBreakers:
+    def fetch(self, session):
+        return EastMoneyClient(session=session).fetch_historical_klines(
+            "600000", "101", "0", "20240101", "20240131"
+        )
+
+    def test_client_fails_fast_when_open(self):
+        """测试上游故障时直连客户端快速失败"""
+        configure_circuit_breaker(failure_threshold=3)
+        session = refused(3)
+
+        for _ in range(3):
+            with pytest.raises(requests.ConnectionError):
+                self.fetch(session)
+        with pytest.raises(CircuitOpenError):
+            self.fetch(session)
+
+        assert session.calls == 3
+        assert circuit_stats()["push2his.eastmoney.com"]["state"] == OPEN
+
+        reset_circuit("push2his.eastmoney.com")
+        assert self.fetch(answered(1)) == {"rc": 0, "data": None}
+
+    def test_client_errors_keep_circuit_closed(self):
+        """测试 4xx 错误不会使断路器断开"""
+        configure_circuit_breaker(failure_threshold=2)
+        session = answered(3, status_code=404)
+
+        for _ in range(3):
+            with pytest.raises(requests.HTTPError):
+                self.fetch(session)
+        assert circuit_breaker("push2his.eastmoney.com").state == CLOSED
+
+    def test_unparseable_responses_keep_circuit_closed(self):
+        """测试无法解析的响应与 akshare 调用一样不计入失败"""
+        configure_circuit_breaker(failure_threshold=2)
+        session = answered(3, payload=b"<html>")
+
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                self.fetch(session)
+        assert session.calls == 3
+        assert circuit_breaker("push2his.eastmoney.com").state == CLOSED
+
+    def test_async_client_shares_breaker(self):
+        """测试异步客户端与同步客户端共用断路器"""
+        configure_circuit_breaker(failure_threshold=1)
+        with pytest.raises(requests.ConnectionError):
+            self.fetch(refused(1))
+
+        client = AsyncEastMoneyClient(session=object())
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(client.fetch_historical_klines("600000", "101", "0", "", ""))
+
+    def test_akshare_calls_guarded(self):
+        """测试通过 akshare 的调用同样受断路器保护"""
+        configure_circuit_breaker("finance.sina.com.cn", failure_threshold=2)
+        calls = []
+
+        def fetch():
+            with upstream_call("finance.sina.com.cn"):
+                calls.append(1)
+                raise requests.ConnectionError("connection reset")
+
+        for _ in range(2):
+            with pytest.raises(requests.ConnectionError):
+                fetch()
+        with pytest.raises(CircuitOpenError):
+            fetch()
+
+        assert len(calls) == 2
+        assert circuit_breaker("push2.eastmoney.com").failure_threshold == 5
+
+    def test_invalid_symbols_keep_circuit_closed(self):
+        """测试无效代码等数据错误不会使断路器断开"""
+        configure_circuit_breaker("finance.sina.com.cn", failure_threshold=2)
+        not_found = requests.Response()
+        not_found.status_code = 404
+        errors = [
+            KeyError("data"),
+            ValueError("invalid symbol"),
+            NoDataError("no data"),
+            requests.HTTPError(response=not_found),
+        ]
+
+        for error in errors * 3:
+            with pytest.raises(type(error)), upstream_call("finance.sina.com.cn"):
+                raise error
+
+        breaker = circuit_breaker("finance.sina.com.cn")
+        assert breaker.state == CLOSED
+        assert breaker.stats()["consecutive_failures"] == 0
+
+    def test_server_errors_open_circuit(self):
+        """测试超时和 5xx 错误使断路器断开"""
+        configure_circuit_breaker("finance.sina.com.cn", failure_threshold=2)
+        bad_gateway = requests.Response()
+        bad_gateway.status_code = 502
+
+        for error in (
+            requests.Timeout("timed out"),
+            requests.HTTPError(response=bad_gateway),
+        ):
+            with pytest.raises(type(error)), upstream_call("finance.sina.com.cn"):
+                raise error
+
+        assert circuit_breaker("finance.sina.com.cn").state == OPEN
@@ -0,0 +1,534 @@
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+import requests
+from cachetools import TTLCache
+
+import akshare_one
+from akshare_one.eastmoney import client as client_module
+from akshare_one.eastmoney import decoding, utils
+from akshare_one.eastmoney.async_client import AsyncEastMoneyClient
+from akshare_one.eastmoney.client import (
+    EastMoneyClient,
+    configure_http_pool,
+    configure_retries,
+    get_session,
+    retry_delay,
+    retry_stats,
+)
+from akshare_one.eastmoney.decoding import KlineDecoder, loads
+from akshare_one.eastmoney.utils import (
+    KLINE_COLUMNS,
+    parse_kline_data,
+    resample_historical_data,
+)
+from akshare_one.modules import cache as cache_module
+from akshare_one.modules import circuit, ratelimit
+from akshare_one.modules.cache import CACHE_CONFIG
+from akshare_one.modules.financial.eastmoney_direct import (
+    EastMoneyDirectFinancialReport,
+)
+from akshare_one.modules.historical.eastmoney_direct import EastMoneyDirectHistorical
+
+from .helpers import FakeResponse, ScriptedSession
+
+
+class FakeAsyncResponse:
+    status = 200
+    headers: dict[str, str] = {}
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self) -> None:
+        pass
+
+    async def read(self):
+        await asyncio.sleep(0.01)
+        return json.dumps(self.payload).encode("utf-8")
+
+
+class FakeAsyncSession:
+    """Records requests and answers them like an aiohttp session"""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = []
+        self.running = 0
+        self.peak = 0
+
+    def get(self, url, params=None):
+        self.calls.append((url, params))
+        session = self
+
+        class Response(FakeAsyncResponse):
+            async def read(self):
+                session.running += 1
+                session.peak = max(session.peak, session.running)
+                try:
+                    return await super().read()
+                finally:
+                    session.running -= 1
+
+        return Response(self.payload)
+
+
+KLINES = {
+    "rc": 0,
+    "data": {
+        "klines": [
+            "2024-01-02,10.0,10.5,10.8,9.9,1000,10500.0,9.0,5.0,0.5,1.2",
+            "2024-01-03,10.5,10.2,10.6,10.1,800,8200.0,4.8,-2.9,-0.3,0.9",
+        ]
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def unthrottled(monkeypatch):
+    """Runs without rate limits and with fresh circuit breakers"""
+    monkeypatch.setattr(ratelimit, "RATE_LIMITS", {})
+    monkeypatch.setattr(ratelimit, "_buckets", {})
+    monkeypatch.setattr(circuit, "_breakers", {})
+
+
+@pytest.fixture
+def http_pool(monkeypatch):
+    """Restores the shared session and its settings after a test"""
+    monkeypatch.setattr(client_module, "_session", None)
+    monkeypatch.setattr(
+        client_module, "HTTP_POOL_SIZES", dict(client_module.HTTP_POOL_SIZES)
+    )
+    monkeypatch.setattr(
+        client_module, "DEFAULT_POOL_SIZE", client_module.DEFAULT_POOL_SIZE
+    )
+    monkeypatch.setattr(client_module, "HTTP_TIMEOUT", client_module.HTTP_TIMEOUT)
+
+
+@pytest.fixture
+def retries(monkeypatch):
+    """Retries up to four times without waiting"""
+    for name in ("RETRY_ATTEMPTS", "RETRY_BACKOFF", "RETRY_MAX_BACKOFF"):
+        monkeypatch.setattr(client_module, name, getattr(client_module, name))
+    configure_retries(attempts=4, backoff=0)
+
+
+def retry_counts(host: str) -> dict[str, int]:
+    return retry_stats().get(host, dict.fromkeys(["retries", "exhausted"], 0))
+
+
+class TestPooledSession:
+    def test_shared_by_providers(self, http_pool):
+        """测试所有直连数据源共用同一个连接池"""
+        hist = EastMoneyDirectHistorical(symbol="600000")
+        financial = EastMoneyDirectFinancialReport("600000")
+
+        assert hist.client.session is get_session()
+        assert financial.client.session is get_session()
+        assert EastMoneyClient().session is get_session()
+
+    def test_per_host_pool_sizes(self, http_pool):
+        """测试按主机配置连接池大小"""
+        configure_http_pool(
+            pool_sizes={"push2his.eastmoney.com": 64}, default_pool_size=4
+        )
+        session = get_session()
+
+        kline = session.get_adapter("https://push2his.eastmoney.com/api/qt/")
+        other = session.get_adapter("https://example.com/")
+        assert kline._pool_maxsize == 64
+        assert other._pool_maxsize == 4
+
+    def test_configure_replaces_session(self, http_pool):
+        """测试重新配置后使用新的连接池和超时"""
+        old = get_session()
+        configure_http_pool(timeout=5)
+
+        assert get_session() is not old
+        assert client_module.HTTP_TIMEOUT == (5, 5)
+
+    def test_requests_use_timeout(self, http_pool, monkeypatch):
+        """测试请求使用共享会话和统一超时"""
+        calls = []
+
+        def fake_get(url, params=None, timeout=None, stream=False):
+            calls.append((url, params, timeout))
+            return FakeResponse({"result": None})
+
+        monkeypatch.setattr(get_session(), "get", fake_get)
+        EastMoneyClient().fetch_financial_report(
+            "RPT_DMSK_FN_BALANCE", "600000", ["REPORT_DATE", "TOTAL_ASSETS"]
+        )
+
+        url, params, timeout = calls[0]
+        assert url.startswith("https://datacenter-web.eastmoney.com/")
+        assert params["filter"] == '(SECURITY_CODE="600000")'
+        assert params["columns"] == "REPORT_DATE,TOTAL_ASSETS"
+        assert timeout == client_module.HTTP_TIMEOUT
+
+
+class TestRetries:
+    HOST = "push2his.eastmoney.com"
+
+    def fetch(self, session):
+        return EastMoneyClient(session=session).fetch_historical_klines(
+            "600000", "101", "0", "20240101", "20240131"
+        )
+
+    def test_transient_failures_retried(self, retries):
+        """测试网络错误、5xx 和 rc 非零的响应会重试"""
+        before = retry_counts(self.HOST)
+        session = ScriptedSession(
+            requests.ConnectionError("connection reset"),
+            FakeResponse({}, status_code=503),
+            FakeResponse({"rc": 102, "data": None}),
+            FakeResponse(KLINES),
+        )
+
+        assert self.fetch(session) == KLINES
+        assert session.calls == 4
+        after = retry_stats()[self.HOST]
+        assert after["retries"] - before["retries"] == 3
+        assert after["network"] >= 1 and after["status"] >= 1 and after["rc"] >= 1
+
+    def test_client_errors_not_retried(self, retries):
+        """测试 404 等请求错误不重试"""
+        session = ScriptedSession(FakeResponse({}, status_code=404))
+
+        with pytest.raises(requests.HTTPError):
+            self.fetch(session)
+        assert session.calls == 1
+
+    def test_gives_up_after_attempts(self, retries):
+        """测试超过最大次数后抛出最后的错误"""
+        configure_retries(attempts=2)
+        before = retry_counts(self.HOST)
+        session = ScriptedSession(*[FakeResponse({}, status_code=500)] * 2)
+
+        with pytest.raises(requests.HTTPError, match="500"):
+            self.fetch(session)
+        assert session.calls == 2
+        assert retry_stats()[self.HOST]["exhausted"] - before["exhausted"] == 1
+
+        # rc 非零的最终结果交给调用方处理
+        session = ScriptedSession(*[FakeResponse({"rc": 102, "data": None})] * 2)
+        assert self.fetch(session)["rc"] == 102
+
+    def test_backoff_capped_with_jitter(self, retries):
+        """测试退避时间指数增长、有上限并遵守 Retry-After"""
+        configure_retries(backoff=1, max_backoff=4)
+
+        delays = [retry_delay(retry) for retry in range(1, 8) for _ in range(20)]
+        assert all(0 <= delay <= 4 for delay in delays)
+        assert len(set(delays)) > 1
+        assert all(0 <= retry_delay(1) <= 1 for _ in range(20))
+        assert retry_delay(1, retry_after=3) >= 3
+        assert retry_delay(1, retry_after=60) == 4
+
+    def test_async_retries(self, retries):
+        """测试异步客户端同样重试"""
+
+        class Unavailable(FakeAsyncResponse):
+            status = 503
+
+        session = FakeAsyncSession(KLINES)
+        get = session.get
+        responses = iter([Unavailable({}), None])
+        session.get = lambda url, params=None: next(responses) or get(url, params)
+
+        client = AsyncEastMoneyClient(session=session)
+        result = asyncio.run(
+            client.fetch_historical_klines("600000", "101", "0", "20240101", "20240131")
+        )
+
+        assert result == KLINES
+
+
+class TestDecoding:
+    def fetch(self, session, chunk_rows):
+        return list(
+            EastMoneyClient(session=session).stream_historical_klines(
+                "600000", "101", "0", "20240101", "20240131", chunk_rows=chunk_rows
+            )
+        )
+
+    @pytest.mark.parametrize("size", [1, 7, 64, 4096])
+    def test_incremental_decode(self, size):
+        """测试按任意大小的字节块增量解码K线"""
+        content = json.dumps({**KLINES, "rt": 17}, separators=(",", ":")).encode()
+        decoder = KlineDecoder()
+        klines = []
+        for start in range(0, len(content), size):
+            klines.extend(decoder.feed(content[start : start + size]))
+
+        assert klines == KLINES["data"]["klines"]
+        assert decoder.envelope() == {"rc": 0, "data": {"klines": []}, "rt": 17}
+
+    def test_stream_in_chunks(self, retries):
+        """测试流式读取按批返回，rc 非零时重试"""
+        session = ScriptedSession(
+            FakeResponse({"rc": 102, "data": None}), FakeResponse(KLINES)
+        )
+
+        chunks = self.fetch(session, chunk_rows=1)
+
+        assert chunks == [[line] for line in KLINES["data"]["klines"]]
+        assert session.calls == 2
+
+    def test_stream_without_marker(self):
+        """测试无法增量解析的响应整体解码后分批返回"""
+        session = ScriptedSession(FakeResponse(KLINES))
+
+        # json.dumps 默认在冒号后加空格
+        assert self.fetch(session, chunk_rows=10) == [KLINES["data"]["klines"]]
+        assert self.fetch(ScriptedSession(FakeResponse({"rc": 0})), 10) == []
+
+    def test_stdlib_fallback(self, monkeypatch):
+        """测试未安装 orjson 时使用标准库解码"""
+        monkeypatch.setattr(decoding, "ORJSON_AVAILABLE", False)
+        assert loads(b'{"rc":0,"data":[1.5,"a"]}') == {"rc": 0, "data": [1.5, "a"]}
+
+
+class TestParseKlines:
+    @pytest.fixture(params=[True, False], ids=["pyarrow", "pandas"])
+    def engine(self, request, monkeypatch):
+        if request.param:
+            pytest.importorskip("pyarrow")
+        monkeypatch.setattr(utils, "PYARROW_AVAILABLE", request.param)
+
+    def test_all_fields(self, engine):
+        """测试解析全部11个字段及其类型"""
+        df = parse_kline_data(KLINES)
+
+        assert df.columns.tolist() == KLINE_COLUMNS
+        assert str(df["timestamp"].dt.tz) == "Asia/Shanghai"
+        assert df["volume"].dtype == "int64"
+        assert (df.dtypes.iloc[1:].drop("volume") == "float64").all()
+        assert df.iloc[1].to_dict() == {
+            "timestamp": pd.Timestamp("2024-01-03", tz="Asia/Shanghai"),
+            "open": 10.5,
+            "high": 10.6,
+            "low": 10.1,
+            "close": 10.2,
+            "volume": 800,
+            "amount": 8200.0,
+            "amplitude": 4.8,
+            "pct_change": -2.9,
+            "change": -0.3,
+            "turnover": 0.9,
+        }
+
+    def test_minutes_and_missing_values(self, engine):
+        """测试分钟时间和缺失值"""
+        data = {
+            "data": {
+                "klines": [
+                    "2024-01-02 09:31,10.0,10.1,10.1,10.0,100,1000.0,1.0,1.0,0.1,-",
+                    "2024-01-02 09:32,10.1,10.2,10.2,10.1,-,-,1.0,1.0,0.1,-",
+                ]
+            }
+        }
+        df = parse_kline_data(data)
+
+        assert df["timestamp"].dt.minute.tolist() == [31, 32]
+        assert df["volume"].isna().tolist() == [False, True]
+        assert df["turnover"].isna().all()
+
+    def test_empty(self):
+        """测试没有数据时返回空表"""
+        assert parse_kline_data({"rc": 0, "data": None}).columns.tolist() == (
+            KLINE_COLUMNS
+        )
+
+    def test_short_klines(self, engine):
+        """测试只有前六个字段的K线，缺少的字段为 NaN"""
+        data = {
+            "data": {
+                "klines": [
+                    "2024-01-02,10.0,10.5,10.8,9.9,1000",
+                    "2024-01-03,10.5,10.2,10.6,10.1,800,8200.0,4.8,-2.9,-0.3,0.9",
+                    "2024-01-04,10.2",
+                ]
+            }
+        }
+        df = parse_kline_data(data)
+
+        assert df.columns.tolist() == KLINE_COLUMNS
+        assert df["close"].tolist() == [10.5, 10.2]
+        assert df["volume"].tolist() == [1000, 800]
+        assert df["amount"].isna().tolist() == [True, False]
+        assert df["turnover"].tolist()[1] == 0.9
+
+    def test_no_usable_klines(self, engine):
+        """测试K线都缺少字段时返回空表"""
+        df = parse_kline_data({"data": {"klines": ["2024-01-02,10.0"]}})
+        assert df.empty
+        assert df.columns.tolist() == KLINE_COLUMNS
+
+    def test_resample(self):
+        """测试重采样合并成交量和成交额，不再返回单根K线的涨跌幅"""
+        df = resample_historical_data(parse_kline_data(KLINES), "day", 2)
+
+        assert len(df) == 1
+        row = df.iloc[0]
+        assert row["volume"] == 1800
+        assert row["amount"] == 18700.0
+        assert not {"change", "pct_change", "amplitude"} & set(df.columns)
+
+
+class FakeReportClient:
+    """Returns one report row per statement, failing or emptying the listed ones"""
+
+    def __init__(self, failing=(), empty=()):
+        self.failing = set(failing)
+        self.empty = set(empty)
+
+    def fetch_financial_report(self, report_name, symbol, columns):
+        if report_name in self.failing:
+            raise requests.ConnectionError("connection reset")
+        if report_name in self.empty:
+            return {"result": None}
+        row = dict.fromkeys(columns, 1.0)
+        row["REPORT_DATE"] = "2024-03-31 00:00:00"
+        return {"result": {"data": [row]}}
+
+
+class AsyncFakeReportClient(FakeReportClient):
+    async def fetch_financial_report(self, report_name, symbol, columns):
+        return super().fetch_financial_report(report_name, symbol, columns)
+
+
+class TestFinancialReports:
+    @pytest.fixture(autouse=True)
+    def financial_cache(self, monkeypatch):
+        monkeypatch.setitem(
+            CACHE_CONFIG, "financial_cache", TTLCache(maxsize=100, ttl=60)
+        )
+        monkeypatch.setattr(cache_module, "_negative", {})
+
+    @pytest.fixture(params=[False, True], ids=["sync", "async"])
+    def metrics(self, request):
+        def fetch(failing=(), empty=()):
+            provider = EastMoneyDirectFinancialReport("600000")
+            provider.client = FakeReportClient(failing, empty)
+            provider.aclient = AsyncFakeReportClient(failing, empty)
+            if request.param:
+                return asyncio.run(provider.aget_financial_metrics())
+            return provider.get_financial_metrics()
+
+        return fetch
+
+    def test_partial_result(self, metrics, caplog):
+        """测试单张报表请求失败时返回其余报表的指标并记录警告"""
+        df = metrics(failing={"RPT_DMSK_FN_CASHFLOW"})
+
+        assert df["report_date"].tolist() == ["2024-03-31"]
+        assert "revenue" in df.columns
+        assert "net_cash_flow_from_operations" not in df.columns
+        assert "Error fetching cash flow statement" in caplog.text
+
+    def test_partial_result_not_cached(self, metrics):
+        """测试部分报表失败的结果只按错误有效期缓存"""
+        metrics(failing={"RPT_DMSK_FN_CASHFLOW"})
+        key = "eastmoney_financial_metrics_600000"
+
+        assert key not in CACHE_CONFIG["financial_cache"]
+        kind, _, _ = cache_module._negative["financial_cache"][key]
+        assert kind == "error"
+
+    def test_failure_with_empty_reports(self, metrics):
+        """测试其余报表为空时抛出请求失败，不当作没有数据"""
+        with pytest.raises(requests.ConnectionError):
+            metrics(
+                failing={"RPT_DMSK_FN_CASHFLOW"},
+                empty={"RPT_DMSK_FN_BALANCE", "RPT_DMSK_FN_INCOME"},
+            )
+
+    def test_all_reports_failed(self, metrics):
+        """测试全部报表请求失败时抛出异常，不当作没有数据"""
+        reports = {"RPT_DMSK_FN_BALANCE", "RPT_DMSK_FN_INCOME", "RPT_DMSK_FN_CASHFLOW"}
+        with pytest.raises(requests.ConnectionError):
+            metrics(failing=reports)
+
+    def test_statement_failure_returns_empty(self):
+        """测试单独获取报表失败时返回空表"""
+        provider = EastMoneyDirectFinancialReport("600000")
+        provider.client = FakeReportClient({"RPT_DMSK_FN_INCOME"})
+
+        assert provider.get_income_statement().empty
+        assert not provider.get_balance_sheet().empty
+
+
+class TestAsyncClient:
+    @pytest.fixture(autouse=True)
+    def hist_cache(self, monkeypatch):
+        monkeypatch.setitem(
+            CACHE_CONFIG, "hist_data_cache", TTLCache(maxsize=100, ttl=60)
+        )
+
+    def test_builds_same_requests(self):
+        """测试异步客户端与同步客户端请求参数一致"""
+        session = FakeAsyncSession({"result": None})
+        client = AsyncEastMoneyClient(session=session)
+
+        asyncio.run(
+            client.fetch_financial_report(
+                "RPT_DMSK_FN_BALANCE", "600000", ["REPORT_DATE"]
+            )
+        )
+
+        expected = EastMoneyClient()._financial_report_request(
+            "RPT_DMSK_FN_BALANCE", "600000", ["REPORT_DATE"]
+        )
+        assert session.calls == [expected]
+
+    def test_concurrent_symbols(self):
+        """测试多个股票的请求在同一事件循环中并发执行"""
+        session = FakeAsyncSession(KLINES)
+
+        async def main():
+            providers = []
+            for symbol in ["600000", "000001", "300750"]:
+                provider = EastMoneyDirectHistorical(
+                    symbol=symbol, start_date="2024-01-02", end_date="2024-01-03"
+                )
+                provider.aclient = AsyncEastMoneyClient(session=session)
+                providers.append(provider)
+            return await asyncio.gather(*(p.aget_hist_data() for p in providers))
+
+        results = asyncio.run(main())
+
+        assert session.peak == 3
+        assert [len(df) for df in results] == [2, 2, 2]
+        assert results[0]["close"].tolist() == [10.5, 10.2]
+
+    def test_shares_cache_with_sync(self, monkeypatch):
+        """测试异步请求的结果可被同步调用复用"""
+        session = FakeAsyncSession(KLINES)
+        provider = EastMoneyDirectHistorical(
+            symbol="600000", start_date="2024-01-02", end_date="2024-01-03"
+        )
+        provider.aclient = AsyncEastMoneyClient(session=session)
+        asyncio.run(provider.aget_hist_data())
+
+        def fail(**kwargs):
+            raise AssertionError("should be served from cache")
+
+        monkeypatch.setattr(provider.client, "fetch_historical_klines", fail)
+        assert len(provider.get_hist_data()) == 2
+        assert len(session.calls) == 1
+
+    def test_thread_fallback(self, monkeypatch):
+        """测试没有异步实现的数据源在线程中执行"""
+        frame = pd.DataFrame({"symbol": ["600000"]})
+        monkeypatch.setattr(akshare_one, "get_basic_info", lambda symbol, source: frame)
+
+        assert asyncio.run(akshare_one.aget_basic_info("600000")) is frame
@@ -0,0 +1,206 @@
+import asyncio
+import time
+
+import pandas as pd
+import pytest
+
+from akshare_one import get_hist_data, hedge_stats
+from akshare_one.modules.historical import hedged
+from akshare_one.modules.historical.base import (
+    HIST_COLUMNS,
+    HistoricalDataProvider,
+    normalize_hist_data,
+)
+from akshare_one.modules.historical.factory import HistoricalDataFactory
+from akshare_one.modules.historical.hedged import (
+    HedgedHistorical,
+    configure_hedging,
+    hedge_delay,
+    record_latency,
+)
+
+FRAME = pd.DataFrame(
+    {
+        "timestamp": pd.to_datetime(["2024-01-02", "2024-01-03"]).tz_localize(
+            "Asia/Shanghai"
+        ),
+        "open": [10.0, 10.5],
+        "high": [10.8, 10.6],
+        "low": [9.9, 10.1],
+        "close": [10.5, 10.2],
+        "volume": [1000, 800],
+    }
+)
+
+
+class FakeHistorical(HistoricalDataProvider):
+    """Answers after ``delay`` seconds with ``frame``, or raises ``error``"""
+
+    delay = 0.0
+    frame: pd.DataFrame = FRAME
+    error: Exception | None = None
+    cancelled = 0
+
+    def get_hist_data(self) -> pd.DataFrame:
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.frame
+
+    async def aget_hist_data(self) -> pd.DataFrame:
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            type(self).cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.frame
+
+
+def fake_source(**attributes):
+    return type("Source", (FakeHistorical,), attributes)
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    """Fresh latency windows, counts and settings, and a private registry"""
+    monkeypatch.setattr(hedged, "_latencies", {})
+    monkeypatch.setattr(hedged, "_counts", {})
+    monkeypatch.setattr(hedged, "HEDGE_SETTINGS", dict(hedged.HEDGE_SETTINGS))
+    monkeypatch.setattr(
+        HistoricalDataFactory, "_providers", dict(HistoricalDataFactory._providers)
+    )
+    configure_hedging(delay=0.1, min_delay=0.01)
+
+
+def register(**sources) -> None:
+    for name, provider_class in sources.items():
+        HistoricalDataFactory.register_provider(name, provider_class)
+
+
+def hedged_provider() -> HedgedHistorical:
+    return HedgedHistorical(source="primary", hedge="backup", symbol="600000")
+
+
+class TestHedgedHistorical:
+    def test_fast_primary_not_hedged(self):
+        """测试主数据源及时返回时不请求备用数据源"""
+        backup = fake_source(error=AssertionError("should not be called"))
+        register(primary=fake_source(), backup=backup)
+
+        df = hedged_provider().get_hist_data()
+
+        pd.testing.assert_frame_equal(df, FRAME)
+        stats = hedge_stats()["primary"]
+        assert (stats["requests"], stats["hedged"], stats["samples"]) == (1, 0, 1)
+
+    def test_slow_primary_hedged(self):
+        """测试主数据源超过阈值后由备用数据源返回"""
+        register(primary=fake_source(delay=1.0), backup=fake_source())
+
+        started = time.perf_counter()
+        df = hedged_provider().get_hist_data()
+
+        assert time.perf_counter() - started < 0.5
+        pd.testing.assert_frame_equal(df, FRAME)
+        stats = hedge_stats()["primary"]
+        assert (stats["hedged"], stats["hedge_wins"]) == (1, 1)
+
+    def test_failed_primary_hedged_at_once(self):
+        """测试主数据源失败时立即请求备用数据源"""
+        configure_hedging(delay=5)
+        primary = fake_source(error=ValueError("upstream down"))
+        register(primary=primary, backup=fake_source())
+
+        started = time.perf_counter()
+        df = hedged_provider().get_hist_data()
+
+        assert time.perf_counter() - started < 1
+        assert len(df) == 2
+        assert hedge_stats()["primary"]["hedge_wins"] == 1
+
+    def test_no_valid_result(self):
+        """测试都失败时抛出主数据源的错误，有空结果时返回空表"""
+        register(
+            primary=fake_source(error=ValueError("primary down")),
+            backup=fake_source(error=ValueError("backup down")),
+        )
+        with pytest.raises(ValueError, match="primary down"):
+            hedged_provider().get_hist_data()
+
+        register(backup=fake_source(frame=FRAME.iloc[:0]))
+        df = hedged_provider().get_hist_data()
+        assert df.empty and df.columns.tolist() == HIST_COLUMNS
+
+    def test_same_source_rejected(self):
+        """测试主数据源和备用数据源不能相同"""
+        with pytest.raises(ValueError):
+            get_hist_data("600000", source="sina", hedge="sina")
+
+    def test_async_cancels_loser(self):
+        """测试异步对冲请求取消较慢的请求"""
+        primary = fake_source(delay=1.0)
+        register(primary=primary, backup=fake_source())
+
+        async def main():
+            df = await hedged_provider().aget_hist_data()
+            await asyncio.sleep(0)
+            return df
+
+        started = time.perf_counter()
+        df = asyncio.run(main())
+
+        assert time.perf_counter() - started < 0.5
+        assert len(df) == 2
+        assert primary.cancelled == 1
+
+
+class TestThreshold:
+    def test_follows_observed_quantile(self):
+        """测试阈值为观测延迟的 p90，样本不足时使用默认值"""
+        configure_hedging(delay=2.0, min_samples=10, min_delay=0.0)
+        for ms in range(1, 10):
+            record_latency("primary", ms / 1000)
+        assert hedge_delay("primary") == 2.0
+
+        record_latency("primary", 0.010)
+        assert hedge_delay("primary") == pytest.approx(0.0091)
+
+        configure_hedging(min_delay=0.05)
+        assert hedge_delay("primary") == 0.05
+
+    def test_window_keeps_recent_latencies(self):
+        """测试只保留最近的延迟样本"""
+        configure_hedging(window=5, min_samples=1, min_delay=0.0)
+        for seconds in [9.0] * 5 + [0.1] * 5:
+            record_latency("primary", seconds)
+        assert hedge_delay("primary") == pytest.approx(0.1)
+
+    def test_unknown_setting(self):
+        """测试未知设置报错"""
+        with pytest.raises(ValueError):
+            configure_hedging(percentile=90)
+
+
+class TestNormalize:
+    def test_sources_share_schema(self):
+        """测试不同数据源的结果统一为相同的格式"""
+        raw = pd.DataFrame(
+            {
+                "amount": [1.0, 2.0],
+                "volume": ["800", "1000"],
+                "close": ["10.2", "10.5"],
+                "low": [10.1, 9.9],
+                "high": [10.6, 10.8],
+                "open": [10.5, 10],
+                "timestamp": ["2024-01-03", "2024-01-02"],
+            }
+        )
+
+        pd.testing.assert_frame_equal(normalize_hist_data(raw), FRAME)
+
+    def test_missing_columns(self):
+        """测试缺少标准列时报错"""
+        with pytest.raises(ValueError, match="volume"):
+            normalize_hist_data(FRAME.drop(columns="volume"))
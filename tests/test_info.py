@@ -1,4 +1,3 @@
-import os
 import time
 import unittest
 
@@ -6,7 +5,7 @@ import pandas as pd
 from cachetools import TTLCache
 
 from akshare_one import get_basic_info
-from akshare_one.modules.cache import CACHE_CONFIG
+from akshare_one.modules.cache import CACHE_CONFIG, set_cache_enabled
 
 
 class TestInfo(unittest.TestCase):
@@ -40,7 +39,7 @@ class TestInfo(unittest.TestCase):
         cache.clear()
 
         # 测试缓存命中
-        os.environ["AKSHARE_ONE_CACHE_ENABLED"] = "true"
+        set_cache_enabled(True)
 
         # 第一次调用 - 应该缓存未命中
         initial_size = cache.currsize
@@ -53,13 +52,13 @@ class TestInfo(unittest.TestCase):
         pd.testing.assert_frame_equal(df1, df2)
 
         # 测试缓存禁用
-        os.environ["AKSHARE_ONE_CACHE_ENABLED"] = "false"
+        set_cache_enabled(False)
         disabled_size = cache.currsize
         get_basic_info("600405")
         self.assertEqual(cache.currsize, disabled_size)
 
         # 测试缓存过期
-        os.environ["AKSHARE_ONE_CACHE_ENABLED"] = "true"
+        set_cache_enabled(True)
 
         # 创建临时缓存并替换原缓存
         original_cache = cache
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from akshare_one.eastmoney.client import EastMoneyClient
+from akshare_one.modules import ratelimit
+from akshare_one.modules.ratelimit import (
+    TokenBucket,
+    aacquire,
+    acquire,
+    configure_rate_limit,
+    rate_limit_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def limits(monkeypatch):
+    """Gives each test its own copy of the process-wide limits"""
+    monkeypatch.setattr(ratelimit, "RATE_LIMITS", dict(ratelimit.RATE_LIMITS))
+    monkeypatch.setattr(ratelimit, "_buckets", {})
+
+
+class TestTokenBucket:
+    def test_burst_then_rate(self):
+        """测试突发请求立即通过，之后按速率等待"""
+        bucket = TokenBucket(rate=100, burst=5)
+
+        delays = [bucket.reserve() for _ in range(7)]
+
+        assert delays[:5] == [0, 0, 0, 0, 0]
+        assert delays[5] == pytest.approx(0.01, abs=0.002)
+        assert delays[6] == pytest.approx(0.02, abs=0.002)
+        assert bucket.throttled == 2
+
+    def test_refills_over_time(self):
+        """测试空闲后令牌恢复，但不超过桶容量"""
+        bucket = TokenBucket(rate=100, burst=2)
+        bucket.reserve()
+        bucket.reserve()
+        time.sleep(0.05)
+
+        assert [bucket.reserve() for _ in range(2)] == [0, 0]
+        assert bucket.reserve() > 0
+
+    def test_invalid_parameters(self):
+        """测试非法参数"""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1, burst=0)
+
+
+class TestRateLimit:
+    def test_shared_by_threads(self):
+        """测试多个线程共用同一主机的限流"""
+        configure_rate_limit("example.com", rate=200, burst=1)
+        started = time.monotonic()
+
+        threads = [
+            threading.Thread(target=acquire, args=("example.com",)) for _ in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert time.monotonic() - started >= 19 / 200 * 0.9
+        assert rate_limit_stats()["example.com"]["requests"] == 20
+
+    def test_asyncio_does_not_block_loop(self):
+        """测试协程等待限流时不阻塞事件循环"""
+        configure_rate_limit("example.com", rate=100, burst=1)
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.005)
+
+        async def main():
+            task = asyncio.create_task(ticker())
+            await asyncio.gather(*(aacquire("example.com") for _ in range(6)))
+            task.cancel()
+
+        started = time.monotonic()
+        asyncio.run(main())
+
+        assert time.monotonic() - started >= 5 / 100 * 0.9
+        assert len(ticks) > 3
+
+    def test_configure_and_remove(self):
+        """测试修改和取消主机限流"""
+        configure_rate_limit("push2his.eastmoney.com", rate=50)
+        stats = rate_limit_stats()["push2his.eastmoney.com"]
+        assert stats["rate"] == 50
+        assert stats["burst"] == ratelimit.RATE_LIMITS["push2his.eastmoney.com"][1]
+
+        configure_rate_limit("push2his.eastmoney.com", rate=None)
+        assert "push2his.eastmoney.com" not in rate_limit_stats()
+        assert acquire("push2his.eastmoney.com") == 0
+        assert acquire("unknown.example.com") == 0
+
+    def test_client_requests_limited(self):
+        """测试直连客户端每次请求都经过限流"""
+
+        class Response:
+            status_code = 200
+            headers: dict[str, str] = {}
+
+            def raise_for_status(self):
+                pass
+
+            content = b'{"result": null}'
+
+        class Session:
+            def get(self, url, params=None, timeout=None, stream=False):
+                return Response()
+
+        configure_rate_limit("datacenter-web.eastmoney.com", rate=40, burst=1)
+        client = EastMoneyClient(session=Session())  # type: ignore
+        for _ in range(3):
+            client.fetch_financial_report("RPT_DMSK_FN_BALANCE", "600000", [])
+
+        stats = rate_limit_stats()["datacenter-web.eastmoney.com"]
+        assert stats["requests"] == 3
+        assert stats["throttled"] == 2
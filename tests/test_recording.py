@@ -0,0 +1,183 @@
+import asyncio
+import json
+import time
+
+import pytest
+import requests
+from cachetools import TTLCache
+
+from akshare_one import get_hist_data
+from akshare_one.eastmoney import client as client_module
+from akshare_one.eastmoney.client import EastMoneyClient, configure_retries
+from akshare_one.eastmoney.mock_server import MockUpstream
+from akshare_one.eastmoney.recording import (
+    Cassette,
+    CassetteMissError,
+    request_key,
+    use_cassette,
+)
+from akshare_one.modules import circuit, ratelimit
+from akshare_one.modules.cache import CACHE_CONFIG
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    """Fresh caches, limits and breakers, and retries without waiting"""
+    monkeypatch.setitem(CACHE_CONFIG, "hist_data_cache", TTLCache(100, ttl=60))
+    monkeypatch.setattr(ratelimit, "RATE_LIMITS", {})
+    monkeypatch.setattr(ratelimit, "_buckets", {})
+    monkeypatch.setattr(circuit, "_breakers", {})
+    monkeypatch.setattr(client_module, "ENDPOINTS", {})
+    for name in ("RETRY_ATTEMPTS", "RETRY_BACKOFF", "RETRY_MAX_BACKOFF"):
+        monkeypatch.setattr(client_module, name, getattr(client_module, name))
+    configure_retries(attempts=2, backoff=0)
+
+
+def fetch_klines(start: str = "20240102", end: str = "20240131"):
+    return EastMoneyClient().fetch_historical_klines("600000", "101", "0", start, end)
+
+
+class TestCassette:
+    def test_key_ignores_order_and_host(self):
+        """测试请求匹配不受参数顺序和主机影响"""
+        a = request_key("get", "https://push2.eastmoney.com/api/qt/stock/get?b=2&a=1")
+        b = request_key("GET", "http://127.0.0.1:8000/api/qt/stock/get?a=1&b=2")
+        ignored = request_key("GET", "/api/qt/stock/get?a=1&b=2&_=17", ["_"])
+
+        assert a == b == ignored == "GET /api/qt/stock/get?a=1&b=2"
+
+    def test_record_then_replay(self, tmp_path):
+        """测试录制的响应可以离线回放"""
+        path = tmp_path / "klines.json"
+        with MockUpstream(), use_cassette(path, mode="record") as cassette:
+            recorded = fetch_klines()
+        assert len(cassette) == 1
+        assert json.loads(path.read_text(encoding="utf-8"))["version"] == 1
+
+        # 服务器已停止，请求只能从记录中回放
+        with use_cassette(path, mode="replay"):
+            assert fetch_klines() == recorded
+            df = get_hist_data("600000", start_date="2024-01-02", end_date="2024-01-31")
+        assert len(df) == len(recorded["data"]["klines"])
+
+    def test_replay_miss(self, tmp_path):
+        """测试回放模式下未录制的请求直接失败"""
+        path = tmp_path / "empty.json"
+        with use_cassette(path, mode="replay"), pytest.raises(CassetteMissError):
+            fetch_klines()
+        assert not path.exists()
+
+    def test_auto_records_new_requests(self, tmp_path):
+        """测试自动模式只请求未录制的数据"""
+        path = tmp_path / "auto.json"
+        with MockUpstream() as upstream:
+            for _ in range(2):
+                with use_cassette(path):
+                    fetch_klines()
+                    fetch_klines(start="20240201", end="20240229")
+            assert upstream.requests == 2
+        assert len(Cassette(path)) == 2
+
+    def test_transient_errors_not_recorded(self, tmp_path):
+        """测试临时错误不会被录制"""
+        path = tmp_path / "errors.json"
+        with (
+            MockUpstream(error_rate=1.0),
+            use_cassette(path, mode="record") as cassette,
+            pytest.raises(requests.HTTPError),
+        ):
+            fetch_klines()
+        assert len(cassette) == 0
+
+
+class TestMockUpstream:
+    def test_serves_consistent_data(self):
+        """测试生成的数据在重叠区间内一致"""
+        with MockUpstream() as upstream:
+            january = fetch_klines()["data"]["klines"]
+            first_week = fetch_klines(end="20240105")["data"]["klines"]
+            quote = EastMoneyClient().fetch_realtime_quote("600000")
+            report = EastMoneyClient().fetch_financial_report(
+                "RPT_DMSK_FN_BALANCE", "600000", ["REPORT_DATE", "TOTAL_ASSETS"]
+            )
+
+        assert upstream.requests == 4
+        assert january[: len(first_week)] == first_week
+        assert all(len(line.split(",")) == 11 for line in january)
+        assert quote["data"]["f57"] == "600000"
+        assert set(report["result"]["data"][0]) == {"REPORT_DATE", "TOTAL_ASSETS"}
+        # 停止后恢复原地址
+        assert client_module.ENDPOINTS == {}
+
+    def test_stream_matches_fetch(self, tmp_path):
+        """测试流式读取与一次读取的结果相同，包括回放"""
+        path = tmp_path / "minutes.json"
+        request = ("600000", "1", "0", "20240102", "20240131")
+
+        def stream():
+            chunks = EastMoneyClient().stream_historical_klines(*request, 100)
+            return list(chunks)
+
+        with MockUpstream(), use_cassette(path, mode="record"):
+            klines = EastMoneyClient().fetch_historical_klines(*request)
+            chunks = stream()
+        with use_cassette(path, mode="replay"):
+            assert stream() == chunks
+
+        assert [len(chunk) for chunk in chunks] == [100] * 12
+        assert [line for chunk in chunks for line in chunk] == klines["data"]["klines"]
+
+    def test_serves_cassette(self, tmp_path):
+        """测试优先返回录制的响应"""
+        cassette = Cassette(tmp_path / "quote.json")
+        url = EastMoneyClient()._realtime_quote_request("600000")
+        query = requests.Request("GET", url[0], params=url[1]).prepare().url
+        payload = {"rc": 0, "data": {"f57": "600000", "f43": 8.88}}
+        cassette.put("GET", query or "", 200, {}, json.dumps(payload))
+
+        with MockUpstream(cassette=cassette):
+            assert EastMoneyClient().fetch_realtime_quote("600000") == payload
+
+    def test_latency(self):
+        """测试注入延迟"""
+        with MockUpstream(latency=0.05):
+            started = time.perf_counter()
+            fetch_klines()
+            assert time.perf_counter() - started >= 0.05
+
+    @pytest.mark.parametrize(
+        "error, expected",
+        [("status", requests.HTTPError), ("reset", requests.ConnectionError)],
+    )
+    def test_error_injection(self, error, expected):
+        """测试注入的错误经过重试后抛出"""
+        with MockUpstream(error_rate=1.0, error=error) as upstream:
+            with pytest.raises(expected):
+                fetch_klines()
+            assert upstream.requests == 2
+            assert upstream.errors == 2
+
+    def test_rc_errors(self):
+        """测试注入 rc 非零的响应"""
+        with MockUpstream(error_rate=1.0, error="rc"):
+            assert fetch_klines()["rc"] == 102
+
+    def test_async_client(self):
+        """测试异步客户端请求模拟服务器"""
+        pytest.importorskip("aiohttp")
+        from akshare_one.eastmoney.async_client import (
+            AsyncEastMoneyClient,
+            close_async_session,
+        )
+
+        async def main():
+            try:
+                client = AsyncEastMoneyClient()
+                return await client.fetch_historical_klines(
+                    "600000", "101", "0", "20240102", "20240131"
+                )
+            finally:
+                await close_async_session()
+
+        with MockUpstream():
+            assert asyncio.run(main()) == fetch_klines()
@@ -0,0 +1,152 @@
+import datetime as dt
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import akshare_one
+from akshare_one import WarmupScheduler, warm_cache
+from akshare_one.modules.cache import (
+    CACHE_CONFIG,
+    HIST_REFRESH_POLICY,
+    _CountingTLRUCache,
+    _CountingTTLCache,
+    cache,
+)
+
+
+@pytest.fixture
+def info_cache(monkeypatch):
+    monkeypatch.setitem(CACHE_CONFIG, "info_cache", _CountingTTLCache(100, ttl=60))
+
+
+class TestWarmCache:
+    def test_prefetches_into_cache(self, info_cache):
+        """测试预热后再次调用直接命中缓存"""
+        calls = []
+
+        @cache("info_cache", key=lambda symbol, period: f"warm_{symbol}_{period}")
+        def fetch(symbol: str, period: str) -> pd.DataFrame:
+            calls.append((symbol, period))
+            return pd.DataFrame({"symbol": [symbol]})
+
+        report = warm_cache(["600000", "000001", "600000"], [(fetch, {"period": "1y"})])
+
+        assert report["total"] == 2
+        assert report["succeeded"] == 2
+        assert sorted(calls) == [("000001", "1y"), ("600000", "1y")]
+        fetch(symbol="600000", period="1y")
+        assert len(calls) == 2
+
+        # 未过期的条目不会重新请求
+        warm_cache(["600000"], [(fetch, {"period": "1y"})])
+        assert len(calls) == 2
+
+    def test_reports_failures_and_progress(self, info_cache):
+        """测试失败请求被记录而不中断预热"""
+
+        def fetch(symbol: str) -> pd.DataFrame:
+            if symbol == "bad":
+                raise ValueError("invalid symbol")
+            return pd.DataFrame()
+
+        progress = []
+        report = warm_cache(
+            ["600000", "bad"],
+            [(fetch, {})],
+            progress=lambda done, total: progress.append((done, total)),
+        )
+
+        assert progress == [(1, 2), (2, 2)]
+        assert report["failed"] == 1
+        failure = report["failures"][0]
+        assert failure["function"] == "fetch"
+        assert failure["symbol"] == "bad"
+        assert isinstance(failure["error"], ValueError)
+
+    def test_bounded_concurrency(self, info_cache):
+        """测试并发请求数不超过 max_workers"""
+        running = 0
+        peak = 0
+        guard = threading.Lock()
+
+        def fetch(symbol: str) -> pd.DataFrame:
+            nonlocal running, peak
+            with guard:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.01)
+            with guard:
+                running -= 1
+            return pd.DataFrame()
+
+        report = warm_cache([str(i) for i in range(20)], [(fetch, {})], max_workers=3)
+
+        assert report["succeeded"] == 20
+        assert peak <= 3
+
+    def test_resolves_function_names(self, info_cache, monkeypatch):
+        """测试使用 akshare_one 中的函数名作为模板"""
+        calls = []
+        monkeypatch.setattr(
+            akshare_one, "get_basic_info", lambda symbol: calls.append(symbol)
+        )
+
+        warm_cache(["600000"], [("get_basic_info", {})])
+
+        assert calls == ["600000"]
+        with pytest.raises(ValueError):
+            warm_cache(["600000"], [("get_nothing", {})])
+
+
+class TestWarmupScheduler:
+    def test_next_run_skips_non_trading_days(self):
+        """测试下次预热时间跳过周末和节假日"""
+        scheduler = WarmupScheduler(
+            ["600000"], [], at="09:00", holidays=[dt.date(2024, 1, 8)]
+        )
+        # 2024-01-05 周五 10:00
+        now = pd.Timestamp("2024-01-05 10:00", tz="Asia/Shanghai").timestamp()
+
+        assert scheduler.next_run(now) == pytest.approx(
+            pd.Timestamp("2024-01-09 09:00", tz="Asia/Shanghai").timestamp()
+        )
+
+    def test_run_keeps_report(self, info_cache):
+        """测试手动运行并保存预热结果"""
+        scheduler = WarmupScheduler(["600000"], [(lambda symbol: None, {})])
+
+        report = scheduler.run()
+
+        assert scheduler.last_report is report
+        assert report["succeeded"] == 1
+
+    def test_default_time_survives_open(self, monkeypatch, timer):
+        """测试默认时间预热的条目在 09:25 集合竞价撮合时仍然命中"""
+        monkeypatch.setitem(
+            CACHE_CONFIG,
+            "info_cache",
+            _CountingTLRUCache(
+                100,
+                ttu=lambda key, value, now: HIST_REFRESH_POLICY.expires_at(now),
+                timer=timer,
+            ),
+        )
+        calls = []
+
+        @cache("info_cache", key=lambda symbol: f"warm_{symbol}")
+        def fetch(symbol: str) -> pd.DataFrame:
+            calls.append(symbol)
+            return pd.DataFrame({"symbol": [symbol]})
+
+        scheduler = WarmupScheduler(["600000"], [(fetch, {})])
+        # 2024-01-05 周五开盘前
+        timer.now = scheduler.next_run(
+            pd.Timestamp("2024-01-05 08:00", tz="Asia/Shanghai").timestamp()
+        )
+        scheduler.run()
+
+        timer.now = pd.Timestamp("2024-01-05 09:25", tz="Asia/Shanghai").timestamp()
+        fetch(symbol="600000")
+        assert calls == ["600000"]